@@ -3,9 +3,24 @@ import pandas as pd
 import plotly.express as px
 import numpy as np
 from datetime import timedelta
-from fpdf import FPDF
+import os
 import io
-import re
+import json
+import logging
+import marshal
+import sqlite3
+import cProfile
+import pstats
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from core import (
+    StageRecorder, channel_results, create_pdf_bytes, detect_gaps, detect_violations, decide_status, build_summary_stats,
+    DiskCache, ReadingStore, default_workers, evaluate_cabinet, file_content_hash, load_export, load_export_cached, multi_channel_result, recording,
+    RESAMPLE_INTERVALS, ROLLING_WINDOWS, VIEWER_SORTS, bucket_gap_positions, detect_bucket_gaps, detect_bucket_violations, format_duration, gap_edge_positions, page_table, resample_error_bounds, resample_series, rolling_analytics, series_table,
+    select_chart_points, set_recorder, stage, summary_frame, summary_row, temperature_order, viewer_rows, violation_positions, widen_temps,
+)
 
 # --- Sayfa Ayarları ---
 st.set_page_config(page_title="Aşı Dolabı Analiz Raporu", layout="wide")
@@ -13,15 +28,39 @@ st.set_page_config(page_title="Aşı Dolabı Analiz Raporu", layout="wide")
 st.title("🌡️ Detaylı Aşı/İlaç Dolabı Sıcaklık Analizi")
 st.markdown("Yüklenen sensör verilerini analiz eder; kesintileri, ihlalleri, trendleri ve **Ortalama Kinetik Sıcaklık (MKT)** bazlı otomatik kararları raporlar.")
 
+# Geçmiş ölçüm deposu (SQLite); yol boş verilirse depo özellikleri kapalıdır
+READING_STORE_PATH = os.environ.get("DOLAP_STORE_PATH", "~/.local/share/asi-dolap-takip/olcumler.sqlite")
+
 # --- Ayarlar Sidebar ---
 st.sidebar.header("⚙️ Analiz Ayarları")
-uploaded_file = st.sidebar.file_uploader("CSV veya Excel Dosyası Yükle", type=["csv", "xlsx", "xls"])
+fleet_mode = st.sidebar.toggle("Çoklu dosya (filo) modu", help="Bir tesisteki dolapların dışa aktarımlarını birlikte yükleyip özet tabloda karşılaştırın.")
+history_mode = bool(READING_STORE_PATH) and not fleet_mode and st.sidebar.toggle(
+    "Geçmiş deposu modu", help="Daha önce depoya kaydedilen okumalardan bir dolabın istediğiniz tarih aralığını analiz edin.")
+if fleet_mode:
+    uploaded_files = st.sidebar.file_uploader("CSV veya Excel Dosyaları Yükle", type=["csv", "xlsx", "xls"], accept_multiple_files=True)
+    uploaded_file = None
+elif history_mode:
+    uploaded_files, uploaded_file = [], None
+else:
+    uploaded_files = []
+    uploaded_file = st.sidebar.file_uploader("CSV veya Excel Dosyası Yükle", type=["csv", "xlsx", "xls"])
+save_to_store = bool(READING_STORE_PATH) and not history_mode and st.sidebar.checkbox(
+    "Yüklenenleri geçmiş deposuna kaydet", help="Okumalar dolap (Birim, Depo, kanal) başına depoya eklenir; örtüşen dışa aktarımlardaki aynı okumalar bir kez tutulur.")
 
 st.sidebar.divider()
 st.sidebar.subheader("Limitler")
 gap_threshold_hours = st.sidebar.number_input("Kesinti Limiti (Saat)", min_value=1, value=2)
 min_temp_limit = st.sidebar.number_input("Min Sıcaklık (°C)", value=2.0)
 max_temp_limit = st.sidebar.number_input("Max Sıcaklık (°C)", value=8.0)
+time_weighted_durations = st.sidebar.checkbox("Süreyi sonraki okumaya kadar say", value=False,
+                                              help="İşaretlenirse ihlal süresi, limit içine dönülen ilk okumaya kadar hesaplanır.")
+
+st.sidebar.divider()
+st.sidebar.subheader("Yeniden Örnekleme")
+# Tüm aralıklar en küçük kesinti limitinden (1 saat) kısa ya da eşittir; kesintiler kovalarda da birebir bulunur
+resample_label = st.sidebar.selectbox("Kova aralığı", ["Kapalı", *RESAMPLE_INTERVALS],
+                                      help="Çok sık kaydeden sensörlerde kesinti, ihlal, MKT ve grafik sabit aralıklı kovalar (min / max / ortalama / okuma sayısı) üzerinden hesaplanır. Kesintiler ve uç değerler birebir korunur; MKT yalnızca kayan nokta yuvarlaması kadar farklıdır, ihlal süresi için hata sınırı gösterilir.")
+resample_seconds = RESAMPLE_INTERVALS.get(resample_label)
 
 st.sidebar.divider()
 st.sidebar.subheader("Müdahale / Transfer Durumu")
@@ -35,300 +74,338 @@ if has_intervention:
         intervention_dt = pd.to_datetime(f"{int_date} {int_time}")
         st.sidebar.info(f"Analiz **{intervention_dt.strftime('%d.%m.%Y %H:%M')}** tarihine kadar sınırlandırılmıştır.")
 
-# --- Yardımcı Fonksiyonlar ---
-def tr_fix(text):
-    if not isinstance(text, str): return str(text)
-    mapping = {'Ğ': 'G', 'ğ': 'g', 'Ü': 'U', 'ü': 'u', 'Ş': 'S', 'ş': 's', 'İ': 'I', 'ı': 'i', 'Ö': 'O', 'ö': 'o', 'Ç': 'C', 'ç': 'c'}
-    for k, v in mapping.items(): text = text.replace(k, v)
-    return text
-
-def normalize_str(s):
-    if not isinstance(s, str): return ""
-    return s.replace('ı','i').replace('İ','I').replace('ğ','g').replace('Ğ','G').replace('ş','s').replace('Ş','S').replace('ö','o').replace('Ö','O').replace('ç','c').replace('Ç','C').upper()
-
-def format_duration(td):
-    return str(td).split('.')[0]
-
-def calculate_mkt(temps_celsius):
-    temps = pd.to_numeric(temps_celsius, errors='coerce').dropna()
-    if temps.empty: return None
-    temps_kelvin = temps.values + 273.15
-    dh_r = 10000 
-    exp_terms = np.exp(-dh_r / temps_kelvin)
-    avg_exp = exp_terms.mean()
-    if avg_exp == 0: return None
-    return (dh_r / (-np.log(avg_exp))) - 273.15
-
-# --- Özel Veri Dönüştürücüler ---
-def parse_date_robust(date_str):
-    if pd.isna(date_str): return pd.NaT
-    s = str(date_str).strip()
-    m = re.search(r'(\d{1,2})[./-](\d{1,2})[./-](\d{4})\s+(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?', s)
-    if m:
-        d, mon, y, h, min, sec = m.groups()
-        sec = int(sec) if sec else 0
-        try:
-            return pd.Timestamp(year=int(y), month=int(mon), day=int(d), hour=int(h), minute=int(min), second=sec)
-        except:
-            return pd.NaT
-    try:
-        return pd.to_datetime(s, dayfirst=True)
-    except:
-        return pd.NaT
-
-def parse_temp_robust(temp_str):
-    if pd.isna(temp_str): return np.nan
-    s = str(temp_str).strip()
-    # Katı Kural: Sadece gerçek sayısal sıcaklıkları alır. ("Sensör 1", "Alarm" gibi metin içeren satırları atlar)
-    m = re.search(r'^\s*[<>]?\s*(-?\d+(?:[,.]\d+)?)\s*(?:°?C|c)?\s*$', s, re.IGNORECASE)
-    if m:
-        val = m.group(1).replace(',', '.')
-        try:
-            return float(val)
-        except:
-            return np.nan
-    return np.nan
-
-# --- PDF Sınıfı ve Oluşturucu ---
-class ReportPDF(FPDF):
-    def __init__(self, metadata, report_title):
-        super().__init__()
-        self.metadata = metadata
-        self.report_title = report_title
-        self.set_auto_page_break(auto=True, margin=15)
-
-    def header(self):
-        self.set_font('Arial', 'B', 14)
-        self.cell(0, 10, tr_fix(self.report_title), ln=True, align='C')
-        self.set_font('Arial', '', 9)
-        self.cell(40, 6, tr_fix("Birim:"), border=0)
-        self.cell(0, 6, tr_fix(self.metadata.get('Birim', '-')), ln=True)
-        self.cell(40, 6, tr_fix("Depo:"), border=0)
-        self.cell(0, 6, tr_fix(self.metadata.get('Depo', '-')), ln=True)
-        self.cell(40, 6, tr_fix("Stok Birimi:"), border=0)
-        self.cell(0, 6, tr_fix(self.metadata.get('Stok', '-')), ln=True)
-        
-        if self.metadata.get('expected_start') and self.metadata.get('expected_end'):
-            start_str = self.metadata['expected_start'].strftime('%d.%m.%Y %H:%M')
-            end_str = self.metadata['expected_end'].strftime('%d.%m.%Y %H:%M')
-            self.cell(40, 6, tr_fix("Rapor Donemi:"), border=0)
-            self.cell(0, 6, f"{start_str} - {end_str}", ln=True)
-            
-        self.ln(5)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Sayfa {self.page_no()}', 0, 0, 'C')
-
-    def add_violation_summary(self, summary_data):
-        self.set_font('Arial', 'B', 11)
-        self.cell(0, 8, tr_fix("IHLAL VE TERMAL STRES OZETI"), ln=True)
-        self.set_font('Arial', '', 10)
-        col_w = 45
-        self.cell(col_w, 7, tr_fix("Kriter"), 1)
-        self.cell(col_w, 7, tr_fix("Toplam Sure"), 1)
-        self.cell(col_w, 7, tr_fix("En Uc Deger"), 1)
-        self.ln()
-        self.cell(col_w, 7, tr_fix("Ust Limit Asimi"), 1)
-        self.cell(col_w, 7, tr_fix(summary_data['max_dur']), 1)
-        self.cell(col_w, 7, tr_fix(summary_data['max_val']), 1)
-        self.ln()
-        self.cell(col_w, 7, tr_fix("Alt Limit Asimi"), 1)
-        self.cell(col_w, 7, tr_fix(summary_data['min_dur']), 1)
-        self.cell(col_w, 7, tr_fix(summary_data['min_val']), 1)
-        self.ln(5)
-        if summary_data.get('mkt_val'):
-            self.cell(0, 6, tr_fix(f"Ortalama Kinetik Sicaklik (MKT): {summary_data['mkt_val']}"), ln=True)
-        self.ln(5)
-        self.set_font('Arial', 'B', 11)
-        self.multi_cell(0, 8, tr_fix(f"KARAR: {summary_data.get('status')} - {summary_data.get('decision', '-')}"), border=1, align='C')
-        self.ln(5)
-
-    def add_table(self, df, empty_msg="Veri bulunamadi."):
-        if df.empty:
-            self.set_font('Arial', 'I', 10)
-            self.cell(0, 10, tr_fix(empty_msg), ln=True, align='C')
-            return
-            
-        col_width = 190 / len(df.columns)
-        self.set_font('Arial', 'B', 9)
-        self.set_fill_color(200, 220, 255) 
-        for col in df.columns:
-            self.cell(col_width, 8, tr_fix(col), border=1, fill=True, align='C')
-        self.ln()
-        self.set_font('Arial', '', 8)
-        self.set_fill_color(255, 255, 255)
-        for index, row in df.iterrows():
-            for item in row:
-                self.cell(col_width, 7, tr_fix(str(item)), border=1, align='C')
-            self.ln()
-
-def create_pdf_bytes(df, metadata, title, violation_summary=None, empty_msg="Veri bulunamadi."):
-    pdf = ReportPDF(metadata, title)
-    pdf.add_page()
-    if violation_summary: pdf.add_violation_summary(violation_summary)
-    pdf.add_table(df, empty_msg)
-    return pdf.output(dest='S').encode('latin-1', 'ignore')
-
-# --- Veri Ayrıştırma Modülü ---
-def extract_metadata_from_text(text):
-    meta = {}
-    try:
-        lines = text.splitlines()
-        for line in lines[:50]:
-            parts = [p.strip().replace('"', '') for p in line.replace(';', ',').split(',')]
-            for i in range(len(parts)-1):
-                key = normalize_str(parts[i])
-                val = parts[i+1]
-                
-                if "DONEM" in key and "-" in val:
-                    d_parts = val.split("-")
-                    meta['Baslangic'] = d_parts[0].strip()
-                    meta['Bitis'] = d_parts[1].strip()
-                
-                if not val:
-                    for j in range(i+1, len(parts)):
-                        if parts[j]:
-                            val = parts[j]
-                            break
-                if not val: continue
-                
-                if "STOK BIRIMI" in key:
-                    for j in range(i+1, len(parts)):
-                        if parts[j] and not re.match(r'^\d+(\.\d+)?$', parts[j]):
-                            meta['Stok'] = parts[j]
-                            break
-                
-                if "BIRIM" == key and "STOK" not in key: meta['Birim'] = val
-                elif "DEPO" == key: meta['Depo'] = val
-    except:
-        pass
-    return meta
-
-def analyze_data(file):
-    filename = file.name.lower()
-    metadata = {}
-    df = None
-    
+# --- Tanılama ---
+# Kapalıyken hiçbir ölçüm yapılmaz; açıkken aşama süreleri çalıştırmanın sonunda bu bölmede gösterilir.
+diag_box = st.sidebar.expander("🔧 Tanılama")
+diag_enabled = diag_box.checkbox("Aşama ölçümlerini kaydet", help="Her aşamanın süresini, işlenen satır sayısını ve bellek farkını kaydeder.")
+profile_run = diag_box.button("Bu çalıştırmayı profille (cProfile)", disabled=not diag_enabled)
+
+run_recorder = StageRecorder() if diag_enabled else None
+# PDF'ler indirme sırasında (çalıştırma bittikten sonra) üretildiğinden ölçümleri oturum boyunca saklanır
+pdf_recorder = st.session_state.setdefault('diag_pdf_recorder', StageRecorder()) if diag_enabled else None
+set_recorder(run_recorder)
+profiler = None
+if profile_run:
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+# --- Grafik Örnekleme ---
+# Uzun kayıtlarda tarayıcıya tüm okumalar yerine en fazla nokta bütçesi kadar nokta gönderilir
+# (seçim: core.select_chart_points).
+CHART_POINT_BUDGET = 5000
+
+def build_chart_frame(timestamps, temps, gap_threshold, max_points=None, min_limit=-np.inf, max_limit=np.inf, gap_starts=None):
+    # Kesinti olan yerlere NaN satırı eklenir (kopuk çizgi); max_points verilirse örnekleme yapılır
+    # gap_starts verilmezse kesintiler ardışık zaman damgaları arasındaki farktan bulunur (kovalarda verilir)
+    # Girdi dizileri kopyalanmaz; yalnızca seçilen noktalar float64'e genişletilir
+    ts, vals = np.asarray(timestamps), np.asarray(temps)
+    if gap_starts is None:
+        gap_starts = np.flatnonzero(np.diff(ts) >= np.timedelta64(gap_threshold))
+    idx = np.arange(len(ts)) if max_points is None else select_chart_points(vals, max_points, min_limit, max_limit, gap_starts)
+
+    ts, vals = ts[idx], widen_temps(vals[idx])
+    break_at = np.searchsorted(idx, gap_starts) + 1
+    ts = np.insert(ts, break_at, ts[break_at - 1] + np.timedelta64(1, 's'))
+    vals = np.insert(vals, break_at, np.nan)
+    return pd.DataFrame({'Timestamp': ts, 'Temp': vals})
+
+# --- Önbellekli Analiz Aşamaları ---
+# Her aşama dosyanın içerik özeti (hash) ve yalnızca kendi kullandığı ayarlarla önbelleğe alınır.
+# Böylece örn. Max sıcaklık değiştiğinde dosya yeniden ayrıştırılmaz, kesinti tespiti tekrar çalışmaz.
+# Paylaşılan sunucuda bellek sınırı için kayıt sayısı ve yaşam süresi ortam değişkeniyle ayarlanabilir.
+# Okuma başına dizi döndüren aşamalar (seri, kovalar, sıralama, pencere değerleri) cache_resource ile tutulur:
+# cache_data her çalıştırmada sonucu pickle ile kopyalar (disk önbelleği memmap'lerini de baştan sona okur);
+# bu sonuçlar oturumlar arasında paylaşılır ve yalnızca okunur. Küçük türetilmiş sonuçlar cache_data'da kalır.
+CACHE_MAX_ENTRIES = int(os.environ.get("DOLAP_CACHE_MAX_ENTRIES", "16"))
+CACHE_TTL_SECONDS = int(os.environ.get("DOLAP_CACHE_TTL_SECONDS", "3600"))
+# Ayrıştırılmış veriler sunucu yeniden başlasa da diskte kalır; bütçe 0 ise disk önbelleği kapalıdır
+DISK_CACHE_DIR = os.environ.get("DOLAP_DISK_CACHE_DIR", "~/.cache/asi-dolap-takip")
+DISK_CACHE_MAX_MB = int(os.environ.get("DOLAP_DISK_CACHE_MAX_MB", "2048"))
+
+@st.cache_resource
+def disk_cache():
+    if DISK_CACHE_MAX_MB <= 0: return None
     try:
-        file_bytes = file.getvalue() 
-        
-        if filename.endswith(('.xlsx', '.xls')) and not filename.endswith('.csv'):
-            try:
-                df_raw = pd.read_excel(io.BytesIO(file_bytes), header=None)
-                header_idx = 0
-                for i in range(min(30, len(df_raw))):
-                    row_vals = [normalize_str(x) for x in df_raw.iloc[i].tolist()]
-                    
-                    if "DONEM" in row_vals:
-                        idx = row_vals.index("DONEM")
-                        if idx + 1 < len(row_vals):
-                            val = df_raw.iloc[i, idx+1]
-                            if isinstance(val, str) and "-" in val:
-                                d_parts = val.split("-")
-                                metadata['Baslangic'] = d_parts[0].strip()
-                                metadata['Bitis'] = d_parts[1].strip()
-
-                    if "BIRIM" in row_vals and not any("STOK" in v for v in row_vals):
-                        b_idx = row_vals.index("BIRIM")
-                        if b_idx + 1 < len(row_vals):
-                            metadata['Birim'] = df_raw.iloc[i, b_idx+1]
-                            
-                    if "DEPO" in row_vals:
-                        d_idx = row_vals.index("DEPO")
-                        if d_idx + 1 < len(row_vals):
-                            metadata['Depo'] = df_raw.iloc[i, d_idx+1]
-
-                    if "STOK BIRIMI" in row_vals:
-                        s_idx = row_vals.index("STOK BIRIMI")
-                        for k in range(s_idx + 1, min(s_idx + 5, len(row_vals))):
-                            val = df_raw.iloc[i, k]
-                            if isinstance(val, str) and len(val) > 3 and not re.match(r'^\d+(\.\d+)?$', val):
-                                metadata['Stok'] = val
-                                break
-
-                    if any("SICAKLIK" in v for v in row_vals) and any(("ZAMAN" in v or "TARIH" in v) for v in row_vals):
-                        header_idx = i
-                        
-                df = pd.read_excel(io.BytesIO(file_bytes), header=header_idx)
-            except Exception as e:
-                return None, {}, f"Excel Hatası: {str(e)}"
-        
-        else:
-            try: text = file_bytes.decode('utf-8-sig')
-            except: text = file_bytes.decode('ISO-8859-9')
-                
-            metadata = extract_metadata_from_text(text)
-            
-            lines = text.splitlines()
-            if not lines: return None, {}, "Dosya tamamen boş."
-                
-            header_idx = 0
-            for idx, line in enumerate(lines[:50]):
-                norm_line = normalize_str(line)
-                if ("SICAKLIK" in norm_line or "TEMP" in norm_line) and ("ZAMAN" in norm_line or "TARIH" in norm_line):
-                    header_idx = idx
-                    break
-            
-            header_line = lines[header_idx]
-            sep = ';' if header_line.count(';') >= header_line.count(',') else ','
-            try: df = pd.read_csv(io.StringIO(text), header=header_idx, sep=sep, engine='python', on_bad_lines='skip')
-            except Exception as e: return None, {}, f"CSV Ayraç Hatası: {str(e)}"
+        return DiskCache(DISK_CACHE_DIR, DISK_CACHE_MAX_MB * 1_000_000)
+    except OSError as e:
+        logging.getLogger("dolap").warning("Disk önbelleği açılamadı (%s): %s", DISK_CACHE_DIR, e)
+        return None
 
-        if df is None or df.empty: return None, {}, "Tablo verisi bulunamadı."
-        
-        df = df.dropna(axis=1, how='all')
-        df.columns = [str(c).strip().replace('"', '').replace('\r', '') for c in df.columns]
-        
-        time_col = None
-        temp_col = None
-
-        for col in df.columns:
-            norm_col = normalize_str(col)
-            if any(k in norm_col for k in ["ZAMAN", "TARIH", "DATE"]):
-                if "KAYIT" not in norm_col and time_col is None: time_col = col
-            if any(k in norm_col for k in ["SICAK", "TEMP", "ISI"]):
-                if not any(k in norm_col for k in ["CIHAZ", "SENSOR", "LIMIT", "DURUM", "NO", "ID"]):
-                    if temp_col is None: temp_col = col
-                        
-        if not time_col:
-            for col in df.columns:
-                if "TARIH" in normalize_str(col): 
-                    time_col = col
+@st.cache_resource
+def reading_store():
+    try:
+        return ReadingStore(READING_STORE_PATH)
+    except (OSError, sqlite3.Error) as e:
+        logging.getLogger("dolap").warning("Geçmiş deposu açılamadı (%s): %s", READING_STORE_PATH, e)
+        return None
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Geçmiş deposuna kaydediliyor...")
+def store_stage(file_hash, name, _series, _metadata):
+    # Dönüş: eklenen yeni okuma sayısı (depo yoksa None); aynı dosya için yalnızca bir kez çalışır
+    store = reading_store()
+    return store.add(_series, _metadata, name, file_hash) if store is not None else None
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="Dosya ayrıştırılıyor...")
+def ingest_stage(file_hash, _file):
+    return load_export_cached(_file.name, _file.getvalue(), disk_cache(), file_hash)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def gap_stage(file_hash, gap_threshold_hours, _series, _metadata):
+    return detect_gaps(_series, _metadata, gap_threshold_hours)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def violation_stage(file_hash, min_temp_limit, max_temp_limit, intervention_dt, time_weighted, _series):
+    return detect_violations(_series, min_temp_limit, max_temp_limit, intervention_dt, time_weighted)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def resample_stage(file_hash, interval_seconds, _series):
+    return resample_series(_series, interval_seconds)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def bucket_gap_stage(file_hash, interval_seconds, gap_threshold_hours, _buckets, _metadata):
+    return detect_bucket_gaps(_buckets, _metadata, gap_threshold_hours)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def bucket_violation_stage(file_hash, interval_seconds, min_temp_limit, max_temp_limit, intervention_dt, time_weighted, _buckets):
+    return detect_bucket_violations(_buckets, min_temp_limit, max_temp_limit, intervention_dt, time_weighted)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def channel_stage(file_hash, gap_threshold_hours, min_temp_limit, max_temp_limit, intervention_dt, time_weighted, _series, _metadata):
+    return channel_results(_series, _metadata, gap_threshold_hours, min_temp_limit, max_temp_limit, intervention_dt, time_weighted)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def rolling_stage(file_hash, window_seconds, min_temp_limit, max_temp_limit, intervention_dt, time_weighted, _series):
+    return rolling_analytics(_series.until(intervention_dt), window_seconds, min_temp_limit, max_temp_limit, time_weighted)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def viewer_order_stage(file_hash, _series):
+    return temperature_order(_series)
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def viewer_violation_stage(file_hash, min_temp_limit, max_temp_limit, _series):
+    return violation_positions(_series, min_temp_limit, max_temp_limit)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def viewer_gap_stage(file_hash, gap_threshold_hours, _series):
+    return gap_edge_positions(_series, gap_threshold_hours)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def report_stage(file_hash, stage_key, title, violation_summary, empty_msg, _df, _metadata):
+    # stage_key: raporun içeriğini belirleyen ayarlar (ör. limitler, kesinti eşiği).
+    # İndirme düğmelerine partial(report_stage, ...) verilir; PDF yalnızca tıklanınca üretilir.
+    return create_pdf_bytes(_df, _metadata, title, violation_summary, empty_msg)
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def full_list_report_stage(file_hash, _series, _metadata):
+    # Tüm satırların metne çevrilmesi yalnızca bu rapor istendiğinde yapılır
+    return create_pdf_bytes(series_table(_series), _metadata, "Tum Sicaklik Raporu (Tam Liste)")
+
+def with_recorder(recorder, fn):
+    # İndirme düğmesinin geç çağırdığı PDF üreticisini verilen kaydediciyle ölçer
+    if recorder is None: return fn
+    def run():
+        with recording(recorder):
+            return fn()
+    return run
+
+# Tanılama açıkken aşama kayıtları sunucu günlüğüne (stderr) de yazılır; DOLAP_DIAG_LOG_LEVEL=WARNING ile kapatılır.
+# Streamlit betiği her etkileşimde yeniden çalıştırdığından işleyici yalnızca bir kez eklenir
+diag_logger = logging.getLogger("dolap.tanilama")
+if not diag_logger.handlers:
+    diag_handler = logging.StreamHandler()
+    diag_handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    diag_logger.addHandler(diag_handler)
+    diag_logger.setLevel(os.environ.get("DOLAP_DIAG_LOG_LEVEL", "INFO").upper())
+    diag_logger.propagate = False
+
+def render_diagnostics(box, recorder, pdf_recorder, profiler, source_name):
+    records = recorder.records()
+    pdf_records = pdf_recorder.records() if pdf_recorder is not None else []
+    for rec in records + pdf_records:
+        # Yapılandırılmış log: her aşama tek satır JSON
+        diag_logger.info(json.dumps({'dosya': source_name, **rec}, ensure_ascii=False))
+
+    def table(recs):
+        return pd.DataFrame({
+            "Aşama": ["· " * r['depth'] + r['stage'] for r in recs],
+            "Süre (ms)": [round(r['seconds'] * 1000, 1) for r in recs],
+            "Satır": pd.array([r['rows'] for r in recs], dtype="Int64"),
+            "Bellek farkı (MB)": [round(r['mem_delta_mb'], 1) if r['mem_delta_mb'] is not None else None for r in recs],
+            "Çağrı": [r['calls'] for r in recs],
+        })
+
+    box.caption("Son çalıştırma (önbellekten gelen aşamalar ~0 ms görünür)")
+    box.dataframe(table(records), hide_index=True, use_container_width=True)
+    if pdf_records:
+        box.caption("PDF üretimi (bu oturumdaki indirmeler)")
+        box.dataframe(table(pdf_records), hide_index=True, use_container_width=True)
+    export = json.dumps({'dosya': source_name, 'asamalar': records, 'pdf': pdf_records}, ensure_ascii=False, indent=2)
+    box.download_button("📥 Ölçümleri JSON İndir", export, "tanilama.json", "application/json")
+
+    if profiler is not None:
+        profiler.create_stats()
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(25)
+        box.download_button("📥 cProfile Çıktısını İndir (.prof)", marshal.dumps(profiler.stats), "profil.prof", "application/octet-stream")
+        box.code(report.getvalue()[-6000:], language=None)
+
+# --- Filo (Çoklu Dosya) Modu ---
+# Dosyalar süreç havuzunda paralel ayrıştırılır ve oturumda içerik özetiyle saklanır;
+# yeni bir dosya eklendiğinde yalnızca o dosya ayrıştırılır, kaldırılan dosyalar bellekten atılır.
+# spawn: Streamlit'in iş parçacıkları varken fork güvenli değildir (bench_pipeline da spawn kullanır). İşçiler
+# betiği __mp_main__ olarak bir kez yükler; dosya yüklenmemiş olduğundan ayrıştırma başlatmazlar
+@st.cache_resource
+def ingest_pool():
+    return ProcessPoolExecutor(max_workers=default_workers(), mp_context=get_context("spawn"))
+
+def upload_hashes(files):
+    # Yüklenen dosyanın içeriği değişmez; özet file_id başına bir kez hesaplanır (her yeniden çalıştırmada değil)
+    known = st.session_state.get('upload_hashes', {})
+    current = {f.file_id: known.get(f.file_id) or file_content_hash(f.getvalue()) for f in files}
+    st.session_state['upload_hashes'] = current
+    return [current[f.file_id] for f in files]
+
+def ingest_fleet(files):
+    store = st.session_state.setdefault('fleet_store', {})
+    hashes = upload_hashes(files)
+    pending = {h: f for h, f in zip(hashes, files) if h not in store}
+    cache = disk_cache()
+    if cache is not None:
+        for h in list(pending):
+            hit = cache.get(h)
+            if hit is not None:
+                store[h] = (*hit, "")
+                del pending[h]
+    if pending:
+        with st.spinner(f"{len(pending)} dosya ayrıştırılıyor..."):
+            # Bir işçi çökerse (örn. bellek yetmezliği) havuz kalıcı olarak bozulur ve önbellekte kaldığı sürece
+            # sonraki her çalıştırma BrokenProcessPool verir; bozuk havuz atılır, bitmeyen dosyalar yeni havuzda bir
+            # kez daha denenir, yine çökenler hatalı olarak işaretlenir
+            for attempt in range(2):
+                broken = {}
+                try:
+                    futures = {h: ingest_pool().submit(load_export, f.name, f.getvalue()) for h, f in pending.items()}
+                except BrokenProcessPool:
+                    futures, broken = {}, dict(pending)
+                for h, fut in futures.items():
+                    try:
+                        store[h] = fut.result()
+                        if cache is not None and store[h][0] is not None:
+                            cache.put(h, *store[h][:2])
+                    except BrokenProcessPool:
+                        broken[h] = pending[h]
+                    except Exception as e:
+                        store[h] = (None, {}, f"Bilinmeyen Hata: {str(e)}")
+                if not broken:
                     break
-        
-        if not time_col or not temp_col: 
-            return None, {}, f"Sıcaklık veya Tarih sütunu bulunamadı. Tespit Edilen Sütunlar: {', '.join(df.columns)}"
-
-        metadata['expected_start'] = parse_date_robust(metadata.get('Baslangic'))
-        metadata['expected_end'] = parse_date_robust(metadata.get('Bitis'))
-
-        df['Timestamp'] = df[time_col].apply(parse_date_robust)
-        df['Temp'] = df[temp_col].apply(parse_temp_robust)
-            
-        df = df.dropna(subset=['Timestamp', 'Temp']).sort_values('Timestamp')
-        
-        if len(df) == 0:
-            return None, {}, "Sütunlar bulundu ancak veriler sayıya veya tarihe çevrilemedi."
-
-        return df, metadata, ""
-
-    except Exception as e:
-        import traceback
-        return None, {}, f"Bilinmeyen Hata: {str(e)}"
+                ingest_pool().shutdown(wait=False, cancel_futures=True)
+                ingest_pool.clear()
+                pending = broken
+            for h in broken:
+                store[h] = (None, {}, "Bilinmeyen Hata: Ayrıştırma süreci beklenmedik şekilde sonlandı")
+    for h in set(store) - set(hashes):
+        del store[h]
+    return hashes, store
+
+def fleet_row(series, metadata, error_message, violation_key):
+    if series is None or series.empty:
+        return summary_row(None, {'error': error_message})
+    if series.n_channels > 1:
+        result = multi_channel_result(series, channel_results(series, metadata, gap_threshold_hours, *violation_key))
+    else:
+        result = evaluate_cabinet(series, metadata, detect_gaps(series, metadata, gap_threshold_hours),
+                                  detect_violations(series, *violation_key))
+    return summary_row(None, result)
+
+def fleet_overview(files, hashes, store, violation_key):
+    # Filo satırları oturumda (dosya özeti, ayarlar) anahtarıyla tutulur; aşama önbelleklerine yazılmaz ki
+    # filo boyu kadar kayıt, ayrıntı görünümünün önbellek kayıtlarını dışarı atmasın
+    known = st.session_state.get('fleet_rows', {})
+    current = {}
+    rows = []
+    for f, h in zip(files, hashes):
+        key = (h, gap_threshold_hours, *violation_key)
+        if key not in current:
+            current[key] = known.get(key) or fleet_row(*store[h], violation_key)
+        rows.append({**current[key], "Dosya": f.name})
+    st.session_state['fleet_rows'] = current
+    return summary_frame(rows)
 
 # --- ANA AKIŞ ---
-if uploaded_file is not None:
-    df, metadata, error_message = analyze_data(uploaded_file)
+decision_cutoff = intervention_dt if has_intervention and intervention_dt else None
+violation_key = (min_temp_limit, max_temp_limit, decision_cutoff, time_weighted_durations)
+
+active_file = None
+if fleet_mode and uploaded_files:
+    with stage("filo ayrıştırma (süreç havuzu)", len(uploaded_files)):
+        fleet_hashes, fleet_store = ingest_fleet(uploaded_files)
+    with stage("filo özeti", len(uploaded_files)):
+        df_fleet = fleet_overview(uploaded_files, fleet_hashes, fleet_store, violation_key)
+    if save_to_store:
+        with stage("geçmiş deposuna kayıt", len(uploaded_files)):
+            stored = [store_stage(h, f.name, *fleet_store[h][:2]) for f, h in zip(uploaded_files, fleet_hashes) if fleet_store[h][0] is not None]
+        if None not in stored:
+            st.sidebar.caption(f"Geçmiş deposuna {sum(stored)} yeni okuma eklendi.")
+
+    st.subheader(f"🏥 Filo Özeti ({len(uploaded_files)} dolap)")
+    status_counts = df_fleet["Durum"].value_counts()
+    col_f1, col_f2, col_f3, col_f4 = st.columns(4)
+    col_f1.metric("Başarılı", int(status_counts.get("Başarılı", 0)))
+    col_f2.metric("Geliştirilmeli", int(status_counts.get("Geliştirilmeli", 0)))
+    col_f3.metric("Acil Müdahale", int(status_counts.get("Acil Müdahale", 0)))
+    col_f4.metric("Okunamayan", int((df_fleet["Hata"] != "").sum()))
+    st.dataframe(df_fleet, use_container_width=True, hide_index=True)
+    st.download_button("📥 Filo Özetini CSV İndir", df_fleet.to_csv(sep=';', index=False).encode('utf-8-sig'), "filo_ozeti.csv", "text/csv")
+
+    selected = st.selectbox("Ayrıntılı incelenecek dolap", range(len(uploaded_files)),
+                            format_func=lambda i: f"{uploaded_files[i].name} — {df_fleet['Durum'].iloc[i] or 'Okunamadı'}")
+    st.divider()
+    active_file = (fleet_hashes[selected], *fleet_store[fleet_hashes[selected]])
+elif uploaded_file is not None:
+    with stage("dosya özeti (SHA-256)"):
+        file_hash = upload_hashes([uploaded_file])[0]
+    with stage("ayrıştırma") as s:
+        active_file = (file_hash, *ingest_stage(file_hash, uploaded_file))
+        s.rows = len(active_file[1]) if active_file[1] is not None else None
+    if save_to_store and active_file[1] is not None:
+        with stage("geçmiş deposuna kayıt", len(active_file[1])):
+            stored = store_stage(file_hash, uploaded_file.name, *active_file[1:3])
+        if stored is not None:
+            st.sidebar.caption(f"Geçmiş deposuna {stored} yeni okuma eklendi.")
+elif history_mode:
+    # Depodaki bir dolabın seçilen aralığı, yüklenen bir dosya gibi aşağıdaki akışta analiz edilir
+    history = reading_store()
+    df_cabinets = history.cabinets() if history is not None else pd.DataFrame()
+    if df_cabinets.empty:
+        st.info("Geçmiş deposunda henüz kayıt yok. Dosya yüklerken \"Yüklenenleri geçmiş deposuna kaydet\" seçeneğini işaretleyin.")
+    else:
+        st.subheader(f"🗄️ Geçmiş Deposu ({len(df_cabinets)} dolap)")
+        st.dataframe(df_cabinets.drop(columns=["id"]).rename(columns={"Ilk": "İlk Okuma", "Son": "Son Okuma"}),
+                     use_container_width=True, hide_index=True)
+        picked = df_cabinets.iloc[st.selectbox("Analiz edilecek dolap", range(len(df_cabinets)), format_func=lambda i: " / ".join(
+            v for v in df_cabinets.loc[i, ["Birim", "Depo", "Kanal"]] if v))]
+        first_day, last_day = picked["Ilk"].date(), picked["Son"].date()
+        picked_range = st.date_input("Tarih aralığı", value=(first_day, last_day), min_value=first_day, max_value=last_day, format="DD.MM.YYYY")
+        range_start = pd.Timestamp(picked_range[0])
+        range_end = pd.Timestamp(picked_range[-1]) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+        st.divider()
+        with stage("depo aralık sorgusu") as s:
+            series, metadata = history.load_range(picked["id"], range_start, range_end)
+            s.rows = len(series)
+        # Depoya yeni okuma eklendiğinde önbellekteki aşama sonuçları kullanılmaz
+        range_key = f"depo:{picked['id']}:{picked['Okuma']}:{range_start.value}:{range_end.value}"
+        active_file = (range_key, series, metadata, "Seçilen aralıkta kayıt bulunamadı.")
+
+if active_file is not None:
+    file_hash, series, metadata, error_message = active_file
     
-    if df is not None and not df.empty:
+    if series is not None and not series.empty:
         
         expected_start = metadata.get('expected_start')
         expected_end = metadata.get('expected_end')
         
-        actual_start_dt = df['Timestamp'].min()
-        actual_end_dt = df['Timestamp'].max()
+        actual_start_dt = series.start
+        actual_end_dt = series.end
         
         ref_start_str = expected_start.strftime('%d.%m.%Y %H:%M') if pd.notna(expected_start) else actual_start_dt.strftime('%d.%m.%Y %H:%M')
         ref_end_str = expected_end.strftime('%d.%m.%Y %H:%M') if pd.notna(expected_end) else actual_end_dt.strftime('%d.%m.%Y %H:%M')
@@ -346,150 +423,170 @@ if uploaded_file is not None:
                 <div>
                     <b>📅 Rapor Dönemi (Başlangıç):</b> {ref_start_str}<br>
                     <b>📅 Rapor Dönemi (Bitiş):</b> {ref_end_str}<br>
-                    <b>📊 Geçerli Sıcaklık Kaydı:</b> {len(df)} adet
+                    <b>📊 Geçerli Sıcaklık Kaydı:</b> {len(series)} adet
                 </div>
             </div>
         </div>
         """, unsafe_allow_html=True)
         
+        date_stats = metadata.get('date_parse_stats')
+        if date_stats:
+            st.caption(f"Tarih ayrıştırma: {date_stats['vectorized']} satır hızlı yol, {date_stats['fallback']} satır yedek yol, {date_stats['failed']} satır çevrilemedi.")
+
         if has_intervention and intervention_dt:
             st.warning(f"⚠️ DİKKAT: {intervention_dt.strftime('%d.%m.%Y %H:%M')} sonrası veriler yoksayıldı.")
 
-        # --- KESİNTİ (BOŞLUK) TESPİTİ ---
         gap_threshold = timedelta(hours=gap_threshold_hours)
-        all_gaps = []
-        
-        if pd.notna(expected_start):
-            start_diff = actual_start_dt - expected_start
-            if start_diff >= gap_threshold:
-                all_gaps.append({"Tip": "Başlangıç Veri Kaybı", "Baslangic": expected_start, "Bitis": actual_start_dt, "Sure": start_diff})
-
-        df['TimeDiff'] = df['Timestamp'].diff()
-        df['PrevTimestamp'] = df['Timestamp'].shift(1)
-        for _, row in df[df['TimeDiff'] >= gap_threshold].iterrows():
-            all_gaps.append({"Tip": "Sensör Veri Kesintisi (Ara Boşluk)", "Baslangic": row['PrevTimestamp'], "Bitis": row['Timestamp'], "Sure": row['TimeDiff']})
-
-        if pd.notna(expected_end):
-            end_diff = expected_end - actual_end_dt
-            if end_diff >= gap_threshold:
-                all_gaps.append({"Tip": "Bitiş Veri Kaybı", "Baslangic": actual_end_dt, "Bitis": expected_end, "Sure": end_diff})
-
-        df_gaps_report = pd.DataFrame()
-        if all_gaps:
-            df_gaps_report = pd.DataFrame(all_gaps).sort_values('Baslangic')
-            df_gaps_report['Baslangic'] = df_gaps_report['Baslangic'].dt.strftime('%d.%m.%Y %H:%M:%S')
-            df_gaps_report['Bitis'] = df_gaps_report['Bitis'].dt.strftime('%d.%m.%Y %H:%M:%S')
-            df_gaps_report['Sure'] = df_gaps_report['Sure'].astype(str).apply(lambda x: x.split('.')[0])
-            df_gaps_report.rename(columns={
-                "Tip": "Kesinti Türü", 
-                "Baslangic": "Başlangıç Tarih/Saat", 
-                "Bitis": "Bitiş Tarih/Saat", 
-                "Sure": "Toplam Kesinti Süresi"
-            }, inplace=True)
-
-        # --- İHLAL VE KARAR MANTIĞI ---
-        df_clean = df.copy()
-        if has_intervention and intervention_dt:
-            df_decision_scope = df_clean[df_clean['Timestamp'] <= intervention_dt].copy()
-        else:
-            df_decision_scope = df_clean.copy()
+        full_series, full_hash = series, file_hash
+
+        # --- ÇOK KANALLI DOSYALAR ---
+        # Tüm kanallar tek geçişte analiz edilir; aşağıdaki sekmeler seçilen kanalın okumalarıyla çalışır
+        if series.n_channels > 1:
+            with stage("çok kanallı analiz", len(series) * series.n_channels):
+                channel_list = channel_stage(file_hash, gap_threshold_hours, *violation_key, series, metadata)
+            st.subheader(f"🔀 Kanallar ({series.n_channels} sıcaklık sütunu)")
+            df_channels = summary_frame([summary_row(name, r) for name, r in zip(series.names, channel_list)])
+            st.dataframe(df_channels[["Dosya", "Kayıt", "Durum", "MKT (C)", "Üst Limit Aşım", "En Yüksek (C)", "Alt Limit Aşım",
+                                      "En Düşük (C)", "Kesinti Sayısı"]].rename(columns={"Dosya": "Kanal"}),
+                         use_container_width=True, hide_index=True)
+            with stage("kanal grafiği", len(series) * series.n_channels):
+                df_plot = pd.concat([build_chart_frame(ch.timestamps(), ch.temps, gap_threshold, CHART_POINT_BUDGET // series.n_channels,
+                                                       min_temp_limit, max_temp_limit).assign(Kanal=name)
+                                     for name, ch in ((name, series.channel(c)) for c, name in enumerate(series.names))])
+                fig_channels = px.line(df_plot, x='Timestamp', y='Temp', color='Kanal', title='Kanallara Göre Sıcaklık', render_mode='webgl')
+                fig_channels.add_hline(y=max_temp_limit, line_dash="dash", line_color="red")
+                fig_channels.add_hline(y=min_temp_limit, line_dash="dash", line_color="blue")
+                fig_channels.update_layout(yaxis_title="Sıcaklık (°C)", xaxis_title="Tarih / Saat")
+                st.plotly_chart(fig_channels, use_container_width=True)
+
+            channel_names = series.names
+            selected_channel = st.selectbox("Ayrıntılı incelenecek kanal", range(series.n_channels),
+                                            format_func=lambda c: f"{channel_names[c]} — {channel_list[c]['summary_stats']['status']}")
+            st.divider()
+            series = series.channel(selected_channel)
+            file_hash = f"{file_hash}:{selected_channel}"
+
+        # --- YENİDEN ÖRNEKLEME ---
+        # Kesinti, ihlal, MKT ve grafik kovalar üzerinden; veri görüntüleyici, tam liste ve kayan pencere ham okumalarla
+        buckets = None
+        if resample_seconds:
+            with stage("yeniden örnekleme", len(series)):
+                buckets = resample_stage(file_hash, resample_seconds, series)
+            max_excess, min_excess, mixed_buckets = resample_error_bounds(buckets, min_temp_limit, max_temp_limit, decision_cutoff,
+                                                                          time_weighted_durations)
+            st.info(f"🗜️ Yeniden örnekleme ({resample_label}): {len(series)} okuma {len(buckets)} kovaya indirildi "
+                    f"({len(series) / len(buckets):.0f} kat azalma). Kesintiler ve en yüksek / en düşük değerler birebir korunur; MKT kova toplamlarından hesaplanır, "
+                    f"ham okumalarla farkı yalnızca kayan nokta yuvarlamasıdır (1e-6 °C'nin altında). "
+                    f"İhlal süreleri eksik hesaplanmaz; max üstü süre en fazla {format_duration(max_excess)}, "
+                    f"min altı süre en fazla {format_duration(min_excess)} fazla hesaplanmış olabilir."
+                    + (" Müdahale anı kova çözünürlüğünde uygulanır." if decision_cutoff else ""))
+            if mixed_buckets:
+                st.warning(f"{mixed_buckets} kovada hem max üstü hem min altı okuma var; bu kovalar max üstü sayıldığından min altı süre eksik kalabilir. Daha kısa bir kova aralığı seçin.")
 
-        mkt_value = calculate_mkt(df_decision_scope['Temp'])
+        # --- KESİNTİ (BOŞLUK) TESPİTİ ---
+        with stage("kesinti tespiti", len(series)):
+            if buckets is not None:
+                all_gaps, df_gaps_report = bucket_gap_stage(file_hash, resample_seconds, gap_threshold_hours, buckets, metadata)
+            else:
+                all_gaps, df_gaps_report = gap_stage(file_hash, gap_threshold_hours, series, metadata)
 
-        df_decision_scope['Status'] = 0 
-        df_decision_scope.loc[df_decision_scope['Temp'] < min_temp_limit, 'Status'] = -1
-        df_decision_scope.loc[df_decision_scope['Temp'] > max_temp_limit, 'Status'] = 1
-        df_decision_scope['Group'] = (df_decision_scope['Status'] != df_decision_scope['Status'].shift()).cumsum()
-        
-        violation_events = []
-        total_max_duration = timedelta(0)
-        total_min_duration = timedelta(0)
-        global_max_val = None
-        global_min_val = None
-        
-        for _, group in df_decision_scope[df_decision_scope['Status'] != 0].groupby('Group'):
-            status = group['Status'].iloc[0]
-            v_type = "Min Alti" if status == -1 else "Max Ustu"
-            s_t = group['Timestamp'].min()
-            e_t = group['Timestamp'].max()
-            dur = e_t - s_t
-            extreme = group['Temp'].min() if status == -1 else group['Temp'].max()
-            
-            if status == 1: 
-                total_max_duration += dur
-                if global_max_val is None or extreme > global_max_val: global_max_val = extreme
-            else: 
-                total_min_duration += dur
-                if global_min_val is None or extreme < global_min_val: global_min_val = extreme
-
-            violation_events.append({"Tur": v_type, "Baslangic": s_t.strftime('%d.%m.%Y %H:%M:%S'), "Bitis": e_t.strftime('%d.%m.%Y %H:%M:%S'), "Sure": format_duration(dur), "En Uc Deger": extreme})
-        
-        df_violations = pd.DataFrame(violation_events)
-        
-        decision_msg = ""
-        status_term = ""
+        # --- İHLAL VE KARAR MANTIĞI ---
+        with stage("ihlal tespiti", len(series)):
+            if buckets is not None:
+                violation_result = bucket_violation_stage(file_hash, resample_seconds, *violation_key, buckets)
+            else:
+                violation_result = violation_stage(file_hash, *violation_key, series)
+            df_violations, total_max_duration, total_min_duration, global_max_val, global_min_val, mkt_value = violation_result
         
-        # Kesinti Kararı Eziyor
-        if len(all_gaps) > 0:
-            decision_msg = "VERİ KESİNTİSİ MEVCUT, İKİNCİL SICAKLIK ÖLÇÜMLERİNİ DEĞERLENDİR"
-            status_term = "Acil Müdahale"
-        elif total_max_duration.total_seconds() == 0 and total_min_duration.total_seconds() == 0:
-            decision_msg = "TÜM VERİLER NORMAL"
-            status_term = "Başarılı"
-        elif total_max_duration.total_seconds() / 3600 >= 8 and (global_max_val and global_max_val >= 15):
-            decision_msg = "IMHA ONERILIR (SURE > 8s VE ISI > 15C)"
-            status_term = "Acil Müdahale"
-        else:
-            decision_msg = "RISKLI VERILER VAR - MANUEL KONTROL"
-            status_term = "Geliştirilmeli"
-
-        summary_stats = {
-            "max_dur": format_duration(total_max_duration) if total_max_duration > timedelta(0) else "-",
-            "max_val": f"{global_max_val} C" if global_max_val is not None else "-",
-            "min_dur": format_duration(total_min_duration) if total_min_duration > timedelta(0) else "-",
-            "min_val": f"{global_min_val} C" if global_min_val is not None else "-",
-            "mkt_val": f"{mkt_value:.2f} C" if mkt_value is not None else "-",
-            "status": status_term,
-            "decision": decision_msg,
-        }
+        status_term, decision_msg = decide_status(len(all_gaps), total_max_duration, total_min_duration, global_max_val)
+        summary_stats = build_summary_stats(total_max_duration, total_min_duration, global_max_val, global_min_val,
+                                            mkt_value, status_term, decision_msg)
 
         # --- ARAYÜZ GRAFİK VE TABLOLAR ---
-        tab1, tab2, tab3 = st.tabs(["📈 Genel Sıcaklık Grafiği", "🚨 İhlal Raporları", "⚠️ Veri Kesintileri"])
+        tab1, tab2, tab3, tab4 = st.tabs(["📈 Genel Sıcaklık Grafiği", "🚨 İhlal Raporları", "⚠️ Veri Kesintileri", "🧮 Kayan Pencere (MKT)"])
 
         with tab1:
             st.subheader("Dolap Sıcaklık Seyri")
             st.markdown("Aşağıdaki grafikte okunan tüm sıcaklık değerlerini saniye saniye görebilirsiniz. **Veri kesintisi yaşanılan zaman aralıkları grafikte boşluk (kopuk çizgi) olarak gösterilmektedir.**")
             
-            # --- YENİ EKLENEN KISIM: Grafikte Kesintileri Boşluk (Kopuk Çizgi) Olarak Gösterme ---
-            df_plot = df_clean.copy()
-            nan_rows = []
-            for _, gap_row in df_plot[df_plot['TimeDiff'] >= gap_threshold].iterrows():
-                nan_rows.append({
-                    'Timestamp': gap_row['PrevTimestamp'] + timedelta(seconds=1),
-                    'Temp': np.nan
-                })
-            if nan_rows:
-                df_plot = pd.concat([df_plot, pd.DataFrame(nan_rows)], ignore_index=True).sort_values('Timestamp')
-
-            fig_line = px.line(df_plot, x='Timestamp', y='Temp', title='Sıcaklık Grafiği')
+            # --- Grafikte Kesintileri Boşluk (Kopuk Çizgi) Olarak Gösterme ---
+            fast_chart = buckets is None and st.toggle("Hızlı grafik modu (WebGL + örnekleme)", value=len(series) > CHART_POINT_BUDGET,
+                                   help="Uzun kayıtlarda grafik en fazla nokta bütçesi kadar noktayla çizilir. Tepe değerler, limit aşımları ve kesintiler her zaman korunur. Tam çözünürlük için aralığı daraltın.")
+            if buckets is not None:
+                with stage("grafik hazırlama (kovalar)", len(buckets)):
+                    bucket_ts = buckets.first_ts.view('datetime64[s]')
+                    bucket_gaps = bucket_gap_positions(buckets, gap_threshold_hours)
+                    df_plot = pd.concat([
+                        build_chart_frame(bucket_ts, values, gap_threshold, CHART_POINT_BUDGET // 3, min_temp_limit, max_temp_limit,
+                                          bucket_gaps).assign(Seri=label)
+                        for label, values in (("Kova max", buckets.max), ("Kova ortalaması", buckets.mean), ("Kova min", buckets.min))
+                    ])
+                    fig_line = px.line(df_plot, x='Timestamp', y='Temp', color='Seri', title=f'Sıcaklık Grafiği ({resample_label} kovalar)',
+                                       render_mode='webgl', color_discrete_map={"Kova max": "indianred", "Kova ortalaması": "#0052cc", "Kova min": "steelblue"})
+                st.caption(f"{len(buckets)} kovanın max / ortalama / min değerleri çiziliyor.")
+            elif fast_chart:
+                chart_start = series.start.to_pydatetime()
+                chart_end = series.end.to_pydatetime()
+                if chart_start < chart_end:
+                    view_start, view_end = st.slider("Grafik aralığı (yakınlaştırma)", min_value=chart_start, max_value=chart_end,
+                                                     value=(chart_start, chart_end), step=timedelta(minutes=1), format="DD.MM.YYYY HH:mm")
+                else:
+                    view_start, view_end = chart_start, chart_end
+                lo = series.position(view_start, side='left')
+                hi = series.position(view_end, side='right')
+                view = series.slice(lo, hi)
+                with stage("grafik hazırlama (örnekleme)", hi - lo):
+                    df_plot = build_chart_frame(view.timestamps(), view.temps, gap_threshold,
+                                                CHART_POINT_BUDGET, min_temp_limit, max_temp_limit)
+                    fig_line = px.line(df_plot, x='Timestamp', y='Temp', title='Sıcaklık Grafiği', render_mode='webgl')
+                shown = int(df_plot['Temp'].notna().sum())
+                st.caption(f"Seçili aralıktaki {hi - lo} okumadan {shown} nokta çiziliyor" + (" (tam çözünürlük)." if shown == hi - lo else " (min/max örnekleme; ihlaller ve kesintiler korunur)."))
+            else:
+                with stage("grafik hazırlama", len(series)):
+                    df_plot = build_chart_frame(series.timestamps(), series.temps, gap_threshold)
+                    fig_line = px.line(df_plot, x='Timestamp', y='Temp', title='Sıcaklık Grafiği')
+
             fig_line.add_hline(y=max_temp_limit, line_dash="dash", line_color="red", annotation_text=f"Max Limit ({max_temp_limit}°C)")
             fig_line.add_hline(y=min_temp_limit, line_dash="dash", line_color="blue", annotation_text=f"Min Limit ({min_temp_limit}°C)")
             fig_line.update_layout(yaxis_title="Sıcaklık (°C)", xaxis_title="Tarih / Saat")
-            st.plotly_chart(fig_line, use_container_width=True)
-
-            col_a, col_b = st.columns(2)
-            with col_a:
-                st.markdown("#### 📂 Tüm Sıcaklık Verileri (Liste)")
-                df_display = df_clean[['Timestamp', 'Temp']].copy()
-                df_display['Timestamp'] = df_display['Timestamp'].dt.strftime('%d.%m.%Y %H:%M:%S')
-                df_display.rename(columns={'Timestamp': 'Zaman', 'Temp': 'Sıcaklık (°C)'}, inplace=True)
-                st.dataframe(df_display, use_container_width=True, height=300)
-            
-            with col_b:
-                st.markdown("#### 🖨️ Tam Rapor (Tüm Veriler)")
-                st.info("Bu buton ile ihlal olsun veya olmasın okunan bütün sıcaklık verilerinin tam dökümünü formatlı PDF olarak indirebilirsiniz.")
-                pdf_full_data = create_pdf_bytes(df_display, metadata, "Tum Sicaklik Raporu (Tam Liste)")
-                st.download_button("📄 Tüm Verilerin PDF Raporunu İndir", pdf_full_data, "tum_sicaklik_verileri.pdf", "application/pdf")
+            with stage("grafik çizimi (plotly)", len(df_plot)):
+                st.plotly_chart(fig_line, use_container_width=True)
+
+            st.markdown("#### 📂 Tüm Sıcaklık Verileri (Liste)")
+            # Veri sunucuda kalır; tarayıcıya yalnızca seçili sayfa gönderilir
+            with stage("veri görüntüleyici", len(series)):
+                temp_order, temp_rank = viewer_order_stage(file_hash, series)
+                col_v1, col_v2, col_v3 = st.columns([2, 2, 1])
+                view_filter = col_v1.selectbox("Gösterilecek satırlar", ["Tüm okumalar", "Yalnızca limit dışı okumalar", "Yalnızca kesinti öncesi / sonrası okumalar"])
+                view_sort = VIEWER_SORTS.index(col_v2.selectbox("Sıralama", VIEWER_SORTS))
+                page_size = col_v3.selectbox("Sayfa boyutu", [50, 100, 250, 500], index=1)
+                if series.start < series.end:
+                    table_start, table_end = st.slider("Zaman aralığı", min_value=series.start.to_pydatetime(), max_value=series.end.to_pydatetime(),
+                                                       value=(series.start.to_pydatetime(), series.end.to_pydatetime()),
+                                                       step=timedelta(minutes=1), format="DD.MM.YYYY HH:mm")
+                else:
+                    table_start, table_end = series.start, series.end
+                lo, hi = series.position(table_start, side='left'), series.position(table_end, side='right')
+
+                subset = None
+                if view_filter == "Yalnızca limit dışı okumalar":
+                    subset = viewer_violation_stage(file_hash, min_temp_limit, max_temp_limit, series)
+                elif view_filter == "Yalnızca kesinti öncesi / sonrası okumalar":
+                    subset = viewer_gap_stage(file_hash, gap_threshold_hours, series)
+                rows = viewer_rows(lo, hi, view_sort, temp_order, temp_rank, subset)
+
+                n_pages = max(1, -(-len(rows) // page_size))
+                # Süzgeç değişince sayfa numarası baştan başlar
+                page_no = st.number_input(f"Sayfa (toplam {n_pages})", min_value=1, max_value=n_pages, value=1,
+                                          key=f"viewer_page_{view_filter}_{view_sort}_{page_size}_{lo}_{hi}")
+                page_rows = rows[(page_no - 1) * page_size:page_no * page_size]
+                st.dataframe(page_table(series, page_rows, min_temp_limit, max_temp_limit), use_container_width=True, height=300, hide_index=True)
+                st.caption(f"Koşula uyan {len(rows)} okumadan {len(page_rows)} tanesi gösteriliyor (sayfa {page_no}/{n_pages}).")
+
+            st.markdown("#### 🖨️ Tam Rapor (Tüm Veriler)")
+            st.info("Bu buton ile ihlal olsun veya olmasın okunan bütün sıcaklık verilerinin tam dökümünü formatlı PDF olarak indirebilirsiniz.")
+            pdf_full_data = with_recorder(pdf_recorder, partial(full_list_report_stage, full_hash, full_series, metadata))
+            st.download_button("📄 Tüm Verilerin PDF Raporunu İndir", pdf_full_data, "tum_sicaklik_verileri.pdf", "application/pdf")
 
         with tab2:
             st.subheader("Otomatik Karar & İhlal Tespiti")
@@ -511,11 +608,11 @@ if uploaded_file is not None:
             st.markdown("#### 🚨 Limit Aşımı (İhlal) Olan Anlar")
             if not df_violations.empty:
                 st.dataframe(df_violations, use_container_width=True)
-                pdf_data_v = create_pdf_bytes(df_violations, metadata, "Sicaklik Ihlal Raporu", summary_stats)
+                pdf_data_v = with_recorder(pdf_recorder, partial(report_stage, file_hash, (*violation_key, resample_seconds), "Sicaklik Ihlal Raporu", summary_stats, "Veri bulunamadi.", df_violations, metadata))
                 st.download_button("📄 Sadece İhlalleri (PDF) İndir", pdf_data_v, "sicaklik_ihlal.pdf", "application/pdf")
             else:
                 st.success("Tebrikler! Bu tarih aralığında veriler normal sınırlar içerisindedir, sıcaklık ihlali tespit edilmemiştir.")
-                pdf_data_v = create_pdf_bytes(pd.DataFrame(), metadata, "Sicaklik Ihlal Raporu", summary_stats, empty_msg="TEBRIKLER: Bu tarih araliginda hicbir sicaklik ihlali (limit asimi) tespit edilmemistir.")
+                pdf_data_v = with_recorder(pdf_recorder, partial(report_stage, file_hash, (*violation_key, resample_seconds), "Sicaklik Ihlal Raporu", summary_stats, "TEBRIKLER: Bu tarih araliginda hicbir sicaklik ihlali (limit asimi) tespit edilmemistir.", pd.DataFrame(), metadata))
                 st.download_button("📄 Boş İhlal Raporunu PDF İndir", pdf_data_v, "sicaklik_ihlal.pdf", "application/pdf")
 
         with tab3:
@@ -526,12 +623,60 @@ if uploaded_file is not None:
                 st.markdown("Cihaz pilinin bitmesi, bağlantı kopukluğu veya verinin 'boş' geçilmesi sebebiyle aşağıdaki zaman aralıklarında veri eksikliği (Kör Nokta) yaşanmıştır.")
                 st.dataframe(df_gaps_report, use_container_width=True)
                 
-                pdf_data_gaps = create_pdf_bytes(df_gaps_report, metadata, "Veri Kesintisi Raporu")
+                pdf_data_gaps = with_recorder(pdf_recorder, partial(report_stage, file_hash, (gap_threshold_hours,), "Veri Kesintisi Raporu", None, "Veri bulunamadi.", df_gaps_report, metadata))
                 st.download_button("📄 Kesinti Raporunu PDF İndir", pdf_data_gaps, "veri_kesintisi_raporu.pdf", "application/pdf")
             else:
                 st.success(f"✅ Sistem, referans alınan başlangıç ve bitiş tarihleri ({ref_start_str} - {ref_end_str}) dahil olmak üzere, belirlenen kriterlerde ({gap_threshold_hours} saati aşan) hiçbir veri kesintisi bulamadı. Sensör aralıksız veri kaydetmiştir.")
 
+        with tab4:
+            st.subheader("Kayan Pencere MKT ve Limit Dışı Süre")
+            st.markdown("Her okuma için, o okumayla biten pencere içindeki **MKT** ve **limit dışında geçen süre** gösterilir. Müdahale zamanı girildiyse yalnızca karar kapsamındaki okumalar kullanılır.")
+            window_label = st.select_slider("Pencere uzunluğu", options=list(ROLLING_WINDOWS), value="24 saat")
+            window_seconds = ROLLING_WINDOWS[window_label]
+            scope = series.until(decision_cutoff)
+            with stage("kayan pencere hesabı", len(scope)):
+                rolling = rolling_stage(file_hash, window_seconds, *violation_key, series)
+
+            if scope.empty:
+                st.info("Karar kapsamında okuma yok.")
+            else:
+                with stage("kayan pencere grafiği", len(scope)):
+                    df_mkt = build_chart_frame(scope.timestamps(), rolling['mkt'], gap_threshold,
+                                               CHART_POINT_BUDGET, min_temp_limit, max_temp_limit)
+                    fig_mkt = px.line(df_mkt, x='Timestamp', y='Temp', title=f'{window_label} Kayan MKT', render_mode='webgl')
+                    fig_mkt.add_hline(y=max_temp_limit, line_dash="dash", line_color="red", annotation_text=f"Max Limit ({max_temp_limit}°C)")
+                    fig_mkt.add_hline(y=min_temp_limit, line_dash="dash", line_color="blue", annotation_text=f"Min Limit ({min_temp_limit}°C)")
+                    fig_mkt.update_layout(yaxis_title="MKT (°C)", xaxis_title="Tarih / Saat")
+
+                    df_out = pd.concat([
+                        build_chart_frame(scope.timestamps(), rolling[key] / 3600, gap_threshold, CHART_POINT_BUDGET).assign(Seri=label)
+                        for key, label in (('above', "Max Üstü"), ('below', "Min Altı"))
+                    ])
+                    fig_out = px.line(df_out, x='Timestamp', y='Temp', color='Seri', title=f'{window_label} Pencerede Limit Dışı Süre',
+                                      render_mode='webgl', color_discrete_map={"Max Üstü": "red", "Min Altı": "blue"})
+                    fig_out.update_layout(yaxis_title="Süre (saat)", xaxis_title="Tarih / Saat")
+                    st.plotly_chart(fig_mkt, use_container_width=True)
+                    st.plotly_chart(fig_out, use_container_width=True)
+
+                # Kaydın başındaki kısa (dolmamış) pencereler en yüksek değer aranırken atlanır
+                full = scope.ts - scope.ts[0] >= window_seconds
+                candidates = np.flatnonzero(full) if full.any() else np.arange(len(scope))
+                worst = candidates[np.argmax(rolling['mkt'][candidates])]
+                col_r1, col_r2, col_r3 = st.columns(3)
+                col_r1.metric(f"En Yüksek {window_label} MKT", f"{rolling['mkt'][worst]:.2f} °C")
+                col_r2.metric("Pencere Bitişi", scope.slice(worst, worst + 1).format_times()[0])
+                col_r3.metric(f"En Uzun {window_label} Max Üstü", format_duration(pd.Timedelta(seconds=int(rolling['above'].max()))))
+                if not full.any():
+                    st.caption("Kayıt süresi seçilen pencereden kısa; tüm değerler kaydın başından itibaren hesaplanmıştır.")
+
     else:
         st.error(f"Dosya okunamadı! Hata Sebebi: **{error_message}**")
 else:
-    st.info("Lütfen CSV veya Excel uzantılı dosyanızı yükleyin.")
+    if not history_mode:
+        st.info("Lütfen CSV veya Excel uzantılı dosyalarınızı yükleyin." if fleet_mode else "Lütfen CSV veya Excel uzantılı dosyanızı yükleyin.")
+
+if profiler is not None:
+    profiler.disable()
+if run_recorder is not None:
+    source_name = uploaded_file.name if uploaded_file is not None else "geçmiş deposu" if history_mode else f"{len(uploaded_files)} dosya"
+    render_diagnostics(diag_box, run_recorder, pdf_recorder, profiler, source_name)
@@ -0,0 +1,143 @@
+# Gece toplu analizi: bir klasördeki tüm dolap dışa aktarımlarını arayüz olmadan işler.
+# Kullanım: python batch.py <klasor> [-o cikti_klasoru] [--max 8 --min 2 --gap-hours 2] [--workers N]
+# Her dosya için ihlal (ve varsa kesinti) PDF'i yazılır; tüm dosyalar tek bir özet tabloda toplanır.
+import argparse
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from core import CabinetState, DiskCache, ReadingStore, analyze_cabinet, analyze_cabinet_incremental, create_pdf_bytes, default_workers, file_content_hash, normalize_str, open_export, series_table, summary_frame, summary_row
+
+EXPORT_SUFFIXES = ('.csv', '.xlsx', '.xls')
+
+def find_exports(input_dir, recursive=False):
+    pattern = '**/*' if recursive else '*'
+    return sorted(p for p in Path(input_dir).glob(pattern) if p.is_file() and p.suffix.lower() in EXPORT_SUFFIXES)
+
+def relative_path(path, input_dir=None):
+    # Alt klasörlerdeki aynı adlı dosyalar ayrışsın diye dosya, girdi klasörüne göre göreli yoluyla anılır
+    return Path(path).relative_to(input_dir) if input_dir else Path(Path(path).name)
+
+def report_name(path, kind, channel=None):
+    # Aynı adlı .csv ve .xlsx dosyalarının raporları çakışmasın diye uzantı da ada eklenir
+    if channel is not None: kind = f"{re.sub(r'[^0-9A-Za-z]+', '_', normalize_str(channel)).strip('_')}_{kind}"
+    return f"{path.stem}_{path.suffix.lstrip('.').lower()}_{kind}.pdf"
+
+def process_export(path, output_dir, settings, full_report=False, cache_dir=None, cache_mb=2048, state_dir=None, store_path=None,
+                   input_dir=None):
+    # Havuzdaki işçide çalışır; ana sürece yalnızca özet satırı döner (veri çerçevesi taşınmaz)
+    rel = relative_path(path, input_dir)
+    try:
+        if state_dir:
+            # Artımlı mod: dosya başına durum; yalnızca son okumadan yeni satırlar işlenir. Durum dosyası girdi
+            # klasörüne göre göreli yolla anılır; alt klasörlerdeki aynı adlı dosyalar birbirinin durumunu sürdürmez
+            state_path = Path(state_dir) / rel.parent / f"{rel.name}.durum"
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            result, state = analyze_cabinet_incremental(open_export(path), CabinetState.load(state_path), **settings)
+            if not result['error'] and state is not None: state.save(state_path)
+        else:
+            cache = DiskCache(cache_dir, cache_mb * 1_000_000) if cache_dir else None
+            file = open_export(path)
+            result = analyze_cabinet(file, **settings, cache=cache)
+    except Exception as e:
+        result = {'error': f"Bilinmeyen Hata: {str(e)}"}
+    row = summary_row(rel.as_posix(), result)
+    if result['error']:
+        return row
+
+    # Depoya yazılamaması biten analizi ve raporları etkilemez; özet satırında ayrıca belirtilir
+    if store_path and not state_dir:
+        try:
+            with closing(ReadingStore(store_path)) as store:
+                store.add(result['series'], result['metadata'], rel.as_posix(), file_content_hash(file.getvalue()))
+        except Exception as e:
+            row["Hata"] = f"Depo Hatası: {str(e)}"
+
+    metadata = result['metadata']
+    empty_msg = "TEBRIKLER: Bu tarih araliginda hicbir sicaklik ihlali (limit asimi) tespit edilmemistir."
+    reports = []
+    # Çok kanallı dosyalarda ihlal ve kesinti raporları kanal başına yazılır
+    for channel, channel_result in result.get('channels', {None: result}).items():
+        reports.append((report_name(path, "ihlal", channel), "Sicaklik Ihlal Raporu", channel_result['df_violations'],
+                        channel_result['summary_stats'], empty_msg))
+        if not channel_result['df_gaps_report'].empty:
+            reports.append((report_name(path, "kesinti", channel), "Veri Kesintisi Raporu", channel_result['df_gaps_report'],
+                            None, "Veri bulunamadi."))
+    if full_report:
+        reports.append((report_name(path, "tum_veriler"), "Tum Sicaklik Raporu (Tam Liste)", series_table(result['series']),
+                        None, "Veri bulunamadi."))
+
+    # Raporlar girdi klasörünün alt klasör düzeniyle yazılır
+    report_dir = Path(output_dir) / rel.parent
+    report_dir.mkdir(parents=True, exist_ok=True)
+    for name, title, df_report, violation_summary, msg in reports:
+        pdf_bytes = create_pdf_bytes(df_report, metadata, title, violation_summary, msg)
+        (report_dir / name).write_bytes(pdf_bytes)
+    return row
+
+def run_batch(paths, output_dir, settings, workers=None, full_report=False, cache_dir=None, cache_mb=2048, state_dir=None, store_path=None,
+              input_dir=None):
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    if state_dir: Path(state_dir).mkdir(parents=True, exist_ok=True)
+    job = partial(process_export, output_dir=output_dir, settings=settings, full_report=full_report,
+                  cache_dir=cache_dir, cache_mb=cache_mb, state_dir=state_dir, store_path=store_path,
+                  input_dir=input_dir)
+    # Dosya boyutları farklı olduğundan her işçiye tek tek dosya verilir (chunksize=1)
+    with ProcessPoolExecutor(max_workers=workers or default_workers()) as pool:
+        rows = list(pool.map(job, paths, chunksize=1))
+    return summary_frame(rows)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dolap sıcaklık dışa aktarımlarını toplu analiz eder.")
+    parser.add_argument("input_dir", help="CSV/XLSX/XLS dosyalarının bulunduğu klasör")
+    parser.add_argument("-o", "--output-dir", help="PDF ve özet tablonun yazılacağı klasör (varsayılan: <klasor>/rapor)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Alt klasörleri de tara")
+    parser.add_argument("--gap-hours", type=int, default=2, help="Kesinti limiti (saat)")
+    parser.add_argument("--min", dest="min_temp_limit", type=float, default=2.0, help="Min sıcaklık (°C)")
+    parser.add_argument("--max", dest="max_temp_limit", type=float, default=8.0, help="Max sıcaklık (°C)")
+    parser.add_argument("--time-weighted", action="store_true", help="İhlal süresini sonraki okumaya kadar say")
+    parser.add_argument("--full", action="store_true", help="Tüm verilerin PDF raporunu da yaz")
+    parser.add_argument("--cache-dir", help="Ayrıştırılmış verilerin saklanacağı disk önbelleği klasörü (varsayılan: kapalı)")
+    parser.add_argument("--cache-mb", type=int, default=2048, help="Disk önbelleği bütçesi (MB)")
+    parser.add_argument("--state-dir", help="Artımlı mod: birikimli dosyalar için dolap başına analiz durumu klasörü")
+    parser.add_argument("--store", help="Okumaların eklendiği geçmiş ölçüm deposu (SQLite dosyası)")
+    parser.add_argument("--workers", type=int, default=None, help="İşçi süreç sayısı (varsayılan: tüm çekirdekler)")
+    args = parser.parse_args(argv)
+    if args.state_dir and args.full:
+        parser.error("--full tüm okumaları gerektirir; --state-dir ile birlikte kullanılamaz")
+    if args.state_dir and args.store:
+        parser.error("--store tüm okumaları gerektirir; --state-dir ile birlikte kullanılamaz")
+
+    paths = find_exports(args.input_dir, args.recursive)
+    if not paths:
+        print(f"{args.input_dir} içinde CSV/XLSX/XLS dosyası bulunamadı.", file=sys.stderr)
+        return 1
+    output_dir = Path(args.output_dir) if args.output_dir else Path(args.input_dir) / "rapor"
+    settings = {
+        'gap_threshold_hours': args.gap_hours,
+        'min_temp_limit': args.min_temp_limit,
+        'max_temp_limit': args.max_temp_limit,
+        'time_weighted': args.time_weighted,
+    }
+
+    t0 = time.perf_counter()
+    summary = run_batch(paths, output_dir, settings, args.workers, args.full, args.cache_dir, args.cache_mb, args.state_dir, args.store,
+                        args.input_dir)
+    elapsed = time.perf_counter() - t0
+
+    summary.to_csv(output_dir / "ozet.csv", sep=';', index=False, encoding='utf-8-sig')
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200):
+        print(summary.drop(columns=["Karar"]).astype(object).fillna("-").to_string(index=False))
+    failed = int((summary["Hata"] != "").sum())
+    print(f"\n{len(paths)} dosya ({failed} hatalı) {elapsed:.1f} s içinde işlendi: "
+          f"{len(paths) / elapsed:.2f} dosya/s, {args.workers or default_workers()} işçi. Özet: {output_dir / 'ozet.csv'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
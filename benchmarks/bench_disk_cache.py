@@ -0,0 +1,24 @@
+# Disk önbelleği ölçümü: ilk yükleme (ayrıştırma + yazma) ile mmap'li yeniden yükleme karşılaştırması
+# Kullanım: python benchmarks/bench_disk_cache.py [satir_sayisi]
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from core import DiskCache, file_content_hash, load_export_cached
+from generate_exports import generate_export
+from timing import timed
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    data = generate_export(n)[0]
+    with tempfile.TemporaryDirectory() as root:
+        cache = DiskCache(os.path.join(root, "olcum"), 10**12)
+        file_hash = file_content_hash(data)
+        _, t_cold = timed(load_export_cached, "dolap.csv", data, cache, file_hash)
+        (series, _, _), t_warm = timed(load_export_cached, "dolap.csv", data, cache, file_hash)
+        _, t_touch = timed(lambda: float(series.temps.max()))
+        size_mb = sum(size for _, size, _ in cache.entries()) / 1e6
+    print(f"{n} satır ({len(data) / 1e6:.1f} MB CSV, önbellekte {size_mb:.1f} MB) | "
+          f"ayrıştırma + yazma: {t_cold:.3f} s | mmap yükleme: {t_warm * 1000:.2f} ms | ilk tam okuma: {t_touch * 1000:.2f} ms")
@@ -0,0 +1,62 @@
+# İhlal motoru karşılaştırması: NumPy seri motoru vs eski Status/Group + groupby döngüsü
+# Kullanım: python benchmarks/bench_excursions.py [satir_sayisi]
+import os
+import sys
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from core import find_excursion_runs, summarize_excursions, excursion_table, format_duration
+from timing import timed
+
+MIN_LIMIT, MAX_LIMIT = 2.0, 8.0
+
+def build_series(n, seed=0):
+    # 8 °C sınırı etrafında salınan gürültülü sensör: çok sayıda kısa seri oluşur
+    rng = np.random.default_rng(seed)
+    ts = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.cumsum(rng.integers(60, 600, n)), unit='s')
+    temps = np.round(7.5 + np.cumsum(rng.normal(0, 0.2, n)) * 0.05 + rng.normal(0, 0.8, n), 1)
+    temps[rng.choice(n, size=n // 50, replace=False)] -= 7.0
+    return pd.DataFrame({'Timestamp': ts, 'Temp': temps})
+
+def legacy_violations(df, min_limit, max_limit):
+    # Önceki violation_stage gövdesi (referans)
+    df = df.copy()
+    df['Status'] = 0
+    df.loc[df['Temp'] < min_limit, 'Status'] = -1
+    df.loc[df['Temp'] > max_limit, 'Status'] = 1
+    df['Group'] = (df['Status'] != df['Status'].shift()).cumsum()
+
+    events = []
+    total_max, total_min = timedelta(0), timedelta(0)
+    g_max, g_min = None, None
+    for _, group in df[df['Status'] != 0].groupby('Group'):
+        status = group['Status'].iloc[0]
+        s_t, e_t = group['Timestamp'].min(), group['Timestamp'].max()
+        dur = e_t - s_t
+        extreme = group['Temp'].min() if status == -1 else group['Temp'].max()
+        if status == 1:
+            total_max += dur
+            if g_max is None or extreme > g_max: g_max = extreme
+        else:
+            total_min += dur
+            if g_min is None or extreme < g_min: g_min = extreme
+        events.append({"Tur": "Min Alti" if status == -1 else "Max Ustu",
+                       "Baslangic": s_t.strftime('%d.%m.%Y %H:%M:%S'), "Bitis": e_t.strftime('%d.%m.%Y %H:%M:%S'),
+                       "Sure": format_duration(dur), "En Uc Deger": extreme})
+    return pd.DataFrame(events), total_max, total_min, g_max, g_min
+
+def vectorized_violations(df, min_limit, max_limit, time_weighted=False):
+    runs = find_excursion_runs(df['Timestamp'], df['Temp'], min_limit, max_limit, time_weighted)
+    return (excursion_table(runs), *summarize_excursions(runs))
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = build_series(n)
+    n_runs = len(find_excursion_runs(df['Timestamp'], df['Temp'], MIN_LIMIT, MAX_LIMIT)['status'])
+    _, t_old = timed(legacy_violations, df, MIN_LIMIT, MAX_LIMIT)
+    _, t_new = timed(vectorized_violations, df, MIN_LIMIT, MAX_LIMIT)
+    print(f"{n} satır, {n_runs} ihlal serisi | groupby: {t_old:.3f} s | NumPy: {t_new:.3f} s | hızlanma: {t_old / t_new:.1f}x")
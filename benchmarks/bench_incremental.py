@@ -0,0 +1,41 @@
+# Artımlı mod ölçümü: günlük büyüyen birikimli dışa aktarımın son sürümü, önceki günün durumu üzerine
+# işlenir ve tüm dosyanın baştan analiziyle karşılaştırılır (doğrulama: tests/test_incremental.py)
+# Kullanım: python benchmarks/bench_incremental.py [satir_sayisi] [gun_sayisi]
+import io
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from core import analyze_cabinet, analyze_cabinet_incremental
+from generate_exports import generate_export
+from timing import timed
+
+def cumulative_exports(data, cuts):
+    # Aynı dosyanın büyüyen sürümleri: meta veri + başlık ve ilk k okuma satırı
+    text = data.decode('utf-8-sig')
+    lines = text.split("\n")
+    header = next(i for i, line in enumerate(lines) if line.startswith("Sıra No"))
+    body = [line for line in lines[header + 1:] if line]
+    for k in cuts:
+        buf = io.BytesIO("\n".join(lines[:header + 1] + body[:k] + [""]).encode('utf-8-sig'))
+        buf.name = "dolap.csv"
+        yield buf
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    data, _, _ = generate_export(n, n_excursions=200, n_gaps=10)
+    cuts = np.linspace(n // days, n, days).astype(int).tolist()
+
+    *_, last = cumulative_exports(data, cuts)
+    *_, prev = cumulative_exports(data, cuts[:-1])
+    _, state = analyze_cabinet_incremental(prev)
+    _, t_full = timed(analyze_cabinet, last)
+    last.seek(0)
+    _, t_inc = timed(analyze_cabinet_incremental, last, state)
+    print(f"{n} satır, {days} gün | tam analiz: {t_full:.3f} s | artımlı (son gün, {n - cuts[-2]} yeni satır): {t_inc:.3f} s "
+          f"| hızlanma: {t_full / t_inc:.1f}x")
@@ -0,0 +1,39 @@
+# Sıcaklık sütunu dönüştürücü karşılaştırması: parse_temp_column vs satır satır parse_temp_robust
+# Kullanım: python benchmarks/bench_parse_temp.py [satir_sayisi]
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from core import parse_temp_column, parse_temp_robust
+from timing import timed
+
+def build_column(n, seed=0):
+    # Gerçek dışa aktarımlardaki biçim karışımı + metin içeren çöp satırlar
+    rng = np.random.default_rng(seed)
+    vals = rng.normal(5, 3, n)
+    kind = rng.integers(0, 5, n)
+    cells = np.empty(n, dtype=object)
+    for i, (v, k) in enumerate(zip(vals, kind)):
+        if k == 0: cells[i] = f"{v:.1f}".replace('.', ',')
+        elif k == 1: cells[i] = f"{v:.2f} °C"
+        elif k == 2: cells[i] = f">{v:.1f}C"
+        elif k == 3: cells[i] = f"{v:.1f} °C"
+        else: cells[i] = f"{v:.3f}"
+    junk = ["Sensör 1", "Alarm", None, np.nan, "inf", "1e5", "--4", "4.", "< 3,2", "Ölçüm yok"]
+    pos = rng.choice(n, size=min(n, len(junk) * 100), replace=False)
+    for j, p in enumerate(pos): cells[p] = junk[j % len(junk)]
+    return pd.Series(cells, dtype=object)
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    text_col = build_column(n)
+    float_col = pd.Series(np.random.default_rng(1).normal(5, 3, n).round(1))
+
+    for name, col in [("metin (object)", text_col), ("metin (str)", text_col.astype('str')), ("sayısal (float64)", float_col)]:
+        _, t_row = timed(col.apply, parse_temp_robust)
+        _, t_col = timed(parse_temp_column, col)
+        print(f"{name:<20} {n} satır | satır satır: {t_row:.3f} s | sütun: {t_col:.3f} s | hızlanma: {t_row / t_col:.1f}x")
@@ -0,0 +1,53 @@
+# PDF rapor üretim hızı (satır/saniye): sayfa sayfa yazan ReportPDF vs hücre hücre cell() döngüsü
+# Kullanım: python benchmarks/bench_pdf_report.py [satir_sayisi ...]
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from core import ReportPDF, create_pdf_bytes, tr_fix
+from timing import timed
+
+class CellByCellPDF(ReportPDF):
+    # Önceki tablo yazımı: her hücre için tr_fix + FPDF.cell
+    def add_table(self, df, empty_msg="Veri bulunamadi."):
+        col_width = 190 / len(df.columns)
+        self.set_font('Arial', 'B', 9)
+        self.set_fill_color(200, 220, 255)
+        for col in df.columns:
+            self.cell(col_width, 8, tr_fix(col), border=1, fill=True, align='C')
+        self.ln()
+        self.set_font('Arial', '', 8)
+        self.set_fill_color(255, 255, 255)
+        for index, row in df.iterrows():
+            for item in row:
+                self.cell(col_width, 7, tr_fix(str(item)), border=1, align='C')
+            self.ln()
+
+def build_table(n, seed=0):
+    stamps = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(n), unit="min")
+    temps = np.random.default_rng(seed).normal(5, 1.5, n).round(1)
+    return pd.DataFrame({'Zaman': stamps.strftime('%d.%m.%Y %H:%M:%S'), 'Sıcaklık (°C)': temps})
+
+METADATA = {'Birim': 'Merkez ASM', 'Depo': 'Aşı Dolabı 1', 'Stok': 'Aşı Deposu',
+            'expected_start': pd.Timestamp("2024-01-01"), 'expected_end': pd.Timestamp("2024-02-01")}
+
+def render(pdf_cls, df):
+    pdf = pdf_cls(METADATA, "Tum Sicaklik Raporu (Tam Liste)")
+    pdf.add_page()
+    pdf.add_table(df)
+    return pdf.output(dest='S').encode('latin-1', 'ignore')
+
+if __name__ == "__main__":
+    sizes = [int(x) for x in sys.argv[1:]] or [10_000, 100_000]
+    for n in sizes:
+        df = build_table(n)
+        data, t_new = timed(create_pdf_bytes, df, METADATA, "Tum Sicaklik Raporu (Tam Liste)")
+        line = f"{n:>8} satır | {len(data) / 1e6:.1f} MB | sayfa sayfa: {n / t_new:,.0f} satır/s"
+        if n <= 20_000:
+            _, t_old = timed(render, CellByCellPDF, df)
+            line += f" | hücre hücre: {n / t_old:,.0f} satır/s"
+        print(line)
@@ -0,0 +1,153 @@
+# Uçtan uca aşama ölçümü: ayrıştırma, MKT, kesinti, ihlal ve PDF süreleri ile tepe bellek kullanımı
+# Kullanım: python benchmarks/bench_pipeline.py [--sizes 10000 100000 1000000 5000000] [--variants ...] [--json sonuc.jsonl]
+# --json verilirse her ölçüm bir satır olarak dosyaya eklenir; sürümler arası karşılaştırma için saklanabilir.
+# Her (tür, boyut) ölçümü yeni bir süreçte çalışır; böylece bellek değerleri önceki ölçümlerden etkilenmez.
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from core import (
+    SensorSeries, analyze_data, build_summary_stats, calculate_mkt, create_pdf_bytes, decide_status, detect_gaps,
+    detect_violations, series_table, widen_temps,
+)
+from generate_exports import CSV_VARIANTS, XLSX_MAX_ROWS, generate_export
+from timing import timed
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 5_000_000]
+
+class PeakMemory:
+    # Aşama süresince süreç bellek kullanımını (RSS) örnekler; pyarrow/numpy ayırmaları da dahildir.
+    # Sonuç aşama başındaki RSS'e göre artıştır; /proc olmayan sistemlerde None döner.
+    STATM = "/proc/self/statm"
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.available = os.path.exists(self.STATM)
+        self.peak_mb = None
+
+    def _rss(self):
+        with open(self.STATM) as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self._peak = max(self._peak, self._rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if self.available:
+            gc.collect()
+            self._base = self._peak = self._rss()
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._poll, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.available:
+            self._stop.set()
+            self._thread.join()
+            self._peak = max(self._peak, self._rss())
+            self.peak_mb = (self._peak - self._base) / 1e6
+        return False
+
+def timed_stage(results, stage, rows, fn, *args):
+    with PeakMemory() as mem:
+        out, elapsed = timed(fn, *args)
+    results.append({'stage': stage, 'rows': rows, 'seconds': elapsed, 'peak_mb': mem.peak_mb})
+    return out
+
+def max_rss_mb():
+    # ru_maxrss Linux'ta KB, macOS'ta bayt cinsindendir
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1e6 if sys.platform == 'darwin' else rss / 1e3
+
+def run_pipeline(path, full_pdf_max):
+    # Arayüzdeki akışın aşamaları, varsayılan ayarlarla (2 saat kesinti, 2-8 °C)
+    results = []
+    with open(path, 'rb') as fh:
+        buf = io.BytesIO(fh.read())
+    buf.name = path
+    df, metadata, error_message = timed_stage(results, 'ayrıştırma (analyze_data)', None, analyze_data, buf)
+    if df is None:
+        raise RuntimeError(f"{path} okunamadı: {error_message}")
+    series = timed_stage(results, 'sıkıştırma (SensorSeries)', len(df), SensorSeries.from_frame, df)
+    del df
+    n = len(series)
+    results[0]['rows'] = n
+
+    timed_stage(results, 'MKT (calculate_mkt)', n, lambda: calculate_mkt(pd.Series(widen_temps(series.temps))))
+    all_gaps, df_gaps_report = timed_stage(results, 'kesinti (detect_gaps)', n, detect_gaps, series, metadata, 2)
+    violation = timed_stage(results, 'ihlal (detect_violations)', n, detect_violations, series, 2.0, 8.0)
+    df_violations, total_max, total_min, g_max, g_min, mkt_value = violation
+    status_term, decision_msg = decide_status(len(all_gaps), total_max, total_min, g_max)
+    summary_stats = build_summary_stats(total_max, total_min, g_max, g_min, mkt_value, status_term, decision_msg)
+    timed_stage(results, 'ihlal PDF', len(df_violations), create_pdf_bytes, df_violations, metadata, "Sicaklik Ihlal Raporu", summary_stats)
+    timed_stage(results, 'kesinti PDF', len(df_gaps_report), create_pdf_bytes, df_gaps_report, metadata, "Veri Kesintisi Raporu")
+    if full_pdf_max is None or n <= full_pdf_max:
+        timed_stage(results, 'tam liste PDF', n, lambda: create_pdf_bytes(series_table(series), metadata, "Tum Sicaklik Raporu (Tam Liste)"))
+    return results, len(all_gaps), max_rss_mb()
+
+def measure(variant, size, full_pdf_max, workdir):
+    data, ext, info = generate_export(size, variant)
+    path = os.path.join(workdir, f"{variant}_{size}{ext}")
+    with open(path, 'wb') as fh:
+        fh.write(data)
+    del data
+    # Üretim sırasında ayrılan bellek ölçüme karışmasın diye hat yeni bir süreçte çalıştırılır
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+        results, gap_count, process_peak = pool.submit(run_pipeline, path, full_pdf_max).result()
+    os.remove(path)
+    # Üretilen dosya doğru okunmalı; aksi halde süreler anlamsızdır
+    assert results[0]['rows'] == info['valid_rows'], (results[0]['rows'], info['valid_rows'])
+    assert gap_count == len(info['gap_positions']), (gap_count, info['gap_positions'])
+    return results, process_peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analiz hattının her aşamasını farklı veri boyutlarında ölçer.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--variants", nargs="+", default=['noktali_virgul_bom'], choices=list(CSV_VARIANTS) + ['xlsx'])
+    parser.add_argument("--full-pdf-max", type=int, default=None, help="Tam liste PDF'i yalnızca bu satır sayısına kadar ölç")
+    parser.add_argument("--json", help="Sonuçların JSON satırı olarak ekleneceği dosya")
+    args = parser.parse_args(argv)
+
+    run_info = {'tarih': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(), 'pandas': pd.__version__}
+    records = []
+    print(f"{'tür':<20} {'satır':>9} {'aşama':<28} {'süre (s)':>9} {'satır/s':>12} {'RSS artışı (MB)':>16}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for variant in args.variants:
+            for size in args.sizes:
+                if variant == 'xlsx' and size > XLSX_MAX_ROWS:
+                    print(f"{variant:<20} {size:>9} Excel sayfa sınırını aşıyor, atlandı")
+                    continue
+                results, process_peak = measure(variant, size, args.full_pdf_max, workdir)
+                for r in results:
+                    rate = f"{r['rows'] / r['seconds']:,.0f}" if r['rows'] and r['seconds'] > 0 else "-"
+                    peak = f"{r['peak_mb']:.1f}" if r['peak_mb'] is not None else "-"
+                    print(f"{variant:<20} {size:>9} {r['stage']:<28} {r['seconds']:>9.3f} {rate:>12} {peak:>16}")
+                    records.append({**run_info, 'variant': variant, 'size': size, 'process_peak_mb': process_peak, **r})
+                total = sum(r['seconds'] for r in results)
+                print(f"{variant:<20} {size:>9} {'TOPLAM':<28} {total:>9.3f} {'':>12} {'süreç tepe RSS: ' + f'{process_peak:.0f}':>16}")
+
+    if args.json:
+        with open(args.json, 'a', encoding='utf-8') as fh:
+            for rec in records:
+                fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+# Yeniden örnekleme ölçümü: ham okumalar vs kovalar üzerinde kesinti / ihlal tespiti ve belgelenen süre sınırı
+# (doğrulama: tests/test_resample.py)
+# Kullanım: python benchmarks/bench_resample.py [gun_sayisi] [okuma_araligi_saniye]
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from core import (
+    RESAMPLE_INTERVALS, SensorSeries, detect_bucket_gaps, detect_bucket_violations, detect_gaps, detect_violations,
+    resample_error_bounds, resample_series,
+)
+from timing import timed
+
+GAP_HOURS, MIN_LIMIT, MAX_LIMIT = 2, 2.0, 8.0
+
+def build_series(days, step, seed=0):
+    # Günlük döngü, gürültü, kapı açılışı benzeri kısa ısınmalar ve birkaç kesinti
+    rng = np.random.default_rng(seed)
+    n = int(days * 86400 // step)
+    ts = pd.Timestamp("2024-01-01").value // 1_000_000_000 + np.arange(n, dtype=np.int64) * step
+    for pos in rng.choice(n, size=4, replace=False):
+        ts[pos:] += int(rng.integers(2, 12)) * 3600
+    temps = 5 + 2 * np.sin(np.arange(n) * step / 86400 * 2 * np.pi) + rng.normal(0, 0.3, n)
+    for s in rng.choice(n, size=max(days // 3, 1), replace=False):
+        temps[s:s + int(rng.integers(10, 400))] += rng.uniform(4, 8)
+    metadata = {'expected_start': pd.Timestamp(int(ts[0]), unit='s'), 'expected_end': pd.Timestamp(int(ts[-1]), unit='s')}
+    return SensorSeries(ts, np.round(temps, 1).astype(np.float32)), metadata
+
+if __name__ == "__main__":
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    step = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    series, metadata = build_series(days, step)
+    (raw_gaps, t_gaps) = timed(detect_gaps, series, metadata, GAP_HOURS)
+    (raw_violations, t_violations) = timed(detect_violations, series, MIN_LIMIT, MAX_LIMIT)
+    print(f"{len(series)} okuma ({days} gün, {step} s aralık) | ham kesinti + ihlal: {t_gaps + t_violations:.3f} s")
+
+    for label, interval in RESAMPLE_INTERVALS.items():
+        buckets, t_resample = timed(resample_series, series, interval)
+        _, t_b_gaps = timed(detect_bucket_gaps, buckets, metadata, GAP_HOURS)
+        (violations, t_b_violations) = timed(detect_bucket_violations, buckets, MIN_LIMIT, MAX_LIMIT)
+        bounds = resample_error_bounds(buckets, MIN_LIMIT, MAX_LIMIT)
+        print(f"  {label:>9}: {len(buckets):>8} kova ({len(series) / len(buckets):5.0f}x) | örnekleme: {t_resample:.3f} s | "
+              f"kesinti + ihlal: {t_b_gaps + t_b_violations:.3f} s | max üstü süre fazlası <= {bounds[0]} "
+              f"(gerçek {violations[1] - raw_violations[1]}) | karışık kova: {bounds[2]}")
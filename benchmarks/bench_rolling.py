@@ -0,0 +1,47 @@
+# Kayan pencere motoru: birikimli toplam yöntemi vs her pencereyi baştan hesaplayan yöntem
+# Kullanım: python benchmarks/bench_rolling.py [satir_sayisi]   (varsayılan: bir yıl dakikalık veri)
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from core import ROLLING_WINDOWS, SensorSeries, calculate_mkt, rolling_analytics, widen_temps
+from timing import timed
+
+MIN_LIMIT, MAX_LIMIT = 2.0, 8.0
+
+def build_series(n, seed=0):
+    # Düzensiz aralıklı (30-90 sn) okumalar, ortada 2 saatlik kesinti
+    rng = np.random.default_rng(seed)
+    ts = np.cumsum(rng.integers(30, 90, n)).astype(np.int64) + 1_704_067_200
+    ts[n // 2:] += 7200
+    temps = np.round(5 + np.cumsum(rng.normal(0, 0.05, n)) % 6 + rng.normal(0, 0.5, n), 1).astype(np.float32)
+    return SensorSeries(ts, temps)
+
+def naive_rolling(series, window_seconds, positions, time_weighted=False):
+    # Referans: her pencere için dilim alınıp MKT ve limit dışı süre baştan hesaplanır
+    ts, temps = series.ts, series.temps
+    flag = temps > np.float32(MAX_LIMIT)
+    counted = flag[:-1] if time_weighted else flag[:-1] & flag[1:]
+    mkt, above = [], []
+    for i in positions:
+        t = ts[i]
+        w = series.slice(np.searchsorted(ts, t - window_seconds, side='right'), i + 1)
+        mkt.append(calculate_mkt(pd.Series(widen_temps(w.temps))))
+        overlap = np.minimum(ts[1:], t) - np.maximum(ts[:-1], t - window_seconds)
+        above.append(int(np.where(counted, np.clip(overlap, 0, None), 0).sum()))
+    return np.array(mkt), np.array(above)
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 525_600
+    series = build_series(n)
+    probe = np.linspace(0, n - 1, 200).astype(int)
+    _, t_probe = timed(naive_rolling, series, 86400, probe)
+    t_naive = t_probe / len(probe) * n
+    for label, window in ROLLING_WINDOWS.items():
+        _, t_window = timed(rolling_analytics, series, window, MIN_LIMIT, MAX_LIMIT)
+        print(f"{n} satır, {label:>8} pencere: {t_window:.3f} s")
+    print(f"baştan hesaplama (tahmini, 24 saat): {t_naive:.0f} s")
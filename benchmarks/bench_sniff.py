@@ -0,0 +1,49 @@
+# CSV başlık/meta veri tespiti: sınırlı önek + tek döngü vs tüm tamponu çözüp satırlara bölen eski yol
+# Kullanım: python benchmarks/bench_sniff.py [satir_sayisi]
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from core import CSV_SNIFF_BYTES, extract_metadata_from_line, sniff_csv_prefix
+from generate_exports import generate_export
+from timing import timed
+
+def legacy_normalize(s):
+    if not isinstance(s, str): return ""
+    return s.replace('ı','i').replace('İ','I').replace('ğ','g').replace('Ğ','G').replace('ş','s').replace('Ş','S').replace('ö','o').replace('Ö','O').replace('ç','c').replace('Ç','C').upper()
+
+def legacy_sniff(data):
+    # Eski yol (referans): tüm tampon çözülür, metin iki kez satırlara bölünür
+    try:
+        text = data.decode('utf-8-sig')
+        encoding = 'utf-8-sig'
+    except UnicodeDecodeError:
+        text = data.decode('ISO-8859-9')
+        encoding = 'ISO-8859-9'
+    metadata = {}
+    for line in text.splitlines()[:50]:
+        extract_metadata_from_line(line, metadata)
+    lines = text.splitlines()
+    header_idx = 0
+    for idx, line in enumerate(lines[:50]):
+        norm_line = legacy_normalize(line)
+        if ("SICAKLIK" in norm_line or "TEMP" in norm_line) and ("ZAMAN" in norm_line or "TARIH" in norm_line):
+            header_idx = idx
+            break
+    sep = ';' if lines[header_idx].count(';') >= lines[header_idx].count(',') else ','
+    return encoding, sep, header_idx, lines[header_idx], metadata
+
+def sniff(data):
+    encoding, sep, data_offset, metadata = sniff_csv_prefix(data[:CSV_SNIFF_BYTES])
+    header_idx = data[:data_offset].count(b'\n')
+    header = data[data_offset:data.index(b'\n', data_offset)].decode(encoding).rstrip('\r')
+    return encoding, sep, header_idx, header, metadata
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    data, _, _ = generate_export(n, 'noktali_virgul_iso')
+    _, t_old = timed(legacy_sniff, data, repeat=2)
+    _, t_new = timed(sniff_csv_prefix, data[:CSV_SNIFF_BYTES], repeat=5)
+    print(f"{n} satır ({len(data) / 1e6:.0f} MB, ISO-8859-9) | tüm tampon: {t_old * 1000:.1f} ms | "
+          f"sınırlı önek: {t_new * 1000:.3f} ms | hızlanma: {t_old / t_new:.0f}x")
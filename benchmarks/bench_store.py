@@ -0,0 +1,50 @@
+# Geçmiş ölçüm deposu: örtüşen aylık dışa aktarımlarla doldurma, tekilleştirme ve aralık sorgusu süresi
+# Kullanım: python benchmarks/bench_store.py [yil_sayisi]
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from core import ReadingStore, SensorSeries, analyze_stored_range
+from timing import timed
+
+def build_history(years, seed=0):
+    # Dakikalık okumalar; arada bir günlük kesinti
+    rng = np.random.default_rng(seed)
+    n = int(years * 365 * 1440)
+    ts = pd.Timestamp("2023-01-01").value // 1_000_000_000 + np.arange(n, dtype=np.int64) * 60
+    ts[n // 3:] += 86400
+    temps = np.round(5 + np.sin(np.arange(n) / 1440 * 2 * np.pi) + rng.normal(0, 0.3, n), 1).astype(np.float32)
+    return SensorSeries(ts, temps)
+
+def monthly_exports(series, overlap_days=5):
+    # Her dışa aktarım bir ay + önceki aydan birkaç gün içerir (gerçek dışa aktarımlardaki gibi)
+    month = 30 * 86400
+    for start in range(int(series.ts[0]), int(series.ts[-1]) + 1, month):
+        lo = np.searchsorted(series.ts, start - overlap_days * 86400)
+        hi = np.searchsorted(series.ts, start + month)
+        yield series.slice(lo, hi)
+
+if __name__ == "__main__":
+    years = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    full = build_history(years)
+    metadata = {'Birim': "Merkez ASM", 'Depo': "Aşı Dolabı 1"}
+    with tempfile.TemporaryDirectory() as workdir:
+        store = ReadingStore(os.path.join(workdir, "olcumler.sqlite"))
+        _, t_fill = timed(lambda: sum(store.add(part, metadata, f"ay{k}.csv", f"h{k}") for k, part in enumerate(monthly_exports(full))))
+
+        cabinet = int(store.cabinets()['id'].iloc[0])
+        start = pd.Timestamp(int(full.ts[-1]), unit='s') - pd.DateOffset(months=18)
+        end = pd.Timestamp(int(full.ts[-1]), unit='s')
+        got, t_query = timed(store.query, cabinet, start, end)
+
+        result, t_analyze = timed(analyze_stored_range, store, cabinet, start, end)
+        size_mb = os.path.getsize(store.path) / 1e6
+        store.close()
+    print(f"{len(full)} okuma ({years:g} yıl, {size_mb:.0f} MB depo) | doldurma: {t_fill:.2f} s | "
+          f"18 ay sorgusu ({len(got)} okuma): {t_query * 1000:.0f} ms | aralık analizi: {t_analyze:.2f} s, "
+          f"{len(result['gaps'])} kesinti, MKT {result['mkt_value']}")
@@ -0,0 +1,144 @@
+# Sentetik sensör kaydı üreticisi: gerçek Türkçe dışa aktarımlara benzer CSV/XLSX dosyaları
+# Kullanım: python benchmarks/generate_exports.py <klasor> [--rows 100000] [--gaps 2] [--excursions 5] [--junk 0.001]
+# Her dosya DÖNEM/BİRİM/DEPO/STOK BİRİMİ meta veri bloğu, başlık satırı ve okuma satırlarından oluşur.
+import argparse
+import io
+import os
+import sys
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+# tür adı -> (ayraç, kodlama): arayüze yüklenen CSV dışa aktarım türleri
+CSV_VARIANTS = {
+    'noktali_virgul_bom': (';', 'utf-8-sig'),
+    'noktali_virgul_iso': (';', 'ISO-8859-9'),
+    'virgul_bom': (',', 'utf-8-sig'),
+    'virgul_iso': (',', 'ISO-8859-9'),
+}
+XLSX_MAX_ROWS = 1_048_576 - 20  # Excel sayfa sınırı, meta veri ve başlık satırları düşülmüş
+
+HEADER = ["Sıra No", "Tarih Saat", "Sıcaklık (°C)", "Sensör No"]
+JUNK_CELLS = [("Alarm", "Alarm"), ("", ""), ("--", "Sensör bağlantısı yok"), ("Pil Zayıf", "-"), ("Toplam", "")]
+
+def build_readings(n_rows, n_gaps=2, n_excursions=5, interval_minutes=5, gap_hours=3, seed=0):
+    # Dönüş: zaman damgaları, sıcaklıklar ve üretilen kesinti / ihlal bilgisi
+    rng = np.random.default_rng(seed)
+    offsets = np.arange(n_rows, dtype=np.int64) * interval_minutes * 60
+    gap_at = np.sort(rng.choice(np.arange(1, max(n_rows, 2)), size=min(n_gaps, max(n_rows - 1, 0)), replace=False))
+    for pos in gap_at:
+        offsets[pos:] += gap_hours * 3600
+    stamps = pd.Timestamp("2024-01-01") + pd.to_timedelta(offsets, unit='s')
+
+    # Günlük döngü + sensör gürültüsü; normal çalışmada 2-8 °C aralığında kalır
+    day_phase = offsets / 86400 * 2 * np.pi
+    temps = 5 + np.sin(day_phase) + rng.normal(0, 0.3, n_rows)
+
+    excursions = []
+    if n_rows > 0:
+        starts = np.sort(rng.choice(n_rows, size=min(n_excursions, n_rows), replace=False))
+        for k, s in enumerate(starts):
+            e = int(min(s + rng.integers(3, 30), n_rows))
+            high = k % 2 == 0
+            temps[s:e] = rng.uniform(9, 16, e - s) if high else rng.uniform(-1, 1.5, e - s)
+            excursions.append(("Max Ustu" if high else "Min Alti", int(s), e))
+    temps = np.round(temps, 1) + 0.0  # -0.0 yazılmasın
+    return stamps, temps, {'gap_positions': gap_at.tolist(), 'excursions': excursions}
+
+def metadata_rows(stamps, birim="Merkez ASM", depo="Aşı Dolabı 1"):
+    period = f"{stamps[0]:%d.%m.%Y %H:%M} - {stamps[-1]:%d.%m.%Y %H:%M}" if len(stamps) else ""
+    return [
+        ["Sıcaklık Takip Raporu"],
+        ["DÖNEM", period],
+        ["BİRİM", birim],
+        ["DEPO", depo],
+        ["STOK BİRİMİ", 1, "Aşı Deposu"],
+        [],
+    ]
+
+def junk_mask(n_total, junk_rate, rng):
+    # Okuma satırlarının arasına serpiştirilen, tarih veya sıcaklığa çevrilemeyen satırlar
+    n_junk = int(round(n_total * junk_rate))
+    mask = np.zeros(n_total + n_junk, dtype=bool)
+    if n_junk:
+        mask[rng.choice(len(mask), size=n_junk, replace=False)] = True
+    return mask
+
+def generate_csv(n_rows, sep=';', encoding='utf-8-sig', n_gaps=2, n_excursions=5, junk_rate=0.001, seed=0, **kwargs):
+    stamps, temps, info = build_readings(n_rows, n_gaps, n_excursions, seed=seed, **kwargs)
+    rng = np.random.default_rng(seed + 1)
+    mask = junk_mask(n_rows, junk_rate, rng)
+
+    date_col = np.empty(len(mask), dtype=object)
+    temp_col = np.empty(len(mask), dtype=object)
+    date_col[~mask] = stamps.strftime('%d.%m.%Y %H:%M:%S').to_numpy(dtype=object)
+    temp_text = pd.Series(temps).astype(str)
+    # Noktalı virgüllü dışa aktarımlarda ondalık ayraç virgüldür
+    temp_col[~mask] = (temp_text.str.replace('.', ',', regex=False) if sep == ';' else temp_text).to_numpy(dtype=object)
+    junk = [JUNK_CELLS[i] for i in rng.integers(0, len(JUNK_CELLS), int(mask.sum()))]
+    date_col[mask] = [d for d, _ in junk]
+    temp_col[mask] = [t for _, t in junk]
+
+    table = pd.DataFrame({HEADER[0]: np.arange(1, len(mask) + 1), HEADER[1]: date_col, HEADER[2]: temp_col, HEADER[3]: "S1"})
+    buf = io.StringIO()
+    for row in metadata_rows(stamps):
+        buf.write(sep.join(str(v) for v in row) + "\n")
+    table.to_csv(buf, sep=sep, index=False, lineterminator="\n")
+    info['valid_rows'] = n_rows
+    return buf.getvalue().encode(encoding), info
+
+def generate_xlsx(n_rows, n_gaps=2, n_excursions=5, junk_rate=0.001, seed=0, **kwargs):
+    if n_rows > XLSX_MAX_ROWS:
+        raise ValueError(f"XLSX en fazla {XLSX_MAX_ROWS} satır alabilir")
+    stamps, temps, info = build_readings(n_rows, n_gaps, n_excursions, seed=seed, **kwargs)
+    rng = np.random.default_rng(seed + 1)
+    mask = junk_mask(n_rows, junk_rate, rng)
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for row in metadata_rows(stamps):
+        ws.append(row or [None])
+    ws.append(HEADER)
+    dates = iter(stamps.strftime('%d.%m.%Y %H:%M:%S'))
+    values = iter(temps.tolist())
+    for i, is_junk in enumerate(mask):
+        if is_junk:
+            d, t = JUNK_CELLS[int(rng.integers(0, len(JUNK_CELLS)))]
+            ws.append([i + 1, d or None, t or None, "S1"])
+        else:
+            ws.append([i + 1, next(dates), next(values), "S1"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    info['valid_rows'] = n_rows
+    return buf.getvalue(), info
+
+def generate_export(n_rows, variant='noktali_virgul_bom', **kwargs):
+    # variant: CSV_VARIANTS anahtarlarından biri veya 'xlsx'
+    if variant == 'xlsx':
+        data, info = generate_xlsx(n_rows, **kwargs)
+        return data, '.xlsx', info
+    sep, encoding = CSV_VARIANTS[variant]
+    data, info = generate_csv(n_rows, sep, encoding, **kwargs)
+    return data, '.csv', info
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentetik dolap sıcaklık dışa aktarımları üretir.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--gaps", type=int, default=2)
+    parser.add_argument("--excursions", type=int, default=5)
+    parser.add_argument("--junk", type=float, default=0.001, help="Okuma başına çöp satır oranı")
+    parser.add_argument("--variants", nargs="+", default=list(CSV_VARIANTS) + ['xlsx'], choices=list(CSV_VARIANTS) + ['xlsx'])
+    parser.add_argument("--copies", type=int, default=1, help="Her tür için farklı tohumla üretilecek dosya sayısı")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for variant in args.variants:
+        for copy in range(args.copies):
+            data, ext, _ = generate_export(args.rows, variant, n_gaps=args.gaps, n_excursions=args.excursions,
+                                           junk_rate=args.junk, seed=copy)
+            path = os.path.join(args.output_dir, f"dolap_{variant}_{copy + 1}{ext}")
+            with open(path, 'wb') as fh:
+                fh.write(data)
+            print(f"{path} ({len(data) / 1e6:.1f} MB)", file=sys.stderr)
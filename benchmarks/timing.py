@@ -0,0 +1,11 @@
+# Ölçüm betiklerinin ortak süre yardımcısı
+import time
+
+def timed(fn, *args, repeat=1, **kwargs):
+    # Dönüş: (son çağrının sonucu, süre saniye); repeat > 1 ise en kısa süre
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
@@ -0,0 +1,1737 @@
+# Aşı/İlaç dolabı sıcaklık analizinin Streamlit'ten bağımsız çekirdeği.
+# Arayüz (app.py) ve toplu komut satırı aracı (batch.py) aynı fonksiyonları kullanır.
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+from fpdf import FPDF
+import io
+import os
+import re
+import hashlib
+import pickle
+import shutil
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import chain, islice
+import openpyxl
+
+# --- Aşama Ölçümü (Tanılama) ---
+# Kayıt açıkken her aşamanın süresi, işlenen satır sayısı ve bellek (RSS) farkı toplanır.
+# Kayıt kapalıyken stage() yalnızca etkin kaydediciyi okuyup boş bir nesne döndürür.
+_active_recorder = ContextVar('dolap_stage_recorder', default=None)
+
+def current_rss():
+    # Linux dışında (örn. /proc olmayan sistemlerde) bellek farkı ölçülmez
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class StageRecorder:
+    def __init__(self):
+        self.stages = {}
+        self.depth = 0
+
+    def enter(self, name):
+        # Aşamalar başlama sırasıyla listelenir; iç içe aşamalar 'depth' ile girintilenir.
+        # Aynı ad birden çok kez ölçülürse (örn. her CSV parçası) değerler toplanır.
+        entry = self.stages.setdefault(name, {'stage': name, 'depth': self.depth, 'seconds': 0.0, 'rows': None, 'mem_delta_mb': None, 'calls': 0})
+        self.depth += 1
+        return entry
+
+    def exit(self, entry, seconds, rows=None, mem_delta=None):
+        self.depth -= 1
+        entry['seconds'] += seconds
+        entry['calls'] += 1
+        if rows is not None:
+            entry['rows'] = (entry['rows'] or 0) + int(rows)
+        if mem_delta is not None:
+            entry['mem_delta_mb'] = (entry['mem_delta_mb'] or 0.0) + mem_delta / 1e6
+
+    def records(self):
+        return list(self.stages.values())
+
+class _StageHandle:
+    __slots__ = ('rows',)
+
+    def __init__(self, rows=None):
+        self.rows = rows
+
+_NULL_STAGE = _StageHandle()
+
+def set_recorder(recorder):
+    # recorder=None ölçümü kapatır; Streamlit her çalıştırmada yeniden ayarlar
+    _active_recorder.set(recorder)
+
+@contextmanager
+def recording(recorder):
+    token = _active_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _active_recorder.reset(token)
+
+@contextmanager
+def stage(name, rows=None):
+    # Kullanım: with stage("tarih ayrıştırma", len(col)) as s: ...; satır sayısı sonradan s.rows ile verilebilir
+    recorder = _active_recorder.get()
+    if recorder is None:
+        yield _NULL_STAGE
+        return
+    handle = _StageHandle(rows)
+    entry = recorder.enter(name)
+    mem_before = current_rss()
+    t0 = time.perf_counter()
+    try:
+        yield handle
+    finally:
+        elapsed = time.perf_counter() - t0
+        mem_after = current_rss()
+        mem_delta = mem_after - mem_before if mem_before is not None and mem_after is not None else None
+        recorder.exit(entry, elapsed, handle.rows, mem_delta)
+
+def timed_iter(name, iterable):
+    # Parça parça okunan kaynaklarda yalnızca okuma süresini ölçer (döngü gövdesi hariç)
+    if _active_recorder.get() is None:
+        yield from iterable
+        return
+    it = iter(iterable)
+    while True:
+        with stage(name) as s:
+            item = next(it, None)
+            s.rows = len(item) if item is not None and hasattr(item, '__len__') else None
+        if item is None:
+            return
+        yield item
+
+# --- Yardımcı Fonksiyonlar ---
+TR_TRANSLATION = str.maketrans({'Ğ': 'G', 'ğ': 'g', 'Ü': 'U', 'ü': 'u', 'Ş': 'S', 'ş': 's', 'İ': 'I', 'ı': 'i', 'Ö': 'O', 'ö': 'o', 'Ç': 'C', 'ç': 'c'})
+
+def tr_fix(text):
+    if not isinstance(text, str): return str(text)
+    return text.translate(TR_TRANSLATION)
+
+# Türkçe harfler tek geçişte ASCII karşılıklarına çevrilir (zincirleme replace yerine)
+_TR_ASCII = str.maketrans('ıİğĞşŞöÖçÇ', 'iIgGsSoOcC')
+
+def normalize_str(s):
+    if not isinstance(s, str): return ""
+    return s.translate(_TR_ASCII).upper()
+
+def format_duration(td):
+    return str(td).split('.')[0]
+
+# MKT yalnızca okuma sayısına ve exp(-ΔH/RT) terimlerinin toplamına bağlıdır. Toplam, her terim
+# 2**-1126'nın tam katı olduğundan yuvarlamasız bir tam sayı olarak tutulur; böylece parça parça
+# (artımlı) toplanan değer, tüm veri üzerinden tek seferde toplanan değerle bire bir aynı olur.
+MKT_DH_R = 10000
+MKT_SUM_SCALE = 1126  # float64: 53 bit mantis, en küçük üs -1074
+
+def mkt_accumulate(temps_celsius):
+    # Dönüş: (okuma sayısı, terim toplamı * 2**MKT_SUM_SCALE); iki sonuç alan alana toplanabilir
+    temps = pd.to_numeric(pd.Series(temps_celsius), errors='coerce').dropna().to_numpy(dtype=np.float64)
+    return mkt_accumulate_groups(temps, np.zeros(len(temps), dtype=np.intp), 1)[0]
+
+def mkt_accumulate_groups(temps, groups, n_groups):
+    # Aynı toplam her grup (kanal) için tek geçişte; temps NaN içermemeli
+    exp_terms = np.exp(-MKT_DH_R / (np.asarray(temps, dtype=np.float64) + 273.15))
+    mant, exp = np.frexp(exp_terms)
+    mant = np.ldexp(mant, 53).astype(np.int64)
+    shift = exp.astype(np.int64) + (MKT_SUM_SCALE - 53)
+    counts = np.bincount(groups, minlength=n_groups)
+    totals = [0] * n_groups
+    if len(shift):
+        # Mantisler 27 + 26 bitlik iki parçaya bölünür; 2**26 okumaya kadar float64 bincount toplamı kesindir
+        base = int(shift.min())
+        width = int(shift.max()) - base + 1
+        pos = groups * width + (shift - base)
+        high = np.bincount(pos, weights=mant >> 26, minlength=n_groups * width)
+        low = np.bincount(pos, weights=mant & 0x3FFFFFF, minlength=n_groups * width)
+        for p in np.flatnonzero(high + low):
+            group, k = divmod(int(p), width)
+            totals[group] += ((int(high[p]) << 26) + int(low[p])) << (k + base)
+    return [(int(c), t) for c, t in zip(counts, totals)]
+
+def mkt_from_sum(count, total):
+    if count == 0: return None
+    avg_exp = total / (count << MKT_SUM_SCALE)  # tam sayı bölmesi, doğru yuvarlanır
+    if avg_exp == 0: return None
+    return (MKT_DH_R / (-np.log(avg_exp))) - 273.15
+
+def calculate_mkt(temps_celsius):
+    return mkt_from_sum(*mkt_accumulate(temps_celsius))
+
+# --- Özel Veri Dönüştürücüler ---
+def parse_date_robust(date_str):
+    if pd.isna(date_str): return pd.NaT
+    s = str(date_str).strip()
+    m = re.search(r'(\d{1,2})[./-](\d{1,2})[./-](\d{4})\s+(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?', s)
+    if m:
+        d, mon, y, h, min, sec = m.groups()
+        sec = int(sec) if sec else 0
+        try:
+            return pd.Timestamp(year=int(y), month=int(mon), day=int(d), hour=int(h), minute=int(min), second=sec)
+        except:
+            return pd.NaT
+    try:
+        return pd.to_datetime(s, dayfirst=True)
+    except:
+        return pd.NaT
+
+DATE_FORMAT_PATTERN = re.compile(r'^\d{1,2}([./-])\d{1,2}([./-])\d{4} \d{1,2}:\d{1,2}(:\d{1,2})?$')
+
+def infer_date_format(values, sample_size=200):
+    # Örnek satırlardan baskın gg.aa.yyyy SS:DD[:ss] biçimini bulur; (regex, ISO biçimi) döner
+    counts = {}
+    for v in values[:sample_size]:
+        m = DATE_FORMAT_PATTERN.match(v)
+        if m:
+            key = (m.group(1), m.group(2), m.group(3) is not None)
+            counts[key] = counts.get(key, 0) + 1
+    if not counts: return None
+    sep1, sep2, has_sec = max(counts, key=counts.get)
+    pattern = rf'^(\d{{1,2}}){re.escape(sep1)}(\d{{1,2}}){re.escape(sep2)}(\d{{4}}) (\d{{1,2}}):([0-5]?\d)'
+    if has_sec: return pattern + r'(:[0-5]?\d)$', '%Y-%m-%d %H:%M:%S'
+    return pattern + '$', '%Y-%m-%d %H:%M'
+
+def parse_dates_vectorized(series):
+    # Tarih sütununu tek geçişte çevirir; çevrilemeyen satırlar parse_date_robust ile işlenir.
+    # Sonuç serisi ile hangi yoldan kaç satırın çevrildiğini gösteren istatistik döner.
+    stats = {'vectorized': 0, 'fallback': 0, 'failed': 0}
+    if pd.api.types.is_datetime64_any_dtype(series):
+        # Excel'in zaten tarih olarak verdiği sütun olduğu gibi kullanılır. Eski satır satır yol bu değerleri
+        # metne çevirip dayfirst=True ile yeniden ayrıştırıyor, günü 12 veya altı olan tarihlerde gün ile ayı
+        # yer değiştiriyordu ('2024-01-05 10:00:00' -> 1 Mayıs); bu yol doğru tarihi verir
+        result = series.dt.tz_localize(None) if series.dt.tz is not None else series
+        stats['vectorized'] = int(result.notna().sum())
+        stats['failed'] = int(result.isna().sum())
+        return result.astype('datetime64[ns]'), stats
+
+    values = series.to_numpy(dtype=object)
+    result = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[ns]')
+    pending = series.notna().to_numpy().copy()
+    str_pos = np.flatnonzero([isinstance(v, str) for v in values])
+
+    if len(str_pos):
+        stripped = pd.Series(values[str_pos], dtype='str').str.strip()
+        inferred = infer_date_format(stripped.to_numpy())
+        if inferred:
+            pattern, iso_fmt = inferred
+            # gg.aa.yyyy -> yyyy-aa-gg: pandas'ın hızlı ISO ayrıştırıcısı kullanılır.
+            # Desene uymayan satırlar değişmeden kalır ve yedek yola gider.
+            iso = stripped.str.replace(pattern, r'\3-\2-\1 \4:\5' + (r'\6' if iso_fmt.endswith('%S') else ''), regex=True)
+            matched = (iso != stripped).to_numpy()
+            parsed = pd.to_datetime(iso[matched], format=iso_fmt, errors='coerce').to_numpy(dtype='datetime64[ns]')
+            ok = ~np.isnat(parsed)
+            ok_pos = str_pos[matched][ok]
+            result[ok_pos] = parsed[ok]
+            pending[ok_pos] = False
+            stats['vectorized'] = int(ok.sum())
+
+    # Metin satırı (örn. 'Alarm') içeren Excel sütununda tarih hücreleri datetime nesnesi olarak gelir; bunlar da
+    # datetime64 sütunu gibi doğrudan çevrilir. parse_date_robust'a gitselerdi metne çevrilip dayfirst=True ile
+    # yeniden ayrıştırılır, gün ile ay yer değiştirirdi
+    dt_pos = np.flatnonzero(pending & np.array([isinstance(v, (datetime, np.datetime64)) for v in values], dtype=bool))
+    if len(dt_pos):
+        parsed = pd.to_datetime(pd.Series(values[dt_pos], dtype=object), errors='coerce')
+        if parsed.dt.tz is not None: parsed = parsed.dt.tz_localize(None)
+        result[dt_pos] = parsed.to_numpy(dtype='datetime64[ns]')
+        pending[dt_pos] = False
+        stats['vectorized'] += len(dt_pos)
+
+    if pending.any():
+        fallback = pd.Series(values[pending]).apply(parse_date_robust)
+        result[pending] = pd.to_datetime(fallback, errors='coerce').to_numpy(dtype='datetime64[ns]')
+        stats['fallback'] = int(pending.sum())
+
+    result = pd.Series(result, index=series.index)
+    stats['failed'] = int(result.isna().sum())
+    return result, stats
+
+TEMP_PATTERN = r'^\s*[<>]?\s*(-?\d+(?:[,.]\d+)?)\s*(?:°?[Cc])?\s*$'
+
+def parse_temp_robust(temp_str):
+    if pd.isna(temp_str): return np.nan
+    s = str(temp_str).strip()
+    # Katı Kural: Sadece gerçek sayısal sıcaklıkları alır. ("Sensör 1", "Alarm" gibi metin içeren satırları atlar)
+    m = re.search(TEMP_PATTERN, s, re.IGNORECASE)
+    if m:
+        val = m.group(1).replace(',', '.')
+        try:
+            return float(val)
+        except:
+            return np.nan
+    return np.nan
+
+def parse_temp_column(series):
+    # parse_temp_robust ile aynı kuralı tüm sütuna tek seferde uygular
+    if pd.api.types.is_bool_dtype(series):
+        return pd.Series(np.nan, index=series.index)
+    if pd.api.types.is_integer_dtype(series):
+        return pd.Series(series.to_numpy(dtype=np.float64, na_value=np.nan), index=series.index)
+    if series.dtype == np.float64:
+        # Hızlı yol: Excel'den gelen sayısal sütun. str(x) ile bilimsel gösterime düşen
+        # veya sonsuz değerler metin kuralına uymadığından parse_temp_robust gibi NaN yapılır.
+        vals = series.to_numpy()
+        abs_vals = np.abs(vals)
+        valid = np.isfinite(vals) & ((vals == 0) | ((abs_vals >= 1e-4) & (abs_vals < 1e16)))
+        return pd.Series(np.where(valid, vals, np.nan), index=series.index)
+
+    present = series.notna().to_numpy()
+    # Excel çıktılarında sık görülen bölünmez boşluk, regex'ten önce normal boşluğa çevrilir
+    text = series.astype('str').str.replace('\xa0', ' ', regex=False).str.strip()
+    valid = text.str.match(TEMP_PATTERN).fillna(False).to_numpy(dtype=bool)
+    result = np.full(len(series), np.nan)
+    if valid.any():
+        # Desene uyan hücrelerde sayı, baştaki "<>" ve sondaki "°C" kırpılınca kalan kısımdır
+        numbers = text[valid].str.lstrip('<> \t\n\r\f\v').str.rstrip('°Cc \t\n\r\f\v').str.replace(',', '.', regex=False)
+        result[valid] = numbers.to_numpy(dtype=np.float64)
+    # Vektörel regex motoru \s ve \d için yalnızca ASCII tanır; eşleşmeyen ASCII dışı
+    # hücreler tek tek parse_temp_robust ile yeniden denenir.
+    retry = present & ~valid
+    if retry.any():
+        retry[retry] = ~text[retry].str.isascii().to_numpy(dtype=bool)
+        result[retry] = series[retry].apply(parse_temp_robust).to_numpy(dtype=np.float64)
+    return pd.Series(result, index=series.index)
+
+# --- PDF Sınıfı ve Oluşturucu ---
+class PdfBuffer:
+    # FPDF belge tamponunu her satırda yeniden kopyalanan str yerine parça listesinde tutar
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+
+    def __iadd__(self, s):
+        self.parts.append(s)
+        self.length += len(s)
+        return self
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        return ''.join(self.parts)
+
+class ReportPDF(FPDF):
+    def __init__(self, metadata, report_title):
+        super().__init__()
+        self.buffer = PdfBuffer()
+        self.metadata = metadata
+        self.report_title = report_title
+        self.set_auto_page_break(auto=True, margin=15)
+
+    def header(self):
+        self.set_font('Arial', 'B', 14)
+        self.cell(0, 10, tr_fix(self.report_title), ln=True, align='C')
+        self.set_font('Arial', '', 9)
+        self.cell(40, 6, tr_fix("Birim:"), border=0)
+        self.cell(0, 6, tr_fix(self.metadata.get('Birim', '-')), ln=True)
+        self.cell(40, 6, tr_fix("Depo:"), border=0)
+        self.cell(0, 6, tr_fix(self.metadata.get('Depo', '-')), ln=True)
+        self.cell(40, 6, tr_fix("Stok Birimi:"), border=0)
+        self.cell(0, 6, tr_fix(self.metadata.get('Stok', '-')), ln=True)
+        
+        if self.metadata.get('expected_start') and self.metadata.get('expected_end'):
+            start_str = self.metadata['expected_start'].strftime('%d.%m.%Y %H:%M')
+            end_str = self.metadata['expected_end'].strftime('%d.%m.%Y %H:%M')
+            self.cell(40, 6, tr_fix("Rapor Donemi:"), border=0)
+            self.cell(0, 6, f"{start_str} - {end_str}", ln=True)
+            
+        self.ln(5)
+
+    def output(self, name='', dest=''):
+        if self.state < 3: self.close()
+        if isinstance(self.buffer, PdfBuffer): self.buffer = str(self.buffer)
+        return super().output(name, dest)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Arial', 'I', 8)
+        self.cell(0, 10, f'Sayfa {self.page_no()}', 0, 0, 'C')
+
+    def add_violation_summary(self, summary_data):
+        self.set_font('Arial', 'B', 11)
+        self.cell(0, 8, tr_fix("IHLAL VE TERMAL STRES OZETI"), ln=True)
+        self.set_font('Arial', '', 10)
+        col_w = 45
+        self.cell(col_w, 7, tr_fix("Kriter"), 1)
+        self.cell(col_w, 7, tr_fix("Toplam Sure"), 1)
+        self.cell(col_w, 7, tr_fix("En Uc Deger"), 1)
+        self.ln()
+        self.cell(col_w, 7, tr_fix("Ust Limit Asimi"), 1)
+        self.cell(col_w, 7, tr_fix(summary_data['max_dur']), 1)
+        self.cell(col_w, 7, tr_fix(summary_data['max_val']), 1)
+        self.ln()
+        self.cell(col_w, 7, tr_fix("Alt Limit Asimi"), 1)
+        self.cell(col_w, 7, tr_fix(summary_data['min_dur']), 1)
+        self.cell(col_w, 7, tr_fix(summary_data['min_val']), 1)
+        self.ln(5)
+        if summary_data.get('mkt_val'):
+            self.cell(0, 6, tr_fix(f"Ortalama Kinetik Sicaklik (MKT): {summary_data['mkt_val']}"), ln=True)
+        self.ln(5)
+        self.set_font('Arial', 'B', 11)
+        self.multi_cell(0, 8, tr_fix(f"KARAR: {summary_data.get('status')} - {summary_data.get('decision', '-')}"), border=1, align='C')
+        self.ln(5)
+
+    def add_table(self, df, empty_msg="Veri bulunamadi."):
+        if df.empty:
+            self.set_font('Arial', 'I', 10)
+            self.cell(0, 10, tr_fix(empty_msg), ln=True, align='C')
+            return
+            
+        col_width = 190 / len(df.columns)
+        self.set_font('Arial', 'B', 9)
+        self.set_fill_color(200, 220, 255) 
+        for col in df.columns:
+            self.cell(col_width, 8, tr_fix(col), border=1, fill=True, align='C')
+        self.ln()
+        self.set_font('Arial', '', 8)
+        self.set_fill_color(255, 255, 255)
+        self.write_table_rows(format_table_columns(df), col_width, 7)
+
+    def write_table_rows(self, columns, col_width, row_h):
+        # Tablo gövdesi hücre hücre cell() yerine sayfa sayfa yazılır. Üretilen PDF komutları
+        # cell(col_width, row_h, txt, border=1, align='C') + ln() ile birebir aynıdır.
+        k = self.k
+        cw = self.current_font['cw']
+        fs = self.font_size
+        xs, x = [], self.l_margin
+        for _ in columns:
+            xs.append(x)
+            x += col_width
+        text_open, text_close = (f"q {self.text_color} ", " Q") if self.color_flag else ("", "")
+        rect_parts = [('%.2f ' % (x * k), ' %.2f %.2f re S' % (col_width * k, -row_h * k)) for x in xs]
+
+        # Ortalanmış metnin x konumu yalnızca metin genişliğine bağlıdır; genişlik başına bir kez hesaplanır
+        cells = []
+        for (x_str, rect_tail), x0, values in zip(rect_parts, xs, columns):
+            text_x = {}
+            col_cells = []
+            for txt in values:
+                if txt == '':
+                    col_cells.append(rect_tail + ' ')
+                    continue
+                w = sum(cw.get(c, 0) for c in txt) * fs / 1000.0
+                tx = text_x.get(w)
+                if tx is None:
+                    tx = text_x[w] = '%.2f' % ((x0 + (col_width - w) / 2.0) * k)
+                col_cells.append(f"{rect_tail} {text_open}BT {tx} ")
+            cells.append((x_str, col_cells, values))
+
+        n_rows = len(columns[0])
+        r = 0
+        while r < n_rows:
+            if self.y + row_h > self.page_break_trigger:
+                self.add_page(self.cur_orientation)
+            out = []
+            y = self.y
+            while r < n_rows and (y + row_h <= self.page_break_trigger or not out):
+                y_rect = '%.2f' % ((self.h - y) * k)
+                y_text = '%.2f' % ((self.h - (y + .5 * row_h + .3 * fs)) * k)
+                for x_str, col_cells, values in cells:
+                    txt = values[r]
+                    if txt == '':
+                        out.append(f"{x_str}{y_rect}{col_cells[r]}\n")
+                    else:
+                        out.append(f"{x_str}{y_rect}{col_cells[r]}{y_text} Td ({self._escape(txt)}) Tj ET{text_close}\n")
+                y += row_h
+                r += 1
+            self.pages[self.page] += ''.join(out)
+            self.y = y
+            self.x = self.l_margin
+        self.lasth = row_h
+
+def format_table_columns(df):
+    # Tüm hücreler sütun bazında metne çevrilir ve tek çeviri tablosuyla Türkçe karakterlerden arındırılır
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        if series.dtype != object:
+            series = series.astype(object)
+        columns.append([str(v).translate(TR_TRANSLATION) for v in series.tolist()])
+    return columns
+
+def create_pdf_bytes(df, metadata, title, violation_summary=None, empty_msg="Veri bulunamadi."):
+    with stage(f"PDF: {title}", len(df)):
+        pdf = ReportPDF(metadata, title)
+        pdf.add_page()
+        if violation_summary: pdf.add_violation_summary(violation_summary)
+        pdf.add_table(df, empty_msg)
+        return pdf.output(dest='S').encode('latin-1', 'ignore')
+
+# --- Veri Ayrıştırma Modülü ---
+def extract_metadata_from_line(line, meta):
+    # CSV meta veri satırı (ör. "DÖNEM;01.01.2024 - 31.01.2024"); bulunan alanlar meta'ya yazılır
+    try:
+        parts = [p.strip().replace('"', '') for p in line.replace(';', ',').split(',')]
+        for i in range(len(parts)-1):
+            key = normalize_str(parts[i])
+            val = parts[i+1]
+
+            if "DONEM" in key and "-" in val:
+                d_parts = val.split("-")
+                meta['Baslangic'] = d_parts[0].strip()
+                meta['Bitis'] = d_parts[1].strip()
+
+            if not val:
+                for j in range(i+1, len(parts)):
+                    if parts[j]:
+                        val = parts[j]
+                        break
+            if not val: continue
+
+            if "STOK BIRIMI" in key:
+                for j in range(i+1, len(parts)):
+                    if parts[j] and not re.match(r'^\d+(\.\d+)?$', parts[j]):
+                        meta['Stok'] = parts[j]
+                        break
+
+            if "BIRIM" == key and "STOK" not in key: meta['Birim'] = val
+            elif "DEPO" == key: meta['Depo'] = val
+    except:
+        pass
+
+def is_temp_column(col):
+    norm_col = normalize_str(col)
+    return (any(k in norm_col for k in ["SICAK", "TEMP", "ISI"])
+            and not any(k in norm_col for k in ["CIHAZ", "SENSOR", "LIMIT", "DURUM", "NO", "ID"]))
+
+def detect_temp_columns(columns, time_col):
+    # Çift problu / çok raflı dolaplarda her sıcaklık sütunu ayrı bir kanaldır
+    return [col for col in columns if is_temp_column(col) and col != time_col]
+
+def detect_columns(columns):
+    time_col = None
+    temp_col = None
+
+    for col in columns:
+        norm_col = normalize_str(col)
+        if any(k in norm_col for k in ["ZAMAN", "TARIH", "DATE"]):
+            if "KAYIT" not in norm_col and time_col is None: time_col = col
+        if is_temp_column(col) and temp_col is None: temp_col = col
+                    
+    if not time_col:
+        for col in columns:
+            if "TARIH" in normalize_str(col): 
+                time_col = col
+                break
+    return time_col, temp_col
+
+# --- Akışlı CSV Okuma ---
+# Kodlama, ayraç ve başlık satırı dosyanın yalnızca ilk birkaç KB'ından bulunur; geri kalan
+# kısım C ayrıştırıcısıyla parça parça okunur ve her parçadan sadece zaman/sıcaklık dizileri tutulur.
+CSV_SNIFF_BYTES = 64 * 1024
+CSV_SNIFF_LINES = 50
+CSV_CHUNK_ROWS = 100_000
+
+def sniff_csv_prefix(head):
+    # Dönüş: (kodlama, ayraç, veri başlangıcının bayt konumu, meta veri).
+    # Yalnızca ilk CSV_SNIFF_LINES satır bölünüp çözülür; meta veri ve başlık aynı döngüde bulunur.
+    pieces = head.split(b'\n', CSV_SNIFF_LINES)
+    raw_lines = pieces[:CSV_SNIFF_LINES]
+    if len(pieces) <= CSV_SNIFF_LINES and len(head) == CSV_SNIFF_BYTES and len(raw_lines) > 1:
+        raw_lines = raw_lines[:-1]  # önek son satırın ortasında kesilmiş
+    sniffed = b'\n'.join(raw_lines)
+    try:
+        sniffed.decode('utf-8-sig')
+        encoding = 'utf-8-sig'
+    except UnicodeDecodeError as e:
+        # Önek bir UTF-8 karakterinin ortasında kesilmiş olabilir
+        encoding = 'utf-8-sig' if e.start >= len(sniffed) - 3 else 'ISO-8859-9'
+
+    metadata = {}
+    header_idx, header_line = 0, None
+    for idx, raw in enumerate(raw_lines):
+        line = raw.decode(encoding, errors='ignore').rstrip('\r')
+        norm_line = normalize_str(line)
+        if ("SICAKLIK" in norm_line or "TEMP" in norm_line) and ("ZAMAN" in norm_line or "TARIH" in norm_line):
+            header_idx, header_line = idx, line
+            break
+        extract_metadata_from_line(line, metadata)
+    if header_line is None:
+        header_line = raw_lines[0].decode(encoding, errors='ignore')
+
+    sep = ';' if header_line.count(';') >= header_line.count(',') else ','
+    data_offset = sum(len(line) + 1 for line in raw_lines[:header_idx])
+    return encoding, sep, data_offset, metadata
+
+def parse_channels(frame, positions):
+    # Her sıcaklık sütunu ayrı çevrilir; dönüş (satır, kanal) biçiminde tek bir float64 dizisi
+    if not positions: return np.empty((len(frame), 0))
+    return np.column_stack([parse_temp_column(frame.iloc[:, p]).to_numpy(dtype=np.float64) for p in positions])
+
+def channel_frame(stamps, temps, names):
+    # Tek kanalda eski biçim ('Temp'); birden fazla kanalda her kanal kendi sütun adıyla
+    if temps.shape[1] == 1:
+        return pd.DataFrame({'Timestamp': stamps, 'Temp': temps[:, 0]})
+    return pd.DataFrame({'Timestamp': stamps, **{name: temps[:, j] for j, name in enumerate(names)}})
+
+def read_csv_columns(file, encoding, sep, data_offset, metadata, since=None):
+    file.seek(data_offset)
+    header = pd.read_csv(file, sep=sep, encoding=encoding, nrows=0)
+    columns = [str(c).strip().replace('"', '').replace('\r', '') for c in header.columns]
+    time_col, temp_col = detect_columns(columns)
+    if not time_col or not temp_col:
+        return None, {}, f"Sıcaklık veya Tarih sütunu bulunamadı. Tespit Edilen Sütunlar: {', '.join(columns)}"
+    temp_cols = detect_temp_columns(columns, time_col)
+
+    usecols = sorted({columns.index(time_col), *(columns.index(c) for c in temp_cols)})
+    time_pos = usecols.index(columns.index(time_col))
+    temp_pos = [usecols.index(columns.index(c)) for c in temp_cols]
+
+    file.seek(data_offset)
+    reader = pd.read_csv(file, sep=sep, encoding=encoding, engine='c', on_bad_lines='skip',
+                         usecols=usecols, chunksize=CSV_CHUNK_ROWS)
+    stamps, temps = [], []
+    date_stats = {'vectorized': 0, 'fallback': 0, 'failed': 0}
+    for chunk in timed_iter("CSV okuma (çözümleme)", reader):
+        if chunk.empty: continue
+        if since is not None and chunk_is_older(chunk.iloc[[0, -1], time_pos], since): continue
+        with stage("tarih ayrıştırma", len(chunk)):
+            ts, chunk_stats = parse_dates_vectorized(chunk.iloc[:, time_pos])
+        if since is not None:
+            # Artımlı mod: saklanan son okumadan eski satırların sıcaklığı hiç çevrilmez
+            keep = epoch_seconds(ts) > since
+            ts, chunk = ts[keep], chunk[keep]
+        with stage("sıcaklık ayrıştırma", len(chunk) * len(temp_pos)):
+            tv = parse_channels(chunk, temp_pos)
+        # En az bir kanalı okunabilen satırlar tutulur
+        ok = ts.notna().to_numpy() & ~np.isnan(tv).all(axis=1)
+        stamps.append(ts.to_numpy()[ok])
+        temps.append(tv[ok])
+        for k in date_stats: date_stats[k] += chunk_stats[k]
+
+    if not stamps:
+        if since is None: return None, {}, "Tablo verisi bulunamadı."
+        stamps, temps = [np.empty(0, dtype='datetime64[ns]')], [np.empty((0, len(temp_cols)))]  # yeni okuma yok
+    metadata['date_parse_stats'] = date_stats
+    return channel_frame(np.concatenate(stamps), np.concatenate(temps), temp_cols), metadata, ""
+
+def chunk_is_older(edge_dates, since):
+    # Dışa aktarımlar zaman sıralıdır: ilk ve son satırı since'dan eski olan parçanın tarihleri hiç çevrilmez
+    edge, _ = parse_dates_vectorized(edge_dates)
+    return bool(edge.notna().all() and (epoch_seconds(edge) <= since).all())
+
+def analyze_csv_streaming(file, since=None):
+    file.seek(0)
+    head = file.read(CSV_SNIFF_BYTES)
+    if not head: return None, {}, "Dosya tamamen boş."
+    with stage("kodlama ve başlık tespiti"):
+        encoding, sep, data_offset, metadata = sniff_csv_prefix(head)
+
+    try:
+        try:
+            return read_csv_columns(file, encoding, sep, data_offset, metadata, since)
+        except UnicodeDecodeError:
+            # Önekte görünmeyen UTF-8 dışı bayt: tüm dosya Türkçe kod sayfasıyla yeniden okunur
+            return read_csv_columns(file, 'ISO-8859-9', sep, data_offset, metadata, since)
+    except pd.errors.EmptyDataError:
+        return None, {}, "Tablo verisi bulunamadı."
+    except Exception as e:
+        return None, {}, f"CSV Ayraç Hatası: {str(e)}"
+
+# --- Akışlı Excel Okuma ---
+# Çalışma kitabı openpyxl salt-okunur modunda tek seferde satır satır gezilir: ilk satırlardan
+# meta veri ve başlık bulunur, sonraki satırlardan yalnızca zaman ve sıcaklık hücreleri toplanır.
+EXCEL_META_ROWS = 30
+
+def extract_metadata_from_rows(rows):
+    metadata = {}
+    header_idx = 0
+    for i, row in enumerate(rows[:EXCEL_META_ROWS]):
+        row_vals = [normalize_str(x) for x in row]
+        
+        if "DONEM" in row_vals:
+            idx = row_vals.index("DONEM")
+            if idx + 1 < len(row_vals):
+                val = row[idx+1]
+                if isinstance(val, str) and "-" in val:
+                    d_parts = val.split("-")
+                    metadata['Baslangic'] = d_parts[0].strip()
+                    metadata['Bitis'] = d_parts[1].strip()
+
+        if "BIRIM" in row_vals and not any("STOK" in v for v in row_vals):
+            b_idx = row_vals.index("BIRIM")
+            if b_idx + 1 < len(row_vals):
+                metadata['Birim'] = row[b_idx+1]
+                
+        if "DEPO" in row_vals:
+            d_idx = row_vals.index("DEPO")
+            if d_idx + 1 < len(row_vals):
+                metadata['Depo'] = row[d_idx+1]
+
+        if "STOK BIRIMI" in row_vals:
+            s_idx = row_vals.index("STOK BIRIMI")
+            for k in range(s_idx + 1, min(s_idx + 5, len(row_vals))):
+                val = row[k]
+                if isinstance(val, str) and len(val) > 3 and not re.match(r'^\d+(\.\d+)?$', val):
+                    metadata['Stok'] = val
+                    break
+
+        if any("SICAKLIK" in v for v in row_vals) and any(("ZAMAN" in v or "TARIH" in v) for v in row_vals):
+            header_idx = i
+    return metadata, header_idx
+
+def excel_column_names(header_row):
+    # pd.read_excel ile aynı adlandırma: boş başlık "Unnamed: n", tekrar eden başlık "Ad.1"
+    columns, seen = [], {}
+    for k, val in enumerate(header_row):
+        name = f"Unnamed: {k}" if val is None or (isinstance(val, float) and np.isnan(val)) else str(val)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name.strip().replace('"', '').replace('\r', ''))
+    return columns
+
+def analyze_excel_streaming(file_bytes, since=None):
+    try:
+        wb = openpyxl.load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+    except Exception as e:
+        return None, {}, f"Excel Hatası: {str(e)}"
+
+    try:
+        sheet = wb.worksheets[0]
+        sheet.reset_dimensions()
+        # pd.read_excel gibi tamamen boş satırlar sayılmaz
+        rows = (row for row in sheet.iter_rows(values_only=True) if any(v is not None and v != '' for v in row))
+        with stage("başlık tespiti"):
+            head_rows = [[np.nan if v is None else v for v in row] for row in islice(rows, EXCEL_META_ROWS)]
+            if not head_rows: return None, {}, "Tablo verisi bulunamadı."
+
+            metadata, header_idx = extract_metadata_from_rows(head_rows)
+            columns = excel_column_names(head_rows[header_idx])
+            time_col, temp_col = detect_columns(columns)
+        if not time_col or not temp_col:
+            return None, {}, f"Sıcaklık veya Tarih sütunu bulunamadı. Tespit Edilen Sütunlar: {', '.join(columns)}"
+
+        temp_cols = detect_temp_columns(columns, time_col)
+        time_i, temp_is = columns.index(time_col), [columns.index(c) for c in temp_cols]
+        times, temps = [], [[] for _ in temp_is]
+        with stage("Excel okuma (openpyxl)") as s:
+            for row in chain(head_rows[header_idx + 1:], rows):
+                times.append(row[time_i] if time_i < len(row) else None)
+                for values, temp_i in zip(temps, temp_is):
+                    values.append(row[temp_i] if temp_i < len(row) else None)
+            s.rows = len(times)
+    except Exception as e:
+        return None, {}, f"Excel Hatası: {str(e)}"
+    finally:
+        wb.close()
+
+    if not times: return None, {}, "Tablo verisi bulunamadı."
+    raw = pd.DataFrame({'Timestamp': pd.Series(times), **{k: pd.Series(v) for k, v in enumerate(temps)}})
+    with stage("tarih ayrıştırma", len(raw)):
+        stamps, metadata['date_parse_stats'] = parse_dates_vectorized(raw['Timestamp'])
+    if since is not None:
+        keep = epoch_seconds(stamps) > since
+        raw, stamps = raw[keep], stamps[keep]
+    with stage("sıcaklık ayrıştırma", len(raw) * len(temps)):
+        parsed = parse_channels(raw, list(range(1, len(temps) + 1)))
+    return channel_frame(stamps.to_numpy(), parsed, temp_cols), metadata, ""
+
+def analyze_data(file, since=None):
+    # since (epoch saniye) verilirse yalnızca bu andan sonraki okumalar döner (artımlı mod)
+    filename = file.name.lower()
+    metadata = {}
+    df = None
+    
+    try:
+        if filename.endswith('.xlsx'):
+            df, metadata, error_message = analyze_excel_streaming(file.getvalue(), since)
+            if df is None: return None, {}, error_message
+
+        elif filename.endswith('.xls'):
+            file_bytes = file.getvalue() 
+            try:
+                with stage("Excel okuma (xlrd)") as s:
+                    df_raw = pd.read_excel(io.BytesIO(file_bytes), header=None)
+                    metadata, header_idx = extract_metadata_from_rows(df_raw.head(EXCEL_META_ROWS).values.tolist())
+                    df = pd.read_excel(io.BytesIO(file_bytes), header=header_idx)
+                    s.rows = len(df)
+            except Exception as e:
+                return None, {}, f"Excel Hatası: {str(e)}"
+
+            if df is None or df.empty: return None, {}, "Tablo verisi bulunamadı."
+            
+            df = df.dropna(axis=1, how='all')
+            df.columns = [str(c).strip().replace('"', '').replace('\r', '') for c in df.columns]
+            
+            time_col, temp_col = detect_columns(df.columns)
+            
+            if not time_col or not temp_col: 
+                return None, {}, f"Sıcaklık veya Tarih sütunu bulunamadı. Tespit Edilen Sütunlar: {', '.join(df.columns)}"
+            temp_cols = detect_temp_columns(list(df.columns), time_col)
+
+            with stage("tarih ayrıştırma", len(df)):
+                stamps, metadata['date_parse_stats'] = parse_dates_vectorized(df[time_col])
+            if since is not None:
+                keep = epoch_seconds(stamps) > since
+                df, stamps = df[keep], stamps[keep]
+            with stage("sıcaklık ayrıştırma", len(df) * len(temp_cols)):
+                parsed = parse_channels(df, [list(df.columns).index(c) for c in temp_cols])
+            df = channel_frame(stamps.to_numpy(), parsed, temp_cols)
+        
+        else:
+            df, metadata, error_message = analyze_csv_streaming(file, since)
+            if df is None: return None, {}, error_message
+
+        metadata['expected_start'] = parse_date_robust(metadata.get('Baslangic'))
+        metadata['expected_end'] = parse_date_robust(metadata.get('Bitis'))
+            
+        with stage("temizleme ve sıralama", len(df)):
+            channels = [c for c in df.columns if c != 'Timestamp']
+            df = df.dropna(subset=['Timestamp']).dropna(subset=channels, how='all')
+            if len(channels) > 1:
+                # Hiç sayıya çevrilemeyen sıcaklık benzeri sütunlar (ör. alarm metni) kanal sayılmaz
+                channels = [c for c in channels if df[c].notna().any()] or channels[:1]
+                df = df[['Timestamp'] + channels].dropna(subset=channels, how='all')
+                if len(channels) == 1:
+                    df = df.rename(columns={channels[0]: 'Temp'})
+                else:
+                    metadata['channels'] = channels
+            df = df.sort_values('Timestamp')
+        
+        if len(df) == 0 and since is None:
+            return None, {}, "Sütunlar bulundu ancak veriler sayıya veya tarihe çevrilemedi."
+
+        return df, metadata, ""
+
+    except Exception as e:
+        import traceback
+        return None, {}, f"Bilinmeyen Hata: {str(e)}"
+
+# --- Sıkıştırılmış Seri ---
+# Ayrıştırmadan sonra yalnızca iki dizi tutulur: epoch saniyesi (int64) ve sıcaklık (float32).
+# Okuma başına 12 bayt; müdahale kesimi ve grafik aralığı kopya değil dilim (view) olarak verilir.
+# Metne çevirme yalnızca ekranda gösterilen ya da dışa aktarılan satırlar için yapılır.
+def widen_temps(values):
+    # float32 -> float64: 5.3 gibi değerler 5.300000190734863 yerine 5.3 olarak görünsün
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        return np.round(values.astype(np.float64), 4)
+    return values.astype(np.float64, copy=False)
+
+def epoch_seconds(timestamps):
+    # Zaman damgaları en yakın saniyeye yuvarlanır (Excel hücrelerindeki 09:59:59.999999 gibi değerler)
+    ns = np.asarray(timestamps, dtype='datetime64[ns]').view(np.int64)
+    return (ns + 500_000_000) // 1_000_000_000
+
+class SensorSeries:
+    # Çok kanallı dosyalarda temps (okuma, kanal) biçiminde 2 boyutludur; okunamayan değerler NaN
+    __slots__ = ('ts', 'temps', 'names')
+
+    def __init__(self, ts, temps, names=None):
+        self.ts = ts
+        self.temps = temps
+        self.names = names
+
+    @classmethod
+    def from_frame(cls, df, channels=None):
+        if channels:
+            return cls(epoch_seconds(df['Timestamp']), df[channels].to_numpy(dtype=np.float32), list(channels))
+        return cls(epoch_seconds(df['Timestamp']), df['Temp'].to_numpy(dtype=np.float32))
+
+    @property
+    def n_channels(self):
+        return 1 if self.temps.ndim == 1 else self.temps.shape[1]
+
+    def channel(self, k):
+        # Tek kanallı seri: yalnızca o kanalın okunabilen satırları (analiz aşamaları 1 boyutlu seri bekler)
+        if self.temps.ndim == 1: return self
+        valid = ~np.isnan(self.temps[:, k])
+        return SensorSeries(self.ts[valid], np.ascontiguousarray(self.temps[valid, k]))
+
+    def __len__(self):
+        return len(self.ts)
+
+    @property
+    def empty(self):
+        return len(self.ts) == 0
+
+    def timestamps(self):
+        # Kopyasız datetime64[s] görünümü
+        return self.ts.view('datetime64[s]')
+
+    @property
+    def start(self):
+        return pd.Timestamp(int(self.ts[0]), unit='s')
+
+    @property
+    def end(self):
+        return pd.Timestamp(int(self.ts[-1]), unit='s')
+
+    def slice(self, lo, hi):
+        return SensorSeries(self.ts[lo:hi], self.temps[lo:hi], self.names)
+
+    def take(self, positions):
+        return SensorSeries(self.ts[positions], self.temps[positions], self.names)
+
+    def position(self, when, side='left'):
+        return int(np.searchsorted(self.ts, pd.Timestamp(when).value // 1_000_000_000, side=side))
+
+    def until(self, cutoff):
+        # Zaman sıralı olduğundan 'Timestamp <= cutoff' filtresi bir dilimdir
+        if cutoff is None: return self
+        return self.slice(0, self.position(cutoff, side='right'))
+
+    def format_times(self, fmt='%d.%m.%Y %H:%M:%S'):
+        return pd.DatetimeIndex(self.timestamps()).strftime(fmt)
+
+    def to_frame(self):
+        return pd.DataFrame({'Timestamp': self.timestamps(), 'Temp': widen_temps(self.temps)})
+
+def series_table(series):
+    # Tam liste raporu / tablo için metin sütunları; yalnızca verilen (dilimlenmiş) satırlar çevrilir
+    if series.n_channels == 1:
+        return pd.DataFrame({'Zaman': series.format_times(), 'Sıcaklık (°C)': widen_temps(series.temps)})
+    table = pd.DataFrame(widen_temps(series.temps), columns=series.names).astype(object)
+    table.insert(0, 'Zaman', series.format_times())
+    return table.where(table.notna(), "-")
+
+# --- Grafik Örnekleme ---
+# Uzun kayıtlarda tarayıcıya tüm okumalar yerine en fazla nokta bütçesi kadar nokta gönderilir.
+# Her dilimin ilk/son/min/max noktası, limit aşımı serilerinin başı/sonu ve her kesintinin
+# iki ucu korunur; böylece tepe değerler, ihlaller ve kesinti boşlukları grafikte kaybolmaz.
+def select_chart_points(temps, max_points, min_limit, max_limit, gap_starts):
+    n = len(temps)
+    if n <= max_points: return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+
+    n_buckets = max(1, max_points // 4)
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = temps
+    buckets = padded.reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    keep[np.minimum(offsets + np.argmin(np.where(np.isnan(buckets), np.inf, buckets), axis=1), n - 1)] = True
+    keep[np.minimum(offsets + np.argmax(np.where(np.isnan(buckets), -np.inf, buckets), axis=1), n - 1)] = True
+    keep[offsets[offsets < n]] = True
+    keep[np.minimum(offsets + size - 1, n - 1)] = True
+
+    # Limitler okumaların türüne çevrilir (find_excursion_runs gibi): float32 okuma 8.1 iken float64 8.1 limiti
+    # aşılmış sayılmasın; ihlal motorunun limit dışı saymadığı okuma grafikte limit dışı diye korunmasın
+    if temps.dtype.kind == 'f': min_limit, max_limit = temps.dtype.type(min_limit), temps.dtype.type(max_limit)
+    out = (temps > max_limit) | (temps < min_limit)
+    prev_out = np.r_[False, out[:-1]]
+    next_out = np.r_[out[1:], False]
+    run_edges = out & (~prev_out | ~next_out)
+    # Çok gürültülü sensörlerde seri sayısı bütçeyi aşarsa dilim min/max'ı yeterlidir:
+    # limit aşımı içeren her dilimin uç noktası zaten limit dışındadır.
+    if run_edges.sum() <= max_points:
+        keep |= run_edges
+
+    keep[gap_starts] = True
+    keep[np.minimum(gap_starts + 1, n - 1)] = True
+    return np.flatnonzero(keep)
+
+# --- Sayfalı Veri Görüntüleyici ---
+# Tablo tarayıcıya tek seferde gönderilmez: filtre ve sıralama sonucu yalnızca satır numaraları
+# (pozisyon) olarak tutulur, metne yalnızca gösterilen sayfa çevrilir. Sıcaklık sıralaması ve
+# ihlal / kesinti satırları veri seti başına bir kez hesaplanır.
+VIEWER_SORTS = ["Zaman (eskiden yeniye)", "Zaman (yeniden eskiye)", "Sıcaklık (düşükten yükseğe)", "Sıcaklık (yüksekten düşüğe)"]
+
+def temperature_order(series):
+    # Dönüş: sıcaklığa göre sıralı pozisyonlar ve her pozisyonun bu sıradaki yeri (eşitlikte zaman sırası)
+    order = np.argsort(series.temps, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return order, rank
+
+def violation_positions(series, min_limit, max_limit):
+    lo, hi = series.temps.dtype.type(min_limit), series.temps.dtype.type(max_limit)
+    return np.flatnonzero((series.temps > hi) | (series.temps < lo))
+
+def gap_edge_positions(series, gap_threshold_hours):
+    # Her kesintinin iki ucundaki okumalar
+    idx = np.flatnonzero(np.diff(series.ts) >= int(timedelta(hours=gap_threshold_hours).total_seconds()))
+    return np.union1d(idx, idx + 1)
+
+def viewer_rows(lo, hi, sort, temp_order, temp_rank, subset=None):
+    # [lo, hi) zaman aralığındaki (isteğe bağlı olarak subset ile süzülmüş) pozisyonlar, istenen sırada
+    if subset is not None:
+        rows = subset[np.searchsorted(subset, lo):np.searchsorted(subset, hi)]
+        if sort >= 2: rows = rows[np.argsort(temp_rank[rows], kind='stable')]
+    elif sort >= 2:
+        rows = temp_order[(temp_order >= lo) & (temp_order < hi)]
+    else:
+        rows = np.arange(lo, hi)
+    return rows[::-1] if sort in (1, 3) else rows
+
+def page_table(series, rows, min_limit, max_limit):
+    page = series.take(rows)
+    temps = widen_temps(page.temps)
+    lo, hi = page.temps.dtype.type(min_limit), page.temps.dtype.type(max_limit)
+    return pd.DataFrame({
+        'Sıra': rows + 1,
+        'Zaman': page.format_times(),
+        'Sıcaklık (°C)': temps,
+        'Durum': np.where(page.temps > hi, "Max Üstü", np.where(page.temps < lo, "Min Altı", "")),
+    })
+
+# --- Limit Aşımı (İhlal) Motoru ---
+# Ardışık aynı durumdaki okumalar (seri) NumPy ile bulunur; gürültülü sensörlerde
+# on binlerce küçük seri için Python döngüsü / groupby çalıştırılmaz.
+def find_excursion_runs(timestamps, temps, min_limit, max_limit, time_weighted=False, segments=None, end_timestamps=None):
+    # Dönüş: her limit dışı seri için durum (+1 max üstü, -1 min altı), başlangıç/bitiş zamanı, süre ve uç değer
+    # segments (sıralı kanal kimlikleri) verilirse seriler kanal sınırında kesilir ve 'segment' de döner
+    # end_timestamps: her öğenin bitiş zamanı (kovalarda son okuma); verilmezse öğeler tek anlık okumadır
+    ts = np.asarray(timestamps)
+    if ts.dtype.kind != 'M': ts = ts.astype('datetime64[ns]')
+    te = ts if end_timestamps is None else np.asarray(end_timestamps).astype(ts.dtype)
+    vals = np.asarray(temps)
+    if vals.dtype.kind != 'f': vals = vals.astype(np.float64)
+    # Limitler verinin hassasiyetine çevrilir: float32 2.1 ile 2.1 limiti eşit sayılmalı
+    lo, hi = vals.dtype.type(min_limit), vals.dtype.type(max_limit)
+    status = np.where(vals > hi, 1, np.where(vals < lo, -1, 0)).astype(np.int8)
+    n = len(status)
+    if n == 0:
+        starts = np.empty(0, dtype=np.intp)
+    else:
+        change = status[1:] != status[:-1]
+        if segments is not None: change |= segments[1:] != segments[:-1]
+        starts = np.flatnonzero(np.r_[True, change])
+    ends = np.r_[starts[1:], n] - 1
+
+    # Uç değerler tüm seriler için tek geçişte; ardından yalnızca limit dışı seriler tutulur
+    run_min = np.minimum.reduceat(vals, starts) if n else vals
+    run_max = np.maximum.reduceat(vals, starts) if n else vals
+    run_status = status[starts]
+    out = run_status != 0
+    starts, ends, run_status = starts[out], ends[out], run_status[out]
+    extreme = widen_temps(np.where(run_status == 1, run_max[out], run_min[out]))
+
+    # Zaman ağırlıklı: seri, bir sonraki (limit içi) okumaya kadar sürmüş kabul edilir
+    last = n - 1 if segments is None else np.searchsorted(segments, segments[ends], side='right') - 1
+    stop = np.minimum(ends + 1, last)
+    stop_ts = np.where(stop > ends, ts[stop], te[ends]) if time_weighted else te[ends]
+    runs = {
+        'status': run_status,
+        'start': ts[starts],
+        'end': te[ends],
+        'duration': stop_ts - ts[starts],
+        'extreme': extreme,
+    }
+    if segments is not None: runs['segment'] = segments[starts]
+    return runs
+
+def summarize_excursions(runs):
+    # Toplam süreler ve genel uç değerler; hiç seri yoksa eski davranıştaki gibi 0 / None
+    is_max = runs['status'] == 1
+    is_min = ~is_max
+    total_max_duration = pd.Timedelta(runs['duration'][is_max].sum())
+    total_min_duration = pd.Timedelta(runs['duration'][is_min].sum())
+    global_max_val = float(runs['extreme'][is_max].max()) if is_max.any() else None
+    global_min_val = float(runs['extreme'][is_min].min()) if is_min.any() else None
+    return total_max_duration, total_min_duration, global_max_val, global_min_val
+
+def excursion_table(runs):
+    return pd.DataFrame({
+        "Tur": np.where(runs['status'] == -1, "Min Alti", "Max Ustu"),
+        "Baslangic": pd.DatetimeIndex(runs['start']).strftime('%d.%m.%Y %H:%M:%S'),
+        "Bitis": pd.DatetimeIndex(runs['end']).strftime('%d.%m.%Y %H:%M:%S'),
+        "Sure": pd.TimedeltaIndex(runs['duration']).astype(str).str.split('.').str[0],
+        "En Uc Deger": runs['extreme'],
+    }) if len(runs['status']) else pd.DataFrame()
+
+def detect_violations(series, min_temp_limit, max_temp_limit, intervention_dt=None, time_weighted=False):
+    scope = series.until(intervention_dt)
+
+    with stage("MKT hesabı", len(scope)):
+        mkt_value = calculate_mkt(pd.Series(widen_temps(scope.temps)))
+
+    with stage("ihlal serileri (gruplama)", len(scope)):
+        runs = find_excursion_runs(scope.timestamps(), scope.temps, min_temp_limit, max_temp_limit, time_weighted)
+        total_max_duration, total_min_duration, global_max_val, global_min_val = summarize_excursions(runs)
+    with stage("ihlal tablosu", len(runs['status'])):
+        df_violations = excursion_table(runs)
+    return df_violations, total_max_duration, total_min_duration, global_max_val, global_min_val, mkt_value
+
+# --- Kayan Pencere Analizi ---
+# Her okuma için, o okumayla biten (t - pencere, t] aralığındaki MKT ve limit dışı süre.
+# exp(-ΔH/RT) terimlerinin ve limit dışı aralık sürelerinin birikimli toplamları bir kez alınır;
+# pencere toplamı iki birikimli değerin farkıdır. Düzensiz aralıklı okumalarda da çalışır.
+ROLLING_WINDOWS = {"6 saat": 6 * 3600, "12 saat": 12 * 3600, "24 saat": 86400, "3 gün": 3 * 86400,
+                   "7 gün": 7 * 86400, "14 gün": 14 * 86400, "30 gün": 30 * 86400}
+
+def rolling_analytics(series, window_seconds, min_limit, max_limit, time_weighted=False):
+    # Dönüş: okuma başına pencere MKT'si (°C) ile max üstü / min altı süre (saniye)
+    ts = series.ts
+    n = len(ts)
+    first = np.searchsorted(ts, ts - window_seconds, side='right')  # pencerenin ilk okuması
+    upto = np.arange(1, n + 1)
+
+    exp_terms = np.exp(-MKT_DH_R / (widen_temps(series.temps) + 273.15))
+    csum = np.r_[0.0, np.cumsum(exp_terms)]
+    mkt = (MKT_DH_R / (-np.log((csum[upto] - csum[first]) / (upto - first)))) - 273.15
+
+    # Aralık k = [ts[k], ts[k+1]): ihlal motoruyla aynı kural; toplamları toplam ihlal süresine eşittir
+    vals = series.temps
+    lo, hi = vals.dtype.type(min_limit), vals.dtype.type(max_limit)
+    dt = np.diff(ts)
+    window_start = ts - window_seconds
+    durations = {}
+    for key, flag in (('above', vals > hi), ('below', vals < lo)):
+        counted = flag[:-1] if time_weighted else flag[:-1] & flag[1:]
+        cum = np.r_[0, np.cumsum(np.where(counted, dt, 0))]
+        total = cum[upto - 1] - cum[first]
+        # Pencere başını kesen aralığın pencere içinde kalan kısmı
+        cut = (first > 0) & np.r_[False, counted][first]
+        total[cut] += ts[first[cut]] - window_start[cut]
+        durations[key] = total
+    return {'mkt': mkt, 'above': durations['above'], 'below': durations['below']}
+
+# --- Çok Kanallı Analiz ---
+# Tüm kanallar tek geçişte analiz edilir: (okuma, kanal) dizisi, her kanalın okunabilen değerleri
+# art arda gelecek şekilde tek boyuta indirilir ve kanal sınırları seri / kesinti sınırı sayılır.
+# MKT, ihlal serileri ve kesintiler bu dizi üzerinde kanal kimliğiyle bir kez bulunur; sonuçlar
+# kanal başına tek kanallı akıştaki (detect_gaps / detect_violations) sonuçlarla aynıdır.
+STATUS_SEVERITY = {"Başarılı": 0, "Geliştirilmeli": 1, "Acil Müdahale": 2}
+
+def channel_results(series, metadata, gap_threshold_hours=2, min_temp_limit=2.0, max_temp_limit=8.0,
+                    intervention_dt=None, time_weighted=False):
+    # Dönüş: kanal başına evaluate_cabinet sonuç sözlükleri (kanal sırasıyla)
+    temps = series.temps.reshape(len(series), -1)
+    n, k = temps.shape
+    valid = ~np.isnan(temps.T.ravel())
+    channel = np.repeat(np.arange(k), n)[valid]
+    ts = np.tile(series.ts, k)[valid]
+    vals = temps.T.ravel()[valid]
+    bounds = np.r_[0, np.cumsum(np.bincount(channel, minlength=k))]
+
+    with stage("kesinti tespiti (tüm kanallar)", len(ts)):
+        gap_at = np.flatnonzero((np.diff(ts) >= int(timedelta(hours=gap_threshold_hours).total_seconds()))
+                                & (channel[1:] == channel[:-1]))
+        gap_bounds = np.searchsorted(channel[gap_at], np.arange(k + 1))
+
+    # Karar kapsamı: müdahale anına kadarki okumalar (her kanalda zaman sıralı olduğundan önek)
+    scope = slice(None) if intervention_dt is None else ts <= pd.Timestamp(intervention_dt).value // 1_000_000_000
+    s_ts, s_vals, s_channel = ts[scope], vals[scope], channel[scope]
+    with stage("MKT hesabı (tüm kanallar)", len(s_ts)):
+        mkt = mkt_accumulate_groups(widen_temps(s_vals), s_channel, k)
+    with stage("ihlal serileri (tüm kanallar)", len(s_ts)):
+        runs = find_excursion_runs(s_ts.view('datetime64[s]'), s_vals, min_temp_limit, max_temp_limit,
+                                   time_weighted, segments=s_channel)
+        run_bounds = np.searchsorted(runs['segment'], np.arange(k + 1))
+
+    results = []
+    for c in range(k):
+        ch_runs = {key: v[run_bounds[c]:run_bounds[c + 1]] for key, v in runs.items()}
+        gaps = gap_at[gap_bounds[c]:gap_bounds[c + 1]]
+        all_gaps = gap_events(metadata, gap_threshold_hours, ts[bounds[c]], ts[bounds[c + 1] - 1], ts[gaps], ts[gaps + 1])
+        violation_result = (excursion_table(ch_runs), *summarize_excursions(ch_runs), mkt_from_sum(*mkt[c]))
+        results.append(evaluate_cabinet(None, metadata, (all_gaps, gap_report(all_gaps)), violation_result,
+                                        rows=int(bounds[c + 1] - bounds[c])))
+    return results
+
+def multi_channel_result(series, results):
+    # Dolabın genel sonucu en kötü kanalınkidir (önce karar, sonra MKT); tüm kanallar 'channels' altında
+    worst = max(range(len(results)), key=lambda c: (STATUS_SEVERITY[results[c]['summary_stats']['status']],
+                                                    results[c]['mkt_value'] if results[c]['mkt_value'] is not None else -np.inf))
+    return {**results[worst], 'series': series, 'rows': len(series), 'channel': series.names[worst],
+            'channels': dict(zip(series.names, results))}
+
+# --- Kesinti (Boşluk) Tespiti ---
+def detect_gaps(series, metadata, gap_threshold_hours):
+    diffs = np.diff(series.ts)
+    idx = np.flatnonzero(diffs >= int(timedelta(hours=gap_threshold_hours).total_seconds()))
+    all_gaps = gap_events(metadata, gap_threshold_hours, series.ts[0], series.ts[-1], series.ts[idx], series.ts[idx + 1])
+    return all_gaps, gap_report(all_gaps)
+
+def gap_events(metadata, gap_threshold_hours, first_ts, last_ts, gap_starts, gap_ends):
+    # Ara kesintiler (epoch saniye çiftleri) ile dönem başı/sonu veri kayıpları tek listede
+    gap_threshold = timedelta(hours=gap_threshold_hours)
+    expected_start = metadata.get('expected_start')
+    expected_end = metadata.get('expected_end')
+    actual_start_dt = pd.Timestamp(int(first_ts), unit='s')
+    actual_end_dt = pd.Timestamp(int(last_ts), unit='s')
+    all_gaps = []
+
+    if pd.notna(expected_start):
+        start_diff = actual_start_dt - expected_start
+        if start_diff >= gap_threshold:
+            all_gaps.append({"Tip": "Başlangıç Veri Kaybı", "Baslangic": expected_start, "Bitis": actual_start_dt, "Sure": start_diff})
+
+    # Yalnızca kesinti olan satırlar Timestamp nesnesine çevrilir
+    for start, end in zip(gap_starts.tolist(), gap_ends.tolist()):
+        all_gaps.append({"Tip": "Sensör Veri Kesintisi (Ara Boşluk)", "Baslangic": pd.Timestamp(start, unit='s'),
+                         "Bitis": pd.Timestamp(end, unit='s'), "Sure": pd.Timedelta(seconds=end - start)})
+
+    if pd.notna(expected_end):
+        end_diff = expected_end - actual_end_dt
+        if end_diff >= gap_threshold:
+            all_gaps.append({"Tip": "Bitiş Veri Kaybı", "Baslangic": actual_end_dt, "Bitis": expected_end, "Sure": end_diff})
+    return all_gaps
+
+def gap_report(all_gaps):
+    df_gaps_report = pd.DataFrame()
+    if all_gaps:
+        df_gaps_report = pd.DataFrame(all_gaps).sort_values('Baslangic')
+        df_gaps_report['Baslangic'] = df_gaps_report['Baslangic'].dt.strftime('%d.%m.%Y %H:%M:%S')
+        df_gaps_report['Bitis'] = df_gaps_report['Bitis'].dt.strftime('%d.%m.%Y %H:%M:%S')
+        df_gaps_report['Sure'] = df_gaps_report['Sure'].astype(str).apply(lambda x: x.split('.')[0])
+        df_gaps_report.rename(columns={
+            "Tip": "Kesinti Türü", 
+            "Baslangic": "Başlangıç Tarih/Saat", 
+            "Bitis": "Bitiş Tarih/Saat", 
+            "Sure": "Toplam Kesinti Süresi"
+        }, inplace=True)
+    return df_gaps_report
+
+# --- Sabit Aralıklı Yeniden Örnekleme ---
+# Çok sık kaydeden sensörlerde okumalar sabit aralıklı kovalarda toplanır: kova başına ilk/son okuma
+# zamanı, min, max, ortalama, okuma sayısı ve MKT terimlerinin (exp(-ΔH/RT)) toplamı. Boş kovalar saklanmaz
+# ve ara değer üretilmez; kesinti, ardışık dolu kovaların son ve ilk okuması arasındaki boşluktur.
+# Doğruluk (aralık <= kesinti limiti):
+#   - Kesintiler, uç (en yüksek / en düşük) değerler ve MKT ham okumalarla aynıdır (MKT'de yalnızca
+#     kayan nokta toplama sırası farkı).
+#   - İhlal süresi eksik hesaplanmaz; fazlası yalnızca kısmen limit dışı kovalardan gelir ve
+#     resample_error_bounds ile sınırlanır. (Aynı kovada hem max üstü hem min altı okuma varsa kova
+#     max üstü sayılır; bu kovalarda min altı süre eksik kalabilir, kova sayısı ayrıca raporlanır.)
+RESAMPLE_INTERVALS = {"1 dakika": 60, "5 dakika": 300, "15 dakika": 900, "30 dakika": 1800, "1 saat": 3600}
+
+class BucketSeries:
+    __slots__ = ('interval', 'first_ts', 'last_ts', 'min', 'max', 'mean', 'count', 'exp_sum')
+
+    def __init__(self, interval, first_ts, last_ts, min, max, mean, count, exp_sum):
+        self.interval = interval
+        self.first_ts, self.last_ts = first_ts, last_ts
+        self.min, self.max, self.mean, self.count = min, max, mean, count
+        self.exp_sum = exp_sum
+
+    def __len__(self):
+        return len(self.first_ts)
+
+    @property
+    def rows(self):
+        return int(self.count.sum())
+
+    def until(self, cutoff):
+        # Müdahale anı kova çözünürlüğündedir: ilk okuması cutoff'tan önce olan kovalar tutulur
+        if cutoff is None: return self
+        hi = int(np.searchsorted(self.first_ts, pd.Timestamp(cutoff).value // 1_000_000_000, side='right'))
+        return BucketSeries(self.interval, *(getattr(self, k)[:hi] for k in self.__slots__[1:]))
+
+def resample_series(series, interval_seconds):
+    # Tek kanallı, zaman sıralı seriden kovalar; min/max sensör hassasiyetinde (float32) kalır
+    ts, vals = series.ts, series.temps
+    starts = np.flatnonzero(np.r_[True, ts[1:] // interval_seconds != ts[:-1] // interval_seconds]) if len(ts) else np.empty(0, dtype=np.intp)
+    ends = np.r_[starts[1:], len(ts)] - 1
+    count = ends - starts + 1
+    reduce = (lambda f, a: f.reduceat(a, starts)) if len(ts) else (lambda f, a: a[:0])
+    wide = widen_temps(vals)
+    return BucketSeries(interval_seconds, ts[starts], ts[ends], reduce(np.minimum, vals), reduce(np.maximum, vals),
+                        reduce(np.add, wide) / np.maximum(count, 1), count,
+                        reduce(np.add, np.exp(-MKT_DH_R / (wide + 273.15))))
+
+def bucket_gap_positions(buckets, gap_threshold_hours):
+    # Kova içindeki okumalar arası fark aralıktan küçüktür; kesinti yalnızca bir kovanın son okumasıyla
+    # sonraki kovanın ilk okuması arasında olabilir. Dönüş: kesintiden önceki kovaların sırası
+    return np.flatnonzero(buckets.first_ts[1:] - buckets.last_ts[:-1] >= int(timedelta(hours=gap_threshold_hours).total_seconds()))
+
+def detect_bucket_gaps(buckets, metadata, gap_threshold_hours):
+    idx = bucket_gap_positions(buckets, gap_threshold_hours)
+    all_gaps = gap_events(metadata, gap_threshold_hours, buckets.first_ts[0], buckets.last_ts[-1],
+                          buckets.last_ts[idx], buckets.first_ts[idx + 1])
+    return all_gaps, gap_report(all_gaps)
+
+def bucket_excursion_runs(buckets, min_limit, max_limit, time_weighted=False):
+    # max'ı üst limiti aşan kova 'max üstü', min'i alt limitin altındaki kova 'min altı' sayılır (ikisi
+    # birden olursa max üstü); seri ilk kovanın ilk okumasından son kovanın son okumasına kadar sürer
+    lo, hi = buckets.min.dtype.type(min_limit), buckets.max.dtype.type(max_limit)
+    rep = np.where(buckets.max > hi, buckets.max, np.where(buckets.min < lo, buckets.min, buckets.mean.astype(buckets.min.dtype)))
+    return find_excursion_runs(buckets.first_ts.view('datetime64[s]'), rep, min_limit, max_limit, time_weighted,
+                               end_timestamps=buckets.last_ts.view('datetime64[s]'))
+
+def bucket_mkt(buckets):
+    # Kova başına saklanan exp(-ΔH/RT) toplamlarından. Toplamlar kayan noktadır (calculate_mkt'nin tam sayı toplamı
+    # değil); n okumada göreli hata ~n·2**-53, MKT'de ~8·n·2**-53 °C: 1e8 okumada bile 1e-6 °C'nin altında
+    if not buckets.rows: return None
+    avg_exp = buckets.exp_sum.sum() / buckets.rows
+    if avg_exp == 0: return None
+    return (MKT_DH_R / (-np.log(avg_exp))) - 273.15
+
+def detect_bucket_violations(buckets, min_temp_limit, max_temp_limit, intervention_dt=None, time_weighted=False):
+    # detect_violations ile aynı dönüş, kovalar üzerinde
+    scope = buckets.until(intervention_dt)
+    with stage("MKT hesabı (kovalar)", len(scope)):
+        mkt_value = bucket_mkt(scope)
+    with stage("ihlal serileri (kovalar)", len(scope)):
+        runs = bucket_excursion_runs(scope, min_temp_limit, max_temp_limit, time_weighted)
+        total_max_duration, total_min_duration, global_max_val, global_min_val = summarize_excursions(runs)
+    with stage("ihlal tablosu", len(runs['status'])):
+        df_violations = excursion_table(runs)
+    return df_violations, total_max_duration, total_min_duration, global_max_val, global_min_val, mkt_value
+
+def resample_error_bounds(buckets, min_limit, max_limit, intervention_dt=None, time_weighted=False):
+    # Dönüş: (max üstü sürenin, min altı sürenin en fazla ne kadar fazla hesaplanmış olabileceği,
+    # hem max üstü hem min altı okuma içeren kova sayısı)
+    scope = buckets.until(intervention_dt)
+    if not len(scope): return pd.Timedelta(0), pd.Timedelta(0), 0
+    lo, hi = scope.min.dtype.type(min_limit), scope.max.dtype.type(max_limit)
+    estimate = summarize_excursions(bucket_excursion_runs(scope, min_limit, max_limit, time_weighted))[:2]
+    # Ham sürenin alt sınırı: tüm okumaları limit dışı olan kovaların kendi süresi ve ardışık iki tam
+    # kova arasındaki boşluk (zaman ağırlıklıda tam kovanın sonraki kovanın ilk okumasına kadarki boşluğu)
+    span = scope.last_ts - scope.first_ts
+    jump = np.r_[scope.first_ts[1:] - scope.last_ts[:-1], 0]
+    excess = []
+    for full, total in ((scope.min > hi, estimate[0]), (scope.max < lo, estimate[1])):
+        follows = full if time_weighted else full & np.r_[full[1:], False]
+        lower = pd.Timedelta(seconds=int(span[full].sum() + jump[follows].sum()))
+        excess.append(max(total - lower, pd.Timedelta(0)))
+    return excess[0], excess[1], int(((scope.max > hi) & (scope.min < lo)).sum())
+
+# --- Karar Mantığı ---
+def decide_status(gap_count, total_max_duration, total_min_duration, global_max_val):
+    # Kesinti Kararı Eziyor
+    if gap_count > 0:
+        return "Acil Müdahale", "VERİ KESİNTİSİ MEVCUT, İKİNCİL SICAKLIK ÖLÇÜMLERİNİ DEĞERLENDİR"
+    elif total_max_duration.total_seconds() == 0 and total_min_duration.total_seconds() == 0:
+        return "Başarılı", "TÜM VERİLER NORMAL"
+    elif total_max_duration.total_seconds() / 3600 >= 8 and (global_max_val and global_max_val >= 15):
+        return "Acil Müdahale", "IMHA ONERILIR (SURE > 8s VE ISI > 15C)"
+    else:
+        return "Geliştirilmeli", "RISKLI VERILER VAR - MANUEL KONTROL"
+
+def build_summary_stats(total_max_duration, total_min_duration, global_max_val, global_min_val, mkt_value, status_term, decision_msg):
+    return {
+        "max_dur": format_duration(total_max_duration) if total_max_duration > timedelta(0) else "-",
+        "max_val": f"{global_max_val} C" if global_max_val is not None else "-",
+        "min_dur": format_duration(total_min_duration) if total_min_duration > timedelta(0) else "-",
+        "min_val": f"{global_min_val} C" if global_min_val is not None else "-",
+        "mkt_val": f"{mkt_value:.2f} C" if mkt_value is not None else "-",
+        "status": status_term,
+        "decision": decision_msg,
+    }
+
+def file_content_hash(file_bytes):
+    return hashlib.sha256(file_bytes).hexdigest()
+
+# --- Tek Çağrıda Analiz ---
+def open_export(path):
+    # Diskteki dosyayı Streamlit'in yüklenen dosya nesnesi gibi (name/getvalue/seek/read) sunar
+    with open(path, 'rb') as fh:
+        buf = io.BytesIO(fh.read())
+    buf.name = str(path)
+    return buf
+
+def load_export(name, data):
+    # İşçi süreçte çalışabilmesi için dosya adı ve baytlarla çağrılır (dosya nesnesi taşınmaz)
+    buf = io.BytesIO(data)
+    buf.name = name
+    df, metadata, error_message = analyze_data(buf)
+    if df is None or df.empty:
+        return None, metadata, error_message
+    # Sonraki aşamalar yalnızca zaman ve sıcaklık dizilerini kullanır
+    return SensorSeries.from_frame(df, metadata.get('channels')), metadata, error_message
+
+# --- Disk Önbelleği ---
+# Ayrıştırılmış diziler dosya içeriğinin özetiyle (SHA-256) diskte saklanır; aynı dışa aktarım
+# tekrar yüklendiğinde (sunucu yeniden başlasa da) kodlama/başlık tespiti ve ayrıştırma atlanır.
+# Her kayıt bir klasördür: ts.npy (int64 epoch saniye), temps.npy (float32) ve meta.pkl.
+# .npy dosyaları bellek eşlemeli (mmap) açılır; veri ancak okundukça diske erişilir.
+# Son kullanım zamanı klasörün mtime değeridir; bütçe aşılınca en eski kayıtlar silinir (LRU).
+class DiskCache:
+    VERSION = 2  # Ayrıştırma sonucu değişirse artırılır; eski kayıtlar kullanılmaz
+
+    def __init__(self, root, max_bytes):
+        self.root = os.path.join(os.path.expanduser(root), f"v{self.VERSION}")
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, file_hash):
+        return os.path.join(self.root, file_hash)
+
+    def get(self, file_hash):
+        # Dönüş: (SensorSeries, metadata) veya kayıt yoksa / okunamazsa None
+        path = self._path(file_hash)
+        try:
+            ts = np.load(os.path.join(path, "ts.npy"), mmap_mode='r')
+            temps = np.load(os.path.join(path, "temps.npy"), mmap_mode='r')
+            with open(os.path.join(path, "meta.pkl"), 'rb') as fh:
+                metadata = pickle.load(fh)
+            os.utime(path)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return None
+        return SensorSeries(ts, temps, metadata.get('channels')), metadata
+
+    def put(self, file_hash, series, metadata):
+        path = self._path(file_hash)
+        if os.path.isdir(path): return
+        # Önce geçici klasöre yazılır, sonra tek adımda yerine taşınır; yarım kayıt okunmaz
+        tmp = tempfile.mkdtemp(prefix=".yazim-", dir=self.root)
+        try:
+            np.save(os.path.join(tmp, "ts.npy"), np.ascontiguousarray(series.ts, dtype=np.int64))
+            np.save(os.path.join(tmp, "temps.npy"), np.ascontiguousarray(series.temps, dtype=np.float32))
+            with open(os.path.join(tmp, "meta.pkl"), 'wb') as fh:
+                pickle.dump(metadata, fh)
+            if self._entry_size(tmp) > self.max_bytes: return
+            os.replace(tmp, path)
+        except OSError:
+            # Aynı dosya başka bir süreçte yazılmış olabilir ya da disk dolu; önbellek isteğe bağlıdır
+            return
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    @staticmethod
+    def _entry_size(path):
+        return sum(e.stat().st_size for e in os.scandir(path) if e.is_file())
+
+    def entries(self):
+        # Dönüş: (son kullanım, boyut, klasör) listesi, en eskiden en yeniye
+        out = []
+        for e in os.scandir(self.root):
+            if e.is_dir() and not e.name.startswith('.'):
+                try:
+                    out.append((e.stat().st_mtime, self._entry_size(e.path), e.path))
+                except OSError:
+                    continue
+        return sorted(out)
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes: break
+            # Linux'ta açık mmap'ler silinen dosyayı okumaya devam eder
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+        return total
+
+def load_export_cached(name, data, cache, file_hash=None):
+    # load_export ile aynı dönüş; cache None ise önbellek kullanılmaz
+    if cache is None:
+        return load_export(name, data)
+    file_hash = file_hash or file_content_hash(data)
+    with stage("disk önbelleği (mmap)") as s:
+        hit = cache.get(file_hash)
+        s.rows = len(hit[0]) if hit is not None else None
+    if hit is not None:
+        return (*hit, "")
+    series, metadata, error_message = load_export(name, data)
+    if series is not None:
+        cache.put(file_hash, series, metadata)
+    return series, metadata, error_message
+
+def evaluate_cabinet(series, metadata, gap_result, violation_result, rows=None):
+    # rows: seri tutulmadığında (artımlı mod) kayıt sayısı
+    all_gaps, df_gaps_report = gap_result
+    df_violations, total_max_duration, total_min_duration, global_max_val, global_min_val, mkt_value = violation_result
+    status_term, decision_msg = decide_status(len(all_gaps), total_max_duration, total_min_duration, global_max_val)
+    summary_stats = build_summary_stats(total_max_duration, total_min_duration, global_max_val, global_min_val,
+                                        mkt_value, status_term, decision_msg)
+    return {
+        'error': "",
+        'series': series,
+        'rows': len(series) if rows is None else rows,
+        'metadata': metadata,
+        'gaps': all_gaps,
+        'df_gaps_report': df_gaps_report,
+        'df_violations': df_violations,
+        'total_max_duration': total_max_duration,
+        'total_min_duration': total_min_duration,
+        'global_max_val': global_max_val,
+        'global_min_val': global_min_val,
+        'mkt_value': mkt_value,
+        'summary_stats': summary_stats,
+    }
+
+def analyze_cabinet(file, gap_threshold_hours=2, min_temp_limit=2.0, max_temp_limit=8.0, intervention_dt=None, time_weighted=False,
+                    cache=None):
+    # Arayüzdeki akışın tamamı: ayrıştırma, kesinti, ihlal ve karar. Hata varsa yalnızca 'error' doludur.
+    # cache (DiskCache) verilirse ayrıştırma sonucu diskten okunur / diske yazılır.
+    series, metadata, error_message = load_export_cached(file.name, file.getvalue(), cache)
+    if series is None:
+        return {'error': error_message}
+    if series.n_channels > 1:
+        return multi_channel_result(series, channel_results(series, metadata, gap_threshold_hours, min_temp_limit,
+                                                            max_temp_limit, intervention_dt, time_weighted))
+    return evaluate_cabinet(series, metadata, detect_gaps(series, metadata, gap_threshold_hours),
+                            detect_violations(series, min_temp_limit, max_temp_limit, intervention_dt, time_weighted))
+
+# --- Artımlı Analiz ---
+# Her gün büyüyen birikimli dışa aktarımlar için dolap başına küçük bir analiz durumu saklanır:
+# MKT sayacı ve tam sayı toplamı, ihlal serileri, ara kesintiler ve son okuma (sınır satırı).
+# Sonraki çalıştırmada yalnızca son okumadan yeni satırlar ayrıştırılıp duruma eklenir;
+# sonuç, tüm dosyanın baştan analiziyle bire bir aynıdır.
+def analysis_settings(gap_threshold_hours=2, min_temp_limit=2.0, max_temp_limit=8.0, intervention_dt=None, time_weighted=False):
+    return {
+        'gap_threshold_hours': gap_threshold_hours,
+        'min_temp_limit': min_temp_limit,
+        'max_temp_limit': max_temp_limit,
+        'intervention_dt': intervention_dt,
+        'time_weighted': time_weighted,
+    }
+
+class CabinetState:
+    VERSION = 1
+
+    def __init__(self, settings, expected_start=None):
+        self.settings = settings
+        self.expected_start = expected_start
+        self.rows = 0
+        self.first_ts = self.last_ts = None
+        self.gap_starts = self.gap_ends = np.empty(0, dtype=np.int64)
+        self.mkt_count, self.mkt_sum = 0, 0
+        # Karar kapsamındaki (müdahale öncesi) son okuma; açık kalan ihlal serisi bununla birleştirilir
+        self.scope_last_ts = self.scope_last_temp = None
+        self.runs = self._find_runs(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+
+    def _find_runs(self, ts, temps):
+        return find_excursion_runs(ts.view('datetime64[s]'), temps, self.settings['min_temp_limit'],
+                                   self.settings['max_temp_limit'], self.settings['time_weighted'])
+
+    def continues(self, metadata):
+        # Birikimli dosyada dönem başlangıcı değişmez; değiştiyse başka bir kayıttır
+        start = metadata.get('expected_start')
+        return (pd.isna(start) and pd.isna(self.expected_start)) or start == self.expected_start
+
+    def extend(self, series):
+        if self.rows:
+            series = series.slice(int(np.searchsorted(series.ts, self.last_ts, side='right')), len(series))
+        if series.empty: return self
+
+        # Sınır satırı başa eklenir: eski son okuma ile ilk yeni okuma arasındaki kesinti de bulunur
+        ts = series.ts if not self.rows else np.r_[self.last_ts, series.ts]
+        idx = np.flatnonzero(np.diff(ts) >= int(timedelta(hours=self.settings['gap_threshold_hours']).total_seconds()))
+        self.gap_starts = np.r_[self.gap_starts, ts[idx]]
+        self.gap_ends = np.r_[self.gap_ends, ts[idx + 1]]
+        if not self.rows: self.first_ts = int(series.ts[0])
+        self.rows += len(series)
+        self.last_ts = int(series.ts[-1])
+
+        scope = series.until(self.settings['intervention_dt'])
+        if not scope.empty:
+            count, total = mkt_accumulate(widen_temps(scope.temps))
+            self.mkt_count += count
+            self.mkt_sum += total
+            self._extend_runs(scope)
+        return self
+
+    def _extend_runs(self, scope):
+        if self.scope_last_ts is None:
+            runs = self._find_runs(scope.ts, scope.temps)
+        else:
+            ts = np.r_[self.scope_last_ts, scope.ts]
+            temps = np.concatenate((np.array([self.scope_last_temp], dtype=np.float32), scope.temps))
+            runs = self._find_runs(ts, temps)
+            # Sınır satırı limit dışıysa ilk seri, saklanan son serinin devamıdır
+            if len(runs['status']) and int(runs['start'][0].astype(np.int64)) == self.scope_last_ts:
+                last = self.runs
+                last['end'][-1] = runs['end'][0]
+                last['duration'][-1] += runs['duration'][0]
+                pick = max if last['status'][-1] == 1 else min
+                last['extreme'][-1] = pick(last['extreme'][-1], runs['extreme'][0])
+                runs = {k: v[1:] for k, v in runs.items()}
+        self.runs = {k: np.concatenate((self.runs[k], runs[k])) for k in self.runs}
+        self.scope_last_ts = int(scope.ts[-1])
+        self.scope_last_temp = scope.temps[-1]
+
+    def evaluate(self, metadata):
+        # evaluate_cabinet ile aynı sonuç sözlüğü ('series' None)
+        all_gaps = gap_events(metadata, self.settings['gap_threshold_hours'], self.first_ts, self.last_ts,
+                              self.gap_starts, self.gap_ends)
+        violation_result = (excursion_table(self.runs), *summarize_excursions(self.runs),
+                            mkt_from_sum(self.mkt_count, self.mkt_sum))
+        return evaluate_cabinet(None, metadata, (all_gaps, gap_report(all_gaps)), violation_result, rows=self.rows)
+
+    def save(self, path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as fh:
+            pickle.dump((self.VERSION, self), fh)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        # Dosya yoksa, bozuksa ya da eski sürümse None (tam analiz yapılır)
+        try:
+            with open(path, 'rb') as fh:
+                version, state = pickle.load(fh)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return None
+        return state if version == cls.VERSION else None
+
+def analyze_cabinet_incremental(file, state=None, **settings):
+    # Dönüş: (analyze_cabinet ile aynı sonuç, güncellenmiş durum). state yerinde güncellenir.
+    # Durum yoksa ya da ayarlar / dönem başlangıcı değiştiyse tüm dosya baştan analiz edilir.
+    settings = analysis_settings(**settings)
+    if state is not None and state.rows and state.settings == settings:
+        df, metadata, error_message = analyze_data(file, since=state.last_ts)
+        if df is None: return {'error': error_message}, state
+        if state.continues(metadata) and not metadata.get('channels'):
+            return state.extend(SensorSeries.from_frame(df)).evaluate(metadata), state
+
+    df, metadata, error_message = analyze_data(file)
+    if df is None or df.empty:
+        return {'error': error_message}, state
+    if metadata.get('channels'):
+        # Çok kanallı dosyalar için durum tutulmaz; her seferinde tüm kanallar birlikte analiz edilir
+        series = SensorSeries.from_frame(df, metadata['channels'])
+        return multi_channel_result(series, channel_results(series, metadata, **settings)), None
+    state = CabinetState(settings, metadata.get('expected_start'))
+    state.extend(SensorSeries.from_frame(df))
+    return state.evaluate(metadata), state
+
+# --- Geçmiş Ölçüm Deposu ---
+# Yüklenen dışa aktarımların okumaları tek bir SQLite dosyasında dolap (Birim, Depo, kanal) başına
+# birikir; böylece herhangi bir tarih aralığı dosyaları yeniden yüklemeden analiz edilebilir.
+# Okumalar satır satır değil, dolap başına günlük bloklar halinde (int64 epoch saniye + float32
+# sıcaklık dizileri) saklanır; (dolap, gün) birincil anahtarı aralık sorgusunu birkaç yüz blok
+# okumasına indirir. Örtüşen dışa aktarımlardaki aynı zaman damgası bir kez tutulur (ilk gelen).
+class ReadingStore:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cabinets (
+            id INTEGER PRIMARY KEY, birim TEXT NOT NULL, depo TEXT NOT NULL, kanal TEXT NOT NULL,
+            UNIQUE (birim, depo, kanal));
+        CREATE TABLE IF NOT EXISTS blocks (
+            cabinet INTEGER NOT NULL REFERENCES cabinets(id), day INTEGER NOT NULL,
+            n INTEGER NOT NULL, first_ts INTEGER NOT NULL, last_ts INTEGER NOT NULL, ts BLOB NOT NULL, temps BLOB NOT NULL,
+            PRIMARY KEY (cabinet, day)) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS sources (
+            hash TEXT PRIMARY KEY, name TEXT, imported_at INTEGER NOT NULL, added INTEGER NOT NULL);
+    """
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Toplu modda birden çok işçi aynı dosyaya yazar; yazma kilidi için beklenir
+        self.db = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(self.SCHEMA)
+
+    def _cabinet_id(self, birim, depo, kanal):
+        self.db.execute("INSERT OR IGNORE INTO cabinets (birim, depo, kanal) VALUES (?, ?, ?)", (birim, depo, kanal))
+        return self.db.execute("SELECT id FROM cabinets WHERE birim = ? AND depo = ? AND kanal = ?", (birim, depo, kanal)).fetchone()[0]
+
+    def add(self, series, metadata, name="", file_hash=None):
+        # Dönüş: depoya yeni eklenen okuma sayısı; aynı dosya (hash) ikinci kez eklenmez
+        birim = str(metadata.get('Birim', ""))
+        depo = str(metadata.get('Depo', name))  # Depo adı algılanamazsa dosya adı kullanılır
+        added = 0
+        with self.db:
+            # Yazma kilidi en başta alınır; aynı dosyayı eşzamanlı ekleyen işçilerden yalnızca biri kaynağı kaydeder
+            self.db.execute("BEGIN IMMEDIATE")
+            if file_hash and not self.db.execute("INSERT OR IGNORE INTO sources VALUES (?, ?, ?, 0)",
+                                                 (file_hash, name, int(time.time()))).rowcount:
+                return 0
+            for c, kanal in enumerate(series.names or [""]):
+                ch = series.channel(c)
+                cabinet = self._cabinet_id(birim, depo, kanal)
+                days = ch.ts // 86400
+                cuts = np.flatnonzero(np.r_[True, days[1:] != days[:-1], True])
+                for lo, hi in zip(cuts[:-1], cuts[1:]):
+                    day = int(days[lo])
+                    ts, temps = ch.ts[lo:hi].astype(np.int64), ch.temps[lo:hi].astype(np.float32)
+                    old = self.db.execute("SELECT ts, temps FROM blocks WHERE cabinet = ? AND day = ?", (cabinet, day)).fetchone()
+                    old_n = 0
+                    if old is not None:
+                        old_ts = np.frombuffer(old[0], dtype=np.int64)
+                        old_n = len(old_ts)
+                        ts = np.concatenate([old_ts, ts])
+                        temps = np.concatenate([np.frombuffer(old[1], dtype=np.float32), temps])
+                    # np.unique ilk geçeni tutar ve sıralar: depodaki değer korunur
+                    ts, first = np.unique(ts, return_index=True)
+                    if len(ts) == old_n: continue
+                    temps = temps[first]
+                    added += len(ts) - old_n
+                    self.db.execute("INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                    (cabinet, day, len(ts), int(ts[0]), int(ts[-1]), ts.tobytes(), temps.tobytes()))
+            if file_hash:
+                self.db.execute("UPDATE sources SET added = ? WHERE hash = ?", (added, file_hash))
+        return added
+
+    def cabinets(self):
+        # Dönüş: dolap başına id, Birim, Depo, Kanal, okuma sayısı, ilk ve son okuma zamanı
+        df = pd.read_sql_query("""
+            SELECT c.id, c.birim AS Birim, c.depo AS Depo, c.kanal AS Kanal, SUM(b.n) AS Okuma,
+                   MIN(b.first_ts) AS Ilk, MAX(b.last_ts) AS Son
+            FROM cabinets c JOIN blocks b ON b.cabinet = c.id
+            GROUP BY c.id ORDER BY c.birim, c.depo, c.kanal""", self.db)
+        df['Ilk'] = pd.to_datetime(df['Ilk'], unit='s')
+        df['Son'] = pd.to_datetime(df['Son'], unit='s')
+        return df
+
+    def query(self, cabinet, start=None, end=None):
+        # [start, end] aralığındaki okumalar; sınırlar None ise açık uçludur
+        lo = pd.Timestamp(start).value // 1_000_000_000 if start is not None else -2**62
+        hi = pd.Timestamp(end).value // 1_000_000_000 if end is not None else 2**62
+        rows = self.db.execute("SELECT ts, temps FROM blocks WHERE cabinet = ? AND day BETWEEN ? AND ? ORDER BY day",
+                               (int(cabinet), lo // 86400, hi // 86400)).fetchall()
+        if not rows:
+            return SensorSeries(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+        ts = np.concatenate([np.frombuffer(r[0], dtype=np.int64) for r in rows])
+        temps = np.concatenate([np.frombuffer(r[1], dtype=np.float32) for r in rows])
+        a, b = np.searchsorted(ts, lo, side='left'), np.searchsorted(ts, hi, side='right')
+        return SensorSeries(ts[a:b], temps[a:b])
+
+    def load_range(self, cabinet, start, end):
+        # Dönüş: (SensorSeries, metadata); seçilen aralık rapor dönemi sayılır, baştaki / sondaki eksik veri kesintidir.
+        # Aralık depodaki ilk / son okumanın ötesine uzanıyorsa dönem o okumada başlar / biter: depoya henüz
+        # eklenmemiş günler (örn. seçilen günün okuma sonrası saatleri) veri kaybı sayılmaz
+        birim, depo, kanal = self.db.execute("SELECT birim, depo, kanal FROM cabinets WHERE id = ?", (int(cabinet),)).fetchone()
+        first, last = self.db.execute("SELECT MIN(first_ts), MAX(last_ts) FROM blocks WHERE cabinet = ?", (int(cabinet),)).fetchone()
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if first is not None:
+            start = max(start, pd.Timestamp(first, unit='s'))
+            end = min(end, pd.Timestamp(last, unit='s'))
+        metadata = {'Birim': birim, 'Depo': depo, 'expected_start': start, 'expected_end': end}
+        if kanal: metadata['Kanal'] = kanal
+        return self.query(cabinet, start, end), metadata
+
+    def close(self):
+        self.db.close()
+
+def analyze_stored_range(store, cabinet, start, end, gap_threshold_hours=2, min_temp_limit=2.0, max_temp_limit=8.0,
+                         intervention_dt=None, time_weighted=False):
+    # Depodaki bir dolabın [start, end] aralığı, dışa aktarım analiziyle aynı sonuç sözlüğü olarak
+    series, metadata = store.load_range(cabinet, start, end)
+    if series.empty:
+        return {'error': "Seçilen aralıkta kayıt bulunamadı."}
+    result = evaluate_cabinet(series, metadata, detect_gaps(series, metadata, gap_threshold_hours),
+                              detect_violations(series, min_temp_limit, max_temp_limit, intervention_dt, time_weighted))
+    result['channel'] = metadata.get('Kanal')
+    return result
+
+# --- Filo Özeti ---
+SUMMARY_COLUMNS = ["Dosya", "Birim", "Depo", "Kanal", "Kayıt", "Durum", "Karar", "MKT (C)",
+                   "Üst Limit Aşım", "En Yüksek (C)", "Alt Limit Aşım", "En Düşük (C)", "Kesinti Sayısı", "Hata"]
+
+def summary_row(name, result):
+    # Toplu analiz tablosunun bir satırı (CLI özeti ve arayüzdeki filo tablosu)
+    # Eksik değerler None bırakılır; sayısal sütunlar tabloda sayı olarak kalır
+    row = dict.fromkeys(SUMMARY_COLUMNS)
+    row["Dosya"], row["Hata"] = name, result['error']
+    if result['error']:
+        return row
+
+    metadata, summary_stats = result['metadata'], result['summary_stats']
+    row.update({
+        "Birim": str(metadata['Birim']) if 'Birim' in metadata else None,
+        "Depo": str(metadata['Depo']) if 'Depo' in metadata else None,
+        "Kanal": result.get('channel'),
+        "Kayıt": result['rows'],
+        "Durum": summary_stats['status'],
+        "Karar": summary_stats['decision'],
+        "MKT (C)": round(result['mkt_value'], 2) if result['mkt_value'] is not None else None,
+        "Üst Limit Aşım": summary_stats['max_dur'],
+        "En Yüksek (C)": result['global_max_val'],
+        "Alt Limit Aşım": summary_stats['min_dur'],
+        "En Düşük (C)": result['global_min_val'],
+        "Kesinti Sayısı": len(result['gaps']),
+    })
+    return row
+
+def summary_frame(rows):
+    return pd.DataFrame(rows, columns=SUMMARY_COLUMNS).astype({"Kayıt": "Int64", "Kesinti Sayısı": "Int64"})
+
+def default_workers():
+    # Konteynerde cpu_count makinenin tamamını gösterebilir; sürece atanmış çekirdekler esas alınır
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
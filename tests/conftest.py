@@ -0,0 +1,7 @@
+# Testler depo kökündeki modülleri ve benchmarks/ altındaki veri üreticileri ile eski (referans) uygulamaları kullanır
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
@@ -0,0 +1,16 @@
+# Alt klasörlerdeki aynı adlı dışa aktarımlar (-r) birbirinin raporunu ezmemeli ve özette ayırt edilebilmeli
+from batch import find_exports, run_batch
+from generate_exports import generate_export
+
+def test_same_name_in_subfolders(tmp_path):
+    input_dir, output_dir = tmp_path / "girdi", tmp_path / "rapor"
+    for depo, n_excursions in [("depo_a", 0), ("depo_b", 6)]:
+        (input_dir / depo).mkdir(parents=True)
+        (input_dir / depo / "dolap.csv").write_bytes(generate_export(1500, n_excursions=n_excursions, seed=len(depo) + n_excursions)[0])
+    paths = find_exports(input_dir, recursive=True)
+    summary = run_batch(paths, output_dir, {}, workers=1, input_dir=input_dir)
+    assert list(summary["Dosya"]) == ["depo_a/dolap.csv", "depo_b/dolap.csv"]
+    assert (summary["Hata"] == "").all()
+    reports = sorted(p.relative_to(output_dir).as_posix() for p in output_dir.rglob("*.pdf"))
+    assert "depo_a/dolap_csv_ihlal.pdf" in reports and "depo_b/dolap_csv_ihlal.pdf" in reports
+    assert (output_dir / "depo_a" / "dolap_csv_ihlal.pdf").read_bytes() != (output_dir / "depo_b" / "dolap_csv_ihlal.pdf").read_bytes()
@@ -0,0 +1,24 @@
+# Çok kanallı tek geçiş (channel_results), her kanalın tek kanallı akışla ayrı ayrı analiziyle aynı sonucu vermeli
+import pandas as pd
+import pytest
+
+from bench_channels import SETTINGS, build_series, per_channel
+from core import channel_results
+
+@pytest.mark.parametrize("rows, channels", [(200, 1), (200, 3), (5000, 5)])
+@pytest.mark.parametrize("mode", ["varsayılan", "zaman ağırlıklı", "müdahale"])
+def test_matches_per_channel_flow(rows, channels, mode):
+    series, metadata = build_series(rows, channels, seed=channels)
+    kwargs = {"varsayılan": {}, "zaman ağırlıklı": {'time_weighted': True},
+              "müdahale": {'intervention_dt': series.timestamps()[rows // 2]}}[mode]
+    ref = per_channel(series, metadata, **kwargs)
+    out = channel_results(series, metadata, **SETTINGS, **kwargs)
+    for r, o in zip(ref, out):
+        for key in ('df_violations', 'df_gaps_report'):
+            if r[key].empty or o[key].empty:
+                assert r[key].empty and o[key].empty, key
+            else:
+                pd.testing.assert_frame_equal(r[key], o[key])
+        for key in ('gaps', 'rows', 'total_max_duration', 'total_min_duration', 'global_max_val', 'global_min_val',
+                    'mkt_value', 'summary_stats'):
+            assert r[key] == o[key], key
@@ -0,0 +1,20 @@
+# Grafik örneklemesi limit dışı okumaları ihlal motoruyla aynı kuralla bulmalı (limitler okuma türüne çevrilir)
+import numpy as np
+
+from core import select_chart_points
+
+NO_GAPS = np.array([], dtype=np.int64)
+
+def test_limit_boundary_float32():
+    temps = np.full(10_000, 5.0, dtype=np.float32)
+    temps[[1010, 3010]] = 9.0, 1.0      # dilimlerin en yükseği / en düşüğü: her durumda korunur
+    temps[1050:1060] = np.float32(8.1)  # float32(8.1) > float64(8.1); limit float32'ye çevrilince limit içinde
+    temps[3050:3060] = np.float32(1.9)  # float32(1.9) < float64(1.9)
+    # Limitler numpy float64 olarak da gelebilir; karşılaştırma float64'e yükselmemeli
+    idx = select_chart_points(temps, 400, np.float64(1.9), np.float64(8.1), NO_GAPS)
+    assert np.isin([1010, 3010], idx).all()
+    assert not np.isin([1050, 1059, 3050, 3059], idx).any()
+    # Limit bir ulp içeri çekilince aynı okumalar limit dışıdır; serilerin iki ucu korunur
+    idx = select_chart_points(temps, 400, np.nextafter(np.float32(1.9), np.float32(9)),
+                              np.nextafter(np.float32(8.1), np.float32(0)), NO_GAPS)
+    assert np.isin([1050, 1059, 3050, 3059], idx).all()
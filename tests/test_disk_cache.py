@@ -0,0 +1,34 @@
+# Disk önbelleği: mmap'li yeniden yükleme aynı okumaları verir, bütçe aşılınca en az yakın zamanda kullanılan silinir
+import os
+import time
+
+import numpy as np
+
+from core import DiskCache, file_content_hash, load_export_cached
+from generate_exports import generate_export
+
+def test_roundtrip_is_memory_mapped(tmp_path):
+    cache = DiskCache(tmp_path / "gidis_donus", 10**12)
+    data = generate_export(3000)[0]
+    series, metadata, _ = load_export_cached("dolap.csv", data, cache)  # ilk yükleme: ayrıştırılır ve yazılır
+    cached, cached_meta, error_message = load_export_cached("dolap.csv", data, cache)
+    assert error_message == "" and isinstance(cached.ts, np.memmap)
+    assert np.array_equal(series.ts, cached.ts) and np.array_equal(series.temps, cached.temps)
+    assert cached_meta.keys() == metadata.keys()
+
+def test_evicts_least_recently_used(tmp_path):
+    # Bütçe iki kayda yetiyor: üçüncü yazılınca en az yakın zamanda kullanılan silinmeli
+    blobs = [generate_export(2000, seed=i)[0] for i in range(3)]
+    hashes = [file_content_hash(b) for b in blobs]
+    probe = DiskCache(tmp_path / "olcum", 10**12)
+    load_export_cached("a.csv", blobs[0], probe)
+    entry_size = probe.entries()[0][1]
+
+    cache = DiskCache(tmp_path / "lru", int(entry_size * 2.5))
+    for h, b in zip(hashes[:2], blobs[:2]):
+        load_export_cached("a.csv", b, cache, h)
+        time.sleep(0.01)
+    assert cache.get(hashes[0]) is not None  # ilk kayıt yeniden kullanıldı
+    time.sleep(0.01)
+    load_export_cached("a.csv", blobs[2], cache, hashes[2])
+    assert {os.path.basename(p) for _, _, p in cache.entries()} == {hashes[0], hashes[2]}
@@ -0,0 +1,15 @@
+# Tek geçişli Excel okuma, iki kez pd.read_excel ile okuyan eski yolla aynı okumaları ve meta veriyi vermeli
+import numpy as np
+
+from bench_excel_read import build_workbook, read_two_pass
+from core import analyze_excel_streaming
+
+def test_matches_two_pass_read():
+    data = build_workbook(2000)
+    df_old, meta_old = read_two_pass(data)
+    df_new, meta_new, err = analyze_excel_streaming(data)
+    assert not err
+    assert np.array_equal(df_old['Timestamp'].to_numpy(), df_new['Timestamp'].to_numpy())
+    assert np.array_equal(df_old['Temp'].to_numpy(), df_new['Temp'].to_numpy())
+    for key in ('Baslangic', 'Bitis', 'Birim', 'Depo', 'Stok'):
+        assert meta_old.get(key) == meta_new.get(key), key
@@ -0,0 +1,40 @@
+# NumPy seri motoru, eski Status/Group + groupby döngüsüyle aynı tabloyu ve özeti vermeli
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+from bench_excursions import MAX_LIMIT, MIN_LIMIT, build_series, legacy_violations, vectorized_violations
+
+SERIES = {
+    "boş": lambda: pd.DataFrame({'Timestamp': pd.to_datetime([]), 'Temp': []}),
+    "hep limit içi": lambda: build_series(50).assign(Temp=5.0),
+    "hep max üstü": lambda: build_series(50).assign(Temp=9.0),
+    "gürültülü": lambda: build_series(1000, seed=3),
+}
+
+@pytest.mark.parametrize("name", SERIES)
+def test_matches_groupby_loop(name):
+    df = SERIES[name]()
+    ref = legacy_violations(df, MIN_LIMIT, MAX_LIMIT)
+    out = vectorized_violations(df, MIN_LIMIT, MAX_LIMIT)
+    if ref[0].empty or out[0].empty:
+        assert ref[0].empty and out[0].empty
+    else:
+        pd.testing.assert_frame_equal(ref[0], out[0], check_dtype=False)
+    assert ref[1:] == out[1:]
+
+def test_time_weighted_runs_until_next_reading():
+    # Tek seri: 10:00-10:20 limit dışı, 10:30'da limit içine dönüş -> 30 dk
+    ts = pd.to_datetime(["2024-01-01 10:00", "2024-01-01 10:10", "2024-01-01 10:20", "2024-01-01 10:30"])
+    df = pd.DataFrame({'Timestamp': ts, 'Temp': [9.0, 10.0, 9.5, 5.0]})
+    table, total_max, _, g_max, _ = vectorized_violations(df, MIN_LIMIT, MAX_LIMIT, time_weighted=True)
+    assert total_max == timedelta(minutes=30) and g_max == 10.0
+    assert list(table['Bitis']) == ["01.01.2024 10:20:00"] and list(table['Sure']) == ["0 days 00:30:00"]
+
+def test_time_weighted_last_reading_out_of_limit():
+    # Son okuma limit dışıysa sonraki okuma yoktur; süre son okumada biter
+    ts = pd.to_datetime(["2024-01-01 10:00", "2024-01-01 10:10", "2024-01-01 10:20", "2024-01-01 10:30"])
+    df = pd.DataFrame({'Timestamp': ts, 'Temp': [9.0, 10.0, 9.5, 9.0]})
+    _, total_max, _, _, _ = vectorized_violations(df, MIN_LIMIT, MAX_LIMIT, time_weighted=True)
+    assert total_max == timedelta(minutes=30)
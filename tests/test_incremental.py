@@ -0,0 +1,62 @@
+# Birikimli dışa aktarımın her sürümü önceki durum üzerine işlendiğinde sonuç, tüm dosyanın baştan analiziyle aynı olmalı
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from bench_incremental import cumulative_exports
+from core import CabinetState, analyze_cabinet, analyze_cabinet_incremental
+from generate_exports import generate_export
+
+COMPARED = ['rows', 'mkt_value', 'total_max_duration', 'total_min_duration', 'global_max_val', 'global_min_val',
+            'gaps', 'summary_stats']
+N_ROWS = 3000
+
+@pytest.fixture(scope="module")
+def export():
+    # Çöp satırsız dosyada satır no = okuma no: kesimler ihlal serilerinin ve kesintilerin ortasına denk getirilir
+    data, _, info = generate_export(N_ROWS, n_excursions=12, n_gaps=4, junk_rate=0)
+    inside = sorted({s + 1 for _, s, e in info['excursions'] if e - s > 2} | set(info['gap_positions']))
+    return data, sorted(set(inside) | {N_ROWS}) + [N_ROWS]  # son sürüm tekrar: yeni satır yok
+
+@pytest.mark.parametrize("settings", [
+    {},
+    {'time_weighted': True},
+    # Müdahale anı ortada: sonrasındaki okumalar karar kapsamına girmez, kesinti listesine girer
+    {'intervention_dt': datetime(2024, 1, 6, 12, 0)},
+], ids=["varsayılan", "zaman ağırlıklı", "müdahale"])
+def test_matches_full_analysis(export, settings, tmp_path):
+    data, cuts = export
+    state_path = tmp_path / "dolap.durum"
+    fulls = cumulative_exports(data, cuts)
+    for day, part in enumerate(cumulative_exports(data, cuts)):
+        # Durum her gün diske yazılıp yeniden okunur (toplu çalıştırmadaki gibi)
+        inc, state = analyze_cabinet_incremental(part, CabinetState.load(state_path), **settings)
+        state.save(state_path)
+        full = analyze_cabinet(next(fulls), **settings)
+        where = f"gün {day + 1} ({cuts[day]} satır)"
+        assert full['error'] == inc['error'] == "", where
+        for key in COMPARED:
+            assert full[key] == inc[key], (where, key)
+        for key in ['df_violations', 'df_gaps_report']:
+            pd.testing.assert_frame_equal(full[key].reset_index(drop=True), inc[key].reset_index(drop=True), obj=f"{where} {key}")
+
+def test_batch_state_per_relative_path(tmp_path):
+    # Alt klasörlerdeki aynı adlı iki dolap: her biri kendi durumundan sürmeli, tam analizle aynı özeti vermeli
+    from batch import find_exports, run_batch
+
+    input_dir = tmp_path / "girdi"
+    versions = {}
+    for depo, seed in [("depo_a", 1), ("depo_b", 2)]:
+        (input_dir / depo).mkdir(parents=True)
+        data = generate_export(N_ROWS, n_excursions=8, n_gaps=2, junk_rate=0, seed=seed)[0]
+        versions[depo] = [part.getvalue() for part in cumulative_exports(data, [N_ROWS // 2, N_ROWS])]
+    for day in range(2):
+        for depo, parts in versions.items():
+            (input_dir / depo / "dolap.csv").write_bytes(parts[day])
+        paths = find_exports(input_dir, recursive=True)
+        inc = run_batch(paths, tmp_path / "rapor", {}, workers=1, state_dir=tmp_path / "durum", input_dir=input_dir)
+    full = run_batch(paths, tmp_path / "tam", {}, workers=1, input_dir=input_dir)
+    assert sorted(p.relative_to(tmp_path / "durum").as_posix() for p in (tmp_path / "durum").rglob("*.durum")) == \
+        ["depo_a/dolap.csv.durum", "depo_b/dolap.csv.durum"]
+    pd.testing.assert_frame_equal(inc, full)
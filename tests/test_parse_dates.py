@@ -0,0 +1,60 @@
+# parse_dates_vectorized, metin hücrelerinde satır satır parse_date_robust ile aynı sonucu vermeli;
+# tarih hücreleri (datetime / Timestamp) ise gün ile ay yer değiştirmeden olduğu gibi kullanılmalı
+import io
+from datetime import datetime
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from core import analyze_excel_streaming, parse_date_robust, parse_dates_vectorized
+
+def text_column(sep1, sep2, seconds, padded, n=300):
+    stamps = pd.Timestamp("2024-01-01 00:00:07") + pd.to_timedelta(np.arange(n) * 37, unit='h')
+    day = "%d" if padded else "%-d"
+    month = "%m" if padded else "%-m"
+    fmt = f"{day}{sep1}{month}{sep2}%Y %H:%M" + (":%S" if seconds else "")
+    cells = [t.strftime(fmt) for t in stamps]
+    # Çöp ve biçim dışı satırlar yedek yoldan (parse_date_robust) geçer
+    cells[10:10] = ["Alarm", "", "  05.01.2024 10:00  ", "2024-01-05 10:00:00", "31.02.2024 10:00", "1.1.24 10:00", None, np.nan]
+    return pd.Series(cells, dtype=object)
+
+@pytest.mark.parametrize("padded", [True, False], ids=["dolgulu", "dolgusuz"])
+@pytest.mark.parametrize("seconds", [True, False], ids=["saniyeli", "saniyesiz"])
+@pytest.mark.parametrize("sep1, sep2", [(".", "."), ("/", "/"), ("-", "-"), (".", "/")])
+def test_text_matches_row_parser(sep1, sep2, seconds, padded):
+    series = text_column(sep1, sep2, seconds, padded)
+    ref = pd.to_datetime(series.apply(parse_date_robust), errors='coerce').to_numpy(dtype='datetime64[ns]')
+    out, stats = parse_dates_vectorized(series)
+    assert np.array_equal(out.to_numpy(), ref, equal_nan=True)
+    assert stats['vectorized'] >= 300
+
+def test_datetime_cells_mixed_with_text_keep_day_and_month():
+    stamps = [datetime(2024, 1, d, 10, 30) for d in range(1, 13)]
+    series = pd.Series(stamps[:5] + ["Alarm"] + [pd.Timestamp(t) for t in stamps[5:]], dtype=object)
+    out, stats = parse_dates_vectorized(series)
+    assert list(out.drop(index=5)) == [pd.Timestamp(t) for t in stamps]
+    assert pd.isna(out[5]) and stats['vectorized'] == 12 and stats['fallback'] == 1
+
+def test_xlsx_date_cells_with_junk_row():
+    # Aynı dosya çöp satırla ve çöp satırsız aynı tarihleri vermeli
+    def workbook(junk):
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(["BİRİM", "Merkez ASM"])
+        ws.append(["Sıra No", "Tarih Saat", "Sıcaklık (°C)"])
+        for i in range(1, 13):
+            ws.append([i, datetime(2024, 1, i, 8, 0), 5.0])
+            if junk and i == 6: ws.append([None, "Alarm", "Alarm"])
+        buf = io.BytesIO()
+        wb.save(buf)
+        return buf.getvalue()
+
+    clean, _, err = analyze_excel_streaming(workbook(junk=False))
+    mixed, _, err_mixed = analyze_excel_streaming(workbook(junk=True))
+    assert not err and not err_mixed
+    expected = [pd.Timestamp(2024, 1, i, 8, 0) for i in range(1, 13)]
+    assert list(clean['Timestamp']) == expected
+    # Çöp satır NaT olarak kalır; geri kalan tarihler aynıdır
+    assert list(mixed['Timestamp'].dropna()) == expected
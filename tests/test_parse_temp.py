@@ -0,0 +1,22 @@
+# parse_temp_column, satır satır parse_temp_robust ile aynı sonucu vermeli
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_parse_temp import build_column
+from core import parse_temp_column, parse_temp_robust
+
+COLUMNS = {
+    "metin (object)": lambda: build_column(3000),
+    "metin (str)": lambda: build_column(3000).astype('str'),
+    "sayısal (float64)": lambda: pd.Series(np.random.default_rng(1).normal(5, 3, 3000).round(1)),
+    "boş": lambda: pd.Series([], dtype=object),
+}
+
+@pytest.mark.parametrize("name", COLUMNS)
+def test_matches_row_parser(name):
+    series = COLUMNS[name]()
+    ref = series.apply(parse_temp_robust).to_numpy(dtype=np.float64)
+    out = parse_temp_column(series).to_numpy(dtype=np.float64)
+    same = (ref == out) | (np.isnan(ref) & np.isnan(out))
+    assert same.all(), list(series.iloc[np.flatnonzero(~same)[:10]])
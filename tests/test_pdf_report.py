@@ -0,0 +1,12 @@
+# Sayfa sayfa yazan ReportPDF, hücre hücre cell() döngüsüyle aynı PDF'i üretmeli (oluşturma zamanı hariç)
+import re
+
+from bench_pdf_report import CellByCellPDF, build_table, render
+from core import ReportPDF
+
+def strip_creation_date(data):
+    return re.sub(rb'/CreationDate \(D:\d+\)', b'', data)
+
+def test_matches_cell_by_cell_table():
+    df = build_table(3000)
+    assert strip_creation_date(render(ReportPDF, df)) == strip_creation_date(render(CellByCellPDF, df))
@@ -0,0 +1,39 @@
+# Yeniden örnekleme: kesintiler ve uç değerler ham okumalarla aynı, MKT kayan nokta yuvarlaması içinde; ihlal süresi eksik değil, fazlası belgelenen sınır içinde
+import numpy as np
+import pytest
+
+from bench_resample import GAP_HOURS, MAX_LIMIT, MIN_LIMIT, build_series
+from core import (
+    RESAMPLE_INTERVALS, SensorSeries, bucket_gap_positions, detect_bucket_gaps, detect_bucket_violations, detect_gaps,
+    detect_violations, resample_error_bounds, resample_series,
+)
+
+@pytest.fixture(scope="module")
+def raw():
+    # 20 gün, 10 sn aralık: 30 dakika ve 1 saatlik kovalarda hem max üstü hem min altı okuma içeren kova oluşur
+    series, metadata = build_series(20, 10)
+    return series, metadata, detect_gaps(series, metadata, GAP_HOURS)
+
+@pytest.mark.parametrize("time_weighted", [False, True])
+@pytest.mark.parametrize("interval", RESAMPLE_INTERVALS.values())
+def test_bucket_results_within_bounds(raw, interval, time_weighted):
+    series, metadata, (gaps, _) = raw
+    violations = detect_violations(series, MIN_LIMIT, MAX_LIMIT, None, time_weighted)
+    buckets = resample_series(series, interval)
+    b_gaps, _ = detect_bucket_gaps(buckets, metadata, GAP_HOURS)
+    b_violations = detect_bucket_violations(buckets, MIN_LIMIT, MAX_LIMIT, None, time_weighted)
+    max_excess, min_excess, mixed = resample_error_bounds(buckets, MIN_LIMIT, MAX_LIMIT, None, time_weighted)
+
+    assert gaps == b_gaps
+    assert violations[3] == b_violations[3] and violations[4] == b_violations[4]
+    assert violations[5] == pytest.approx(b_violations[5], abs=1e-9)
+    assert violations[1] <= b_violations[1] <= violations[1] + max_excess
+    # Karışık kova max üstü sayıldığından min altı süre eksik kalabilir; yalnızca bu karşılaştırma atlanır
+    if not mixed:
+        assert violations[2] <= b_violations[2] <= violations[2] + min_excess
+
+def test_no_gap_positions_without_gaps():
+    # Kesintisiz 10 sn'lik seride 1 saatlik kovalar, 1 saatlik limitle kesinti sayılmamalı (grafik kopmamalı)
+    ts = np.arange(0, 3 * 86400, 10, dtype=np.int64) + 1_704_067_200
+    buckets = resample_series(SensorSeries(ts, np.full(len(ts), 5.0, dtype=np.float32)), 3600)
+    assert len(bucket_gap_positions(buckets, 1)) == 0
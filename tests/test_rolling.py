@@ -0,0 +1,27 @@
+# Kayan pencere motoru, her pencereyi baştan hesaplayan yöntemle aynı MKT ve limit dışı süreyi vermeli
+import numpy as np
+import pytest
+
+from bench_rolling import MAX_LIMIT, MIN_LIMIT, build_series, naive_rolling
+from core import find_excursion_runs, rolling_analytics, summarize_excursions
+
+@pytest.fixture(scope="module")
+def series():
+    return build_series(3000)
+
+@pytest.mark.parametrize("time_weighted", [False, True])
+@pytest.mark.parametrize("window", [3600, 86400])
+def test_matches_naive_windows(series, window, time_weighted):
+    out = rolling_analytics(series, window, MIN_LIMIT, MAX_LIMIT, time_weighted)
+    positions = np.random.default_rng(1).choice(len(series), size=200, replace=False)
+    mkt, above = naive_rolling(series, window, positions, time_weighted)
+    np.testing.assert_allclose(out['mkt'][positions], mkt, rtol=0, atol=1e-9)
+    assert np.array_equal(out['above'][positions], above)
+
+@pytest.mark.parametrize("time_weighted", [False, True])
+def test_whole_record_window_matches_totals(series, time_weighted):
+    # Tüm kaydı kapsayan pencerenin son değeri ihlal motorunun toplam süreleriyle aynı olmalı
+    out = rolling_analytics(series, 10**12, MIN_LIMIT, MAX_LIMIT, time_weighted)
+    runs = find_excursion_runs(series.timestamps(), series.temps, MIN_LIMIT, MAX_LIMIT, time_weighted)
+    total_max, total_min, _, _ = summarize_excursions(runs)
+    assert out['above'][-1] == total_max.total_seconds() and out['below'][-1] == total_min.total_seconds()
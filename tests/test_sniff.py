@@ -0,0 +1,16 @@
+# CSV başlık/meta veri tespiti: sınırlı önekle tek döngü, tüm tamponu çözüp satırlara bölen eski yolla aynı sonucu vermeli
+import pytest
+
+from bench_sniff import legacy_normalize, legacy_sniff, sniff
+from core import normalize_str
+from generate_exports import CSV_VARIANTS, generate_export
+
+@pytest.mark.parametrize("text", ["Sıcaklık (°C)", "DÖNEM", "İşlem Ğ Ş Ö Ç ı ü", "", "stok birimi"])
+def test_normalize_matches_replace_chain(text):
+    assert normalize_str(text) == legacy_normalize(text)
+
+@pytest.mark.parametrize("variant", CSV_VARIANTS)
+def test_matches_full_buffer_sniff(variant):
+    data, _, _ = generate_export(2000, variant)
+    # Kodlama, ayırıcı, başlık satırı ve meta veri
+    assert legacy_sniff(data) == sniff(data)
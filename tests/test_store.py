@@ -0,0 +1,74 @@
+# Geçmiş ölçüm deposu: örtüşen dışa aktarımların tekilleştirilmesi, aralık sorgusu ve rapor dönemi
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_store import build_history, monthly_exports
+from core import ReadingStore, SensorSeries, analyze_stored_range
+
+METADATA = {'Birim': "Merkez ASM", 'Depo': "Aşı Dolabı 1"}
+
+@pytest.fixture
+def store(tmp_path):
+    store = ReadingStore(tmp_path / "olcumler.sqlite")
+    yield store
+    store.close()
+
+@pytest.fixture(scope="module")
+def history():
+    return build_history(0.25)
+
+def test_overlapping_exports_are_deduplicated(store, history):
+    added = sum(store.add(part, METADATA, f"ay{k}.csv", f"h{k}") for k, part in enumerate(monthly_exports(history)))
+    assert added == len(history)
+    # Aynı dosya (hash) tekrar eklenmez; örtüşen yeni dosya yalnızca yeni okumaları ekler
+    assert store.add(history.slice(0, 1000), METADATA, "ay0.csv", "h0") == 0
+    assert store.add(history.slice(0, 1000), METADATA, "kopya.csv", "kopya") == 0
+
+    cabinet = int(store.cabinets()['id'].iloc[0])
+    start = pd.Timestamp(int(history.ts[-1]), unit='s') - pd.DateOffset(months=1)
+    end = pd.Timestamp(int(history.ts[-1]), unit='s')
+    got = store.query(cabinet, start, end)
+    ref = history.slice(history.position(start, side='left'), history.position(end, side='right'))
+    assert np.array_equal(got.ts, ref.ts) and np.array_equal(got.temps, ref.temps)
+
+def add_same_export(path):
+    store = ReadingStore(path)
+    ts = pd.Timestamp("2024-01-01").value // 1_000_000_000 + np.arange(50_000, dtype=np.int64) * 60
+    added = store.add(SensorSeries(ts, np.full(len(ts), 5.0, dtype=np.float32)), METADATA, "dolap.csv", "ayni")
+    store.close()
+    return added
+
+def test_concurrent_identical_exports(tmp_path):
+    # Aynı dosyayı eşzamanlı ekleyen işçilerden biri okumaları ekler, diğerleri 0 döner (UNIQUE hatası yok)
+    path = tmp_path / "olcumler.sqlite"
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        added = list(pool.map(add_same_export, [path] * 4))
+    assert sorted(added) == [0, 0, 0, 50_000]
+
+def test_range_beyond_stored_readings_has_no_edge_gaps(store):
+    # Son gün 23:59:59'a kadar seçilse de son okumadan sonrası veri kaybı sayılmaz
+    ts = pd.Timestamp("2024-01-01 08:00").value // 1_000_000_000 + np.arange(2000, dtype=np.int64) * 300
+    store.add(SensorSeries(ts, np.full(len(ts), 5.0, dtype=np.float32)), METADATA, "dolap.csv", "h")
+    cabinet = int(store.cabinets()['id'].iloc[0])
+    start = pd.Timestamp("2024-01-01")
+    end = pd.Timestamp(int(ts[-1]), unit='s').normalize() + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    _, metadata = store.load_range(cabinet, start, end)
+    assert metadata['expected_start'] == pd.Timestamp(int(ts[0]), unit='s')
+    assert metadata['expected_end'] == pd.Timestamp(int(ts[-1]), unit='s')
+    result = analyze_stored_range(store, cabinet, start, end)
+    assert result['gaps'] == [] and result['summary_stats']['status'] == "Başarılı"
+
+def test_store_failure_keeps_batch_analysis(tmp_path):
+    # Depoya yazılamaması biten analizi ve raporu silmez; özet satırında ayrıca belirtilir
+    from batch import process_export
+    from generate_exports import generate_export
+
+    path = tmp_path / "dolap.csv"
+    path.write_bytes(generate_export(2000)[0])
+    row = process_export(path, tmp_path, {}, store_path=str(path / "olcumler.sqlite"))  # dosyanın altında klasör açılamaz
+    assert row["Kayıt"] == 2000 and row["Durum"]
+    assert row["Hata"].startswith("Depo Hatası")
+    assert (tmp_path / "dolap_csv_ihlal.pdf").exists()